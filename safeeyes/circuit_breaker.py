@@ -0,0 +1,125 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Bypass plugins whose hooks fail or are too slow repeatedly.
+
+A hook call fails if it raises an exception, or takes longer than the time
+budget of the plugin. After FAILURE_THRESHOLD failures of the same hook in a
+row, the circuit opens and all hooks of the plugin are bypassed for
+BASE_BACKOFF seconds. After that, the next call is let through as a trial. If
+it fails, the plugin is bypassed again for twice as long as before, up to
+MAX_BACKOFF seconds. If it succeeds, the circuit closes.
+"""
+
+import collections
+import logging
+import time
+import typing
+
+from safeeyes import metrics
+
+FAILURE_THRESHOLD = 3
+BASE_BACKOFF = 60
+MAX_BACKOFF = 3600
+
+
+class CircuitBreaker:
+    """The circuit breaker of one plugin."""
+
+    # monotonic time until which the plugin is bypassed, None if closed
+    open_until: typing.Optional[float] = None
+    # whether the current call is a trial after the plugin was bypassed
+    trial: bool = False
+    backoff: float = 0
+    last_failure: typing.Optional[str] = None
+
+    def __init__(
+        self,
+        plugin_id: str,
+        time_budget: float,
+        threshold: int = FAILURE_THRESHOLD,
+        base_backoff: float = BASE_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.plugin_id = plugin_id
+        self.time_budget = time_budget
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        # failures in a row, by hook
+        self.failures: collections.Counter[str] = collections.Counter()
+
+    def is_open(self) -> bool:
+        return self.open_until is not None
+
+    def remaining(self) -> float:
+        """Return the seconds until the next trial call."""
+        if self.open_until is None:
+            return 0
+        return max(0, self.open_until - self._clock())
+
+    def allow(self) -> bool:
+        """Return whether a hook of the plugin may be called now."""
+        if self.open_until is None:
+            return True
+        if self._clock() < self.open_until:
+            return False
+
+        self.open_until = None
+        self.trial = True
+        return True
+
+    def record(
+        self, hook: str, duration: float, error: typing.Optional[BaseException]
+    ) -> None:
+        """Record the outcome of a hook call."""
+        if error is None and duration <= self.time_budget:
+            self.failures[hook] = 0
+            if self.trial:
+                self.trial = False
+                self.backoff = 0
+                logging.info("The plugin %s works again", self.plugin_id)
+            return
+
+        if error is not None:
+            reason = f"{type(error).__name__}: {error}"
+        else:
+            reason = f"took {duration:.1f} seconds"
+        self.last_failure = f"{hook} {reason}"
+        self.failures[hook] += 1
+        logging.warning("%s of the plugin %s %s", hook, self.plugin_id, reason)
+
+        if self.trial or self.failures[hook] >= self.threshold:
+            self.__open()
+
+    def __open(self) -> None:
+        if self.trial:
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+        else:
+            self.backoff = self.base_backoff
+        self.trial = False
+        self.failures.clear()
+        self.open_until = self._clock() + self.backoff
+
+        metrics.inc("safeeyes_plugin_circuit_opened_total", plugin=self.plugin_id)
+        logging.error(
+            "Bypass the plugin %s for %d seconds, it failed repeatedly",
+            self.plugin_id,
+            self.backoff,
+        )
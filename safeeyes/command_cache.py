@@ -0,0 +1,120 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Cache of the absolute paths of the commands in PATH.
+
+Looking up a command searches every PATH directory, which is slow on network
+mounts. The results, including the commands which were not found, are cached
+for the current PATH. Every PATH directory is watched with a Gio.FileMonitor,
+and the cache is cleared when any of them changes. The file monitors report
+the changes through the GLib main loop.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import typing
+
+from gi.repository import Gio, GLib
+
+
+class CommandCache:
+    """The commands found in PATH.
+
+    The cache is used from the main thread and from the dependency check
+    threads.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__paths: dict[str, typing.Optional[str]] = {}
+        # the PATH the cache is valid for
+        self.__search_path: typing.Optional[str] = None
+        # incremented by every change, so that lookups which were running
+        # during a change are not cached
+        self.generation = 0
+        self.__monitors: list[Gio.FileMonitor] = []
+        # whether all PATH directories are watched, nothing is cached otherwise
+        self.__watched = False
+
+    def which(self, command: str) -> typing.Optional[str]:
+        """Return the absolute path of a command, like shutil.which."""
+        if os.sep in command:
+            # not looked up in PATH
+            return shutil.which(command)
+
+        search_path = os.environ.get("PATH", os.defpath)
+        with self.__lock:
+            if search_path != self.__search_path:
+                self.__watch(search_path)
+            elif self.__watched and command in self.__paths:
+                return self.__paths[command]
+            generation = self.generation
+
+        path = shutil.which(command, path=search_path)
+        if path is not None:
+            path = os.path.abspath(path)
+
+        with self.__lock:
+            if self.__watched and generation == self.generation:
+                self.__paths[command] = path
+        return path
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__paths.clear()
+            self.generation += 1
+
+    def __watch(self, search_path: str) -> None:
+        """Watch the directories of a new PATH, must hold the lock."""
+        for monitor in self.__monitors:
+            monitor.cancel()
+        self.__monitors = []
+        self.__paths.clear()
+        self.generation += 1
+        self.__search_path = search_path
+        self.__watched = True
+
+        for directory in dict.fromkeys(search_path.split(os.pathsep)):
+            if not directory:
+                continue
+            try:
+                monitor = Gio.File.new_for_path(directory).monitor_directory(
+                    Gio.FileMonitorFlags.NONE, None
+                )
+            except GLib.Error as e:
+                logging.warning("Cannot watch the PATH directory %s: %s", directory, e)
+                self.__watched = False
+                continue
+            monitor.connect("changed", self.__on_changed)
+            self.__monitors.append(monitor)
+
+    def __on_changed(self, *args: typing.Any) -> None:
+        self.clear()
+
+
+_cache = CommandCache()
+
+
+def which(command: str) -> typing.Optional[str]:
+    """Return the absolute path of a command, from the shared cache."""
+    return _cache.which(command)
+
+
+def clear() -> None:
+    _cache.clear()
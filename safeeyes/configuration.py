@@ -30,12 +30,16 @@ import typing
 
 from safeeyes import utility
 
+if typing.TYPE_CHECKING:
+    from safeeyes.plugin_registry import PluginRegistry
+
 
 class Config:
     """The configuration of Safe Eyes."""
 
     __user_config: dict[str, typing.Any]
     __system_config: dict[str, typing.Any]
+    __plugin_registry: typing.Optional["PluginRegistry"]
 
     @classmethod
     def load(cls) -> "Config":
@@ -76,9 +80,13 @@ class Config:
                     )
                     user_config = new_user_config
 
-        utility.merge_plugins(user_config)
+        # the plugin registry imports the model, which imports this module
+        from safeeyes.plugin_registry import PluginRegistry
+
+        plugin_registry = PluginRegistry.scan()
+        utility.merge_plugins(user_config, plugin_registry)
 
-        cfg = cls(user_config, system_config)
+        cfg = cls(user_config, system_config, plugin_registry)
 
         if user_config != user_config_disk:
             cfg.save()
@@ -93,9 +101,20 @@ class Config:
         self,
         user_config: dict[str, typing.Any],
         system_config: dict[str, typing.Any],
+        plugin_registry: typing.Optional["PluginRegistry"] = None,
     ):
         self.__user_config = user_config
         self.__system_config = system_config
+        self.__plugin_registry = plugin_registry
+
+    @property
+    def plugin_registry(self) -> "PluginRegistry":
+        """The installed plugins, as of loading this configuration."""
+        if self.__plugin_registry is None:
+            from safeeyes.plugin_registry import PluginRegistry
+
+            self.__plugin_registry = PluginRegistry.scan()
+        return self.__plugin_registry
 
     @classmethod
     def __merge_dictionary(cls, old_dict, new_dict, force_upgrade_keys: list[str]):
@@ -117,6 +136,7 @@ class Config:
         config = Config(
             user_config=copy.deepcopy(self.__user_config),
             system_config=self.__system_config,
+            plugin_registry=self.__plugin_registry,
         )
         return config
 
@@ -132,6 +152,10 @@ class Config:
             value = self.__system_config.get(key, None)
         return value
 
+    def as_dict(self) -> dict[str, typing.Any]:
+        """Return all the values, the user values overriding the system values."""
+        return {**self.__system_config, **self.__user_config}
+
     def set(self, key, value):
         """Set the value."""
         self.__user_config[key] = value
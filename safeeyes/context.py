@@ -21,8 +21,8 @@ import datetime
 import gettext
 import typing
 
-from safeeyes import utility
-from safeeyes.model import BreakType, State
+from safeeyes import platform_probe, utility
+from safeeyes.model import BreakType, EventHook, State
 
 if typing.TYPE_CHECKING:
     from safeeyes.safeeyes import SafeEyes
@@ -79,9 +79,13 @@ class Context(MutableMapping):
     api: API
     desktop: str
     is_wayland: bool
+    platform: platform_probe.PlatformInfo
     locale: gettext.NullTranslations
     session: dict[str, typing.Any]
-    state: State
+    _state: State
+
+    # Fired with the new state whenever the state changes
+    on_state_changed: EventHook
 
     skipped: bool = False
     postponed: bool = False
@@ -98,15 +102,29 @@ class Context(MutableMapping):
         session: dict[str, typing.Any],
     ) -> None:
         self.version = version
-        self.desktop = utility.desktop_environment()
-        self.is_wayland = utility.is_wayland()
+        self.platform = platform_probe.get()
+        self.desktop = self.platform.desktop
+        self.is_wayland = self.platform.is_wayland
         self.locale = locale
         self.session = session
-        self.state = State.START
+        self.on_state_changed = EventHook()
+        self._state = State.START
         self.api = api
 
         self.ext = {}
 
+    @property
+    def state(self) -> State:
+        return self._state
+
+    @state.setter
+    def state(self, state: State) -> None:
+        if state == self._state:
+            return
+
+        self._state = state
+        self.on_state_changed.fire(state)
+
     def __setitem__(self, key: str, value: typing.Any) -> None:
         """This is soft-deprecated - it is preferred to access the property."""
         if hasattr(self, key):
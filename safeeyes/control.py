@@ -0,0 +1,218 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""D-Bus interface to control and query the running Safe Eyes instance.
+
+The primary instance exports io.github.slgobinath.SafeEyes.Control next to
+the GApplication interfaces, at /io/github/slgobinath/SafeEyes on the session
+bus. Status bar widgets can subscribe to its signals instead of polling
+`safeeyes --status`.
+"""
+
+import datetime
+import logging
+import typing
+
+from gi.repository import Gio, GLib
+
+from safeeyes.model import BreakType, State
+
+if typing.TYPE_CHECKING:
+    from safeeyes.safeeyes import SafeEyes
+
+INTERFACE_NAME = "io.github.slgobinath.SafeEyes.Control"
+ERROR_PREFIX = "io.github.slgobinath.SafeEyes.Error"
+
+CONTROL_NODE_INFO = Gio.DBusNodeInfo.new_for_xml(
+    """
+<?xml version="1.0" encoding="UTF-8"?>
+<node>
+    <interface name="io.github.slgobinath.SafeEyes.Control">
+        <!--
+            state is one of start, waiting, pre_break, break, stopped, quit
+            and resting. message is the status message, as printed by the
+            status command line option.
+        -->
+        <method name="GetStatus">
+            <arg type="s" name="state" direction="out"/>
+            <arg type="b" name="active" direction="out"/>
+            <arg type="s" name="message" direction="out"/>
+        </method>
+        <!--
+            Unix timestamps of the next break and of the next long break,
+            0 if there is none.
+        -->
+        <method name="GetNextBreaks">
+            <arg type="x" name="next_break" direction="out"/>
+            <arg type="x" name="next_long_break" direction="out"/>
+        </method>
+        <method name="Enable"/>
+        <method name="Disable"/>
+        <!-- break_type is one of "", "short" and "long" -->
+        <method name="TakeBreak">
+            <arg type="s" name="break_type" direction="in"/>
+        </method>
+        <!-- Postpone the current break, as the Postpone button does -->
+        <method name="Postpone"/>
+        <signal name="StateChanged">
+            <arg type="s" name="state"/>
+        </signal>
+        <signal name="NextBreakChanged">
+            <arg type="x" name="next_break"/>
+            <arg type="x" name="next_long_break"/>
+        </signal>
+    </interface>
+</node>"""
+).interfaces[0]
+
+BREAK_TYPES = {
+    "": None,
+    "short": BreakType.SHORT_BREAK,
+    "long": BreakType.LONG_BREAK,
+}
+
+
+class ControlError(Exception):
+    """Returned to the caller as a D-Bus error."""
+
+    def __init__(self, name: str, message: str) -> None:
+        super().__init__(message)
+        self.name = f"{ERROR_PREFIX}.{name}"
+
+
+def state_name(state: State) -> str:
+    return state.name.lower()
+
+
+def timestamp(time: typing.Optional[datetime.datetime]) -> int:
+    if time is None:
+        return 0
+    return int(time.timestamp())
+
+
+class ControlService:
+    """Export the control interface for the given application."""
+
+    registration_id: typing.Optional[int] = None
+
+    def __init__(
+        self,
+        application: "SafeEyes",
+        connection: Gio.DBusConnection,
+        object_path: str,
+    ) -> None:
+        self.application = application
+        self.connection = connection
+        self.object_path = object_path
+
+    def register(self) -> None:
+        self.registration_id = self.connection.register_object(
+            object_path=self.object_path,
+            interface_info=CONTROL_NODE_INFO,
+            method_call_closure=self.on_method_call,
+        )
+
+    def unregister(self) -> None:
+        if self.registration_id is not None:
+            self.connection.unregister_object(self.registration_id)
+            self.registration_id = None
+
+    def on_method_call(
+        self,
+        _connection,
+        _sender,
+        _path,
+        _interface_name,
+        method_name,
+        parameters,
+        invocation,
+    ):
+        method_info = CONTROL_NODE_INFO.lookup_method(method_name)
+        method = getattr(self, method_name)
+
+        try:
+            result = method(*parameters.unpack())
+
+            return_value = None
+            if method_info.out_args:
+                out_arg_types = "".join([arg.signature for arg in method_info.out_args])
+                return_value = GLib.Variant(f"({out_arg_types})", result)
+        except ControlError as error:
+            invocation.return_dbus_error(error.name, str(error))
+            return
+        except Exception as e:
+            # always answer, the client would wait until its timeout otherwise
+            logging.exception("Error in the D-Bus method %s", method_name)
+            invocation.return_dbus_error("org.freedesktop.DBus.Error.Failed", str(e))
+            return
+
+        invocation.return_value(return_value)
+
+    def emit_signal(self, signal_name: str, parameters: GLib.Variant) -> None:
+        if self.registration_id is None:
+            return
+
+        self.connection.emit_signal(
+            None, self.object_path, INTERFACE_NAME, signal_name, parameters
+        )
+
+    def state_changed(self, state: State) -> None:
+        self.emit_signal("StateChanged", GLib.Variant("(s)", (state_name(state),)))
+
+    def next_break_changed(self) -> None:
+        self.emit_signal("NextBreakChanged", GLib.Variant("(xx)", self.GetNextBreaks()))
+
+    def GetStatus(self) -> tuple[str, bool, str]:
+        return (
+            state_name(self.application.context.state),
+            self.application.active,
+            self.application.status(),
+        )
+
+    def GetNextBreaks(self) -> tuple[int, int]:
+        core = self.application.safe_eyes_core
+        if not self.application.active:
+            return (0, 0)
+
+        return (
+            timestamp(core.get_break_time()),
+            timestamp(core.get_break_time(BreakType.LONG_BREAK)),
+        )
+
+    def Enable(self) -> None:
+        logging.info("Enable Safe Eyes over D-Bus")
+        self.application.enable_safeeyes()
+
+    def Disable(self) -> None:
+        logging.info("Disable Safe Eyes over D-Bus")
+        self.application.disable_safeeyes()
+
+    def TakeBreak(self, break_type: str) -> None:
+        if break_type not in BREAK_TYPES:
+            raise ControlError("InvalidArgs", f"Unknown break type '{break_type}'")
+
+        if not self.application.active:
+            raise ControlError("Disabled", "Safe Eyes is disabled")
+
+        logging.info("Take a break over D-Bus")
+        self.application.take_break(BREAK_TYPES[break_type])
+
+    def Postpone(self) -> None:
+        if not self.application.postpone_break():
+            raise ControlError(
+                "NotPostponable", "There is no break which can be postponed"
+            )
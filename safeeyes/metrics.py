@@ -0,0 +1,172 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""In-process metrics of the running instance.
+
+Counters and timings are recorded by the core and the plugins while they run,
+and rendered in the Prometheus text format by the metrics exporter plugin.
+Recording only updates a dictionary, so it is cheap enough to do on every
+plugin hook call. Metrics can be recorded from any thread.
+"""
+
+import threading
+
+# metric name -> (type, help)
+METRICS = {
+    "safeeyes_breaks_total": ("counter", "Breaks started."),
+    "safeeyes_breaks_completed_total": ("counter", "Breaks taken until the end."),
+    "safeeyes_breaks_skipped_total": ("counter", "Breaks skipped."),
+    "safeeyes_breaks_postponed_total": ("counter", "Breaks postponed."),
+    "safeeyes_idle_pauses_total": (
+        "counter",
+        "Times Safe Eyes was paused because the system was idle.",
+    ),
+    "safeeyes_break_screen_show_seconds": (
+        "summary",
+        "Time from the start of a break until the break screen is shown.",
+    ),
+    "safeeyes_plugin_hook_seconds": (
+        "summary",
+        "Time spent in plugin hooks, by plugin and hook.",
+    ),
+    "safeeyes_main_loop_stalls_total": (
+        "counter",
+        "Times the main loop did not respond within the watchdog threshold.",
+    ),
+    "safeeyes_plugin_host_timeouts_total": (
+        "counter",
+        "Hook calls of isolated plugins which exceeded the time budget.",
+    ),
+    "safeeyes_plugin_host_errors_total": (
+        "counter",
+        "Hook calls of isolated plugins which raised an exception.",
+    ),
+    "safeeyes_plugin_host_restarts_total": (
+        "counter",
+        "Restarts of the processes of isolated plugins.",
+    ),
+    "safeeyes_plugin_circuit_opened_total": (
+        "counter",
+        "Times a plugin was bypassed because its hooks failed repeatedly.",
+    ),
+    "safeeyes_log_records_dropped_total": (
+        "counter",
+        "Log records dropped because the log queue was full.",
+    ),
+    "safeeyes_state": ("gauge", "Current state, 1 for the active state."),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+counters: dict[tuple[str, Labels], float] = {}
+# (name, labels) -> [count, sum]
+summaries: dict[tuple[str, Labels], list[float]] = {}
+gauges: dict[tuple[str, Labels], float] = {}
+# guards the dictionaries above, which are also written by other threads, e.g.
+# the watchdog and the logging handlers
+_lock = threading.Lock()
+
+
+def _key(name: str, labels: dict[str, str]) -> tuple[str, Labels]:
+    return (name, tuple(sorted(labels.items())))
+
+
+def inc(name: str, value: float = 1, **labels: str) -> None:
+    """Increment a counter."""
+    key = _key(name, labels)
+    with _lock:
+        counters[key] = counters.get(key, 0) + value
+
+
+def observe(name: str, seconds: float, **labels: str) -> None:
+    """Record one duration of a summary."""
+    key = _key(name, labels)
+    with _lock:
+        summary = summaries.get(key)
+        if summary is None:
+            summaries[key] = [1, seconds]
+        else:
+            summary[0] += 1
+            summary[1] += seconds
+
+
+def set_gauge(name: str, value: float, **labels: str) -> None:
+    key = _key(name, labels)
+    with _lock:
+        gauges[key] = value
+
+
+def clear_gauge(name: str) -> None:
+    """Remove all the label combinations of a gauge."""
+    with _lock:
+        for key in [key for key in gauges if key[0] == name]:
+            del gauges[key]
+
+
+def reset() -> None:
+    with _lock:
+        counters.clear()
+        summaries.clear()
+        gauges.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render() -> str:
+    """Return all the metrics in the Prometheus text exposition format."""
+    samples: dict[str, list[str]] = {}
+
+    def add(name: str, sample_name: str, labels: Labels, value: float) -> None:
+        samples.setdefault(name, []).append(
+            f"{sample_name}{_format_labels(labels)} {_format_value(value)}"
+        )
+
+    with _lock:
+        counter_items = list(counters.items())
+        gauge_items = list(gauges.items())
+        summary_items = [(key, tuple(summary)) for key, summary in summaries.items()]
+
+    for (name, labels), value in counter_items:
+        add(name, name, labels, value)
+    for (name, labels), value in gauge_items:
+        add(name, name, labels, value)
+    for (name, labels), (count, total) in summary_items:
+        add(name, f"{name}_count", labels, count)
+        add(name, f"{name}_sum", labels, total)
+
+    lines: list[str] = []
+    for name in sorted(samples):
+        (metric_type, description) = METRICS.get(name, ("untyped", ""))
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.extend(sorted(samples[name]))
+
+    return "".join(line + "\n" for line in lines)
@@ -0,0 +1,239 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Detect the desktop session Safe Eyes runs in, once.
+
+The session type, desktop environment and compositor are resolved from the
+cheapest source which answers:
+
+1. WAYLAND_DISPLAY, which is set in Wayland sessions.
+2. XDG_SESSION_TYPE, which is set by the display managers.
+3. The Type property of the logind session, read over D-Bus.
+
+The D-Bus query is started on a background thread by start(), early during
+startup, so it is usually finished once the result is needed. get() returns
+the result, and shares it with utility.DESKTOP_ENVIRONMENT and
+utility.IS_WAYLAND.
+"""
+
+import logging
+import os
+import threading
+import typing
+from dataclasses import dataclass
+
+from gi.repository import Gio, GLib
+
+from safeeyes import utility
+
+# milliseconds
+LOGIND_TIMEOUT = 1000
+SESSION_TYPES = ("wayland", "x11", "mir", "tty")
+
+# the desktop sessions which are used as the desktop environment name
+DESKTOP_SESSIONS = [
+    "gnome",
+    "unity",
+    "budgie-desktop",
+    "cinnamon",
+    "mate",
+    "xfce4",
+    "lxde",
+    "pantheon",
+    "fluxbox",
+    "blackbox",
+    "openbox",
+    "icewm",
+    "jwm",
+    "afterstep",
+    "trinity",
+    "kde",
+    "hyprland",
+]
+
+# environment variables set by wlroots based compositors
+COMPOSITOR_VARIABLES = {
+    "SWAYSOCK": "sway",
+    "HYPRLAND_INSTANCE_SIGNATURE": "hyprland",
+    "NIRI_SOCKET": "niri",
+}
+
+
+@dataclass
+class PlatformInfo:
+    # wayland, x11, mir, tty or unknown
+    session_type: str
+    desktop: str
+    compositor: typing.Optional[str] = None
+    # whether Wayland clients and X11 clients (e.g. through XWayland) can
+    # connect to the session
+    wayland_available: bool = False
+    x11_available: bool = False
+
+    @property
+    def is_wayland(self) -> bool:
+        return self.session_type == "wayland"
+
+
+_lock = threading.Lock()
+_info: typing.Optional[PlatformInfo] = None
+_logind_thread: typing.Optional[threading.Thread] = None
+_logind_session_type: typing.Optional[str] = None
+
+
+def _desktop_environment(environ: typing.Mapping[str, str]) -> str:
+    desktop_session = environ.get("DESKTOP_SESSION")
+    current_desktop = environ.get("XDG_CURRENT_DESKTOP")
+    env = "unknown"
+    if desktop_session is not None:
+        desktop_session = desktop_session.lower()
+        if desktop_session in DESKTOP_SESSIONS:
+            env = desktop_session
+        elif desktop_session.startswith("xubuntu") or (
+            current_desktop is not None and "xfce" in current_desktop
+        ):
+            env = "xfce"
+        elif desktop_session.startswith("lubuntu"):
+            env = "lxde"
+        elif (
+            "plasma" in desktop_session
+            or desktop_session.startswith("kubuntu")
+            or environ.get("KDE_FULL_SESSION") == "true"
+        ):
+            env = "kde"
+        elif environ.get("GNOME_DESKTOP_SESSION_ID") or desktop_session.startswith(
+            "gnome"
+        ):
+            env = "gnome"
+        elif desktop_session.startswith("ubuntu"):
+            env = "unity"
+    elif current_desktop is not None:
+        if current_desktop.startswith("sway"):
+            env = "sway"
+    return env
+
+
+def _compositor(
+    environ: typing.Mapping[str, str], desktop: str
+) -> typing.Optional[str]:
+    for variable, compositor in COMPOSITOR_VARIABLES.items():
+        if environ.get(variable):
+            return compositor
+    if desktop == "gnome":
+        return "mutter"
+    if desktop == "kde":
+        return "kwin"
+    return None
+
+
+def _environment_session_type(
+    environ: typing.Mapping[str, str],
+) -> typing.Optional[str]:
+    """Return the session type if the environment variables tell it."""
+    if environ.get("WAYLAND_DISPLAY"):
+        return "wayland"
+    session_type = environ.get("XDG_SESSION_TYPE", "").lower()
+    if session_type in SESSION_TYPES:
+        return session_type
+    return None
+
+
+def _query_logind() -> None:
+    global _logind_session_type
+    try:
+        bus = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+        reply = bus.call_sync(
+            "org.freedesktop.login1",
+            "/org/freedesktop/login1/session/auto",
+            "org.freedesktop.DBus.Properties",
+            "Get",
+            GLib.Variant("(ss)", ("org.freedesktop.login1.Session", "Type")),
+            GLib.VariantType("(v)"),
+            Gio.DBusCallFlags.NONE,
+            LOGIND_TIMEOUT,
+            None,
+        )
+    except GLib.Error as e:
+        logging.warning("Unable to read the session type from logind: %s", e.message)
+        return
+
+    _logind_session_type = reply.unpack()[0].lower()
+
+
+def start() -> None:
+    """Start reading the session type from logind, if the environment does
+    not tell it.
+    """
+    global _logind_thread
+    with _lock:
+        if _info is not None or _logind_thread is not None:
+            return
+        if _environment_session_type(os.environ) is not None:
+            return
+
+        _logind_thread = threading.Thread(
+            target=_query_logind, name="PlatformProbe", daemon=True
+        )
+        _logind_thread.start()
+
+
+def get() -> PlatformInfo:
+    """Return the platform, detecting it on the first call."""
+    info = _info
+    if info is not None:
+        return info
+
+    start()
+    with _lock:
+        info = _info
+        if info is None:
+            info = _detect()
+            _set(info)
+            logging.info("Platform: %s", info)
+    return info
+
+
+def _detect() -> PlatformInfo:
+    session_type = _environment_session_type(os.environ)
+    if session_type is None and _logind_thread is not None:
+        _logind_thread.join(LOGIND_TIMEOUT / 1000)
+        session_type = _logind_session_type
+    if session_type is None:
+        logging.warning("Unable to determine if wayland is running. Assuming no.")
+        session_type = "unknown"
+
+    desktop = _desktop_environment(os.environ)
+    return PlatformInfo(
+        session_type=session_type,
+        desktop=desktop,
+        compositor=_compositor(os.environ, desktop),
+        wayland_available=bool(os.environ.get("WAYLAND_DISPLAY")),
+        x11_available=bool(os.environ.get("DISPLAY")),
+    )
+
+
+def set_info(info: PlatformInfo) -> None:
+    """Use the platform detected by another process."""
+    with _lock:
+        _set(info)
+
+
+def _set(info: PlatformInfo) -> None:
+    global _info
+    _info = info
+    utility.DESKTOP_ENVIRONMENT = info.desktop
+    utility.IS_WAYLAND = info.is_wayland
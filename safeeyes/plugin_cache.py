@@ -0,0 +1,205 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Persistent cache of the plugin metadata and dependency check results.
+
+The cache is stored in $XDG_CACHE_HOME/safeeyes/plugins.json. It is only valid
+for the environment it was written in: the installed Safe Eyes code, PATH and
+the commands in its directories, the Python module directories, the desktop
+session and the locale. If any of these changed, the whole cache is dropped.
+
+Every plugin entry is keyed by the plugin directory and is only valid as long
+as the files in the directory did not change. Retryable dependency failures
+(e.g. a D-Bus service which is not running yet) are never cached, they are
+checked again every time.
+"""
+
+import copy
+import json
+import logging
+import os
+import sys
+import typing
+
+from safeeyes import utility
+from safeeyes.model import PluginDependency
+
+CACHE_FILE_PATH = os.path.join(utility.CACHE_DIRECTORY, "plugins.json")
+
+# environment variables which may change the result of a dependency check
+ENVIRONMENT_VARIABLES = [
+    "PATH",
+    "DISPLAY",
+    "WAYLAND_DISPLAY",
+    "XDG_CURRENT_DESKTOP",
+    "XDG_SESSION_TYPE",
+    "DESKTOP_SESSION",
+    "LANGUAGE",
+    "LANG",
+    "LC_ALL",
+    "LC_MESSAGES",
+]
+
+
+def _stamp(path: str) -> list[list[typing.Any]]:
+    """Return the modification times of the entries of a directory."""
+    try:
+        with os.scandir(path) as entries:
+            return sorted(
+                [entry.name, entry.stat().st_mtime_ns]
+                for entry in entries
+                if entry.name != "__pycache__"
+            )
+    except OSError:
+        return []
+
+
+def _mtime(path: str) -> typing.Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _environment() -> dict[str, typing.Any]:
+    return {
+        "safeeyes": _stamp(utility.BIN_DIRECTORY),
+        "python": sys.version,
+        # installing a module adds an entry to its directory
+        "python_path": [[path, _mtime(path)] for path in sys.path],
+        # installing a command changes its PATH directory
+        "command_path": [
+            [path, _mtime(path)]
+            for path in os.environ.get("PATH", os.defpath).split(os.pathsep)
+        ],
+        "variables": {name: os.environ.get(name) for name in ENVIRONMENT_VARIABLES},
+        "desktop_environment": utility.DESKTOP_ENVIRONMENT,
+        "wayland": utility.IS_WAYLAND,
+        "resources": _mtime(utility.CONFIG_RESOURCE),
+    }
+
+
+def _settings_key(settings: dict) -> str:
+    return json.dumps(settings, sort_keys=True)
+
+
+class PluginCache:
+    """The plugin cache as of one load of the plugins.
+
+    The environment is captured when the cache is created, so a new instance
+    should be created for every load.
+    """
+
+    def __init__(self, path: str = CACHE_FILE_PATH) -> None:
+        self.path = path
+        self.environment = _environment()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._stamps: dict[str, list[list[typing.Any]]] = {}
+
+        data = utility.load_json(path)
+        if isinstance(data, dict) and data.get("environment") == self.environment:
+            self.plugins: dict[str, dict] = data.get("plugins", {})
+        else:
+            self.plugins = {}
+            self._dirty = True
+
+    def __entry(self, plugin_path: str) -> dict:
+        """Return the entry of a plugin, dropping it if the plugin changed."""
+        stamp = self._stamps.get(plugin_path)
+        if stamp is None:
+            stamp = _stamp(plugin_path)
+            self._stamps[plugin_path] = stamp
+
+        entry = self.plugins.get(plugin_path)
+        if entry is None or entry.get("stamp") != stamp:
+            entry = {"stamp": stamp, "config": None, "dependencies": {}}
+            self.plugins[plugin_path] = entry
+            self._dirty = True
+        return entry
+
+    def load_config(self, plugin_path: str) -> typing.Optional[dict]:
+        """Return the parsed config.json of a plugin."""
+        entry = self.__entry(plugin_path)
+        config = entry["config"]
+        if config is None:
+            self.misses += 1
+            config = utility.load_json(os.path.join(plugin_path, "config.json"))
+            if config is None:
+                return None
+            entry["config"] = config
+            self._dirty = True
+        else:
+            self.hits += 1
+
+        # the callers modify the config
+        return copy.deepcopy(config)
+
+    def get_dependencies(
+        self, plugin_path: str, settings: dict
+    ) -> tuple[bool, typing.Union[None, str, PluginDependency]]:
+        """Return whether the dependency check of the plugin with these
+        settings is cached, and its result.
+        """
+        entry = self.__entry(plugin_path)
+        result = entry["dependencies"].get(_settings_key(settings))
+        if result is None:
+            self.misses += 1
+            return (False, None)
+
+        self.hits += 1
+        if result.get("dependency"):
+            return (True, PluginDependency(result["message"], result.get("link")))
+        return (True, result.get("message"))
+
+    def set_dependencies(
+        self,
+        plugin_path: str,
+        settings: dict,
+        result: typing.Union[None, str, PluginDependency],
+    ) -> None:
+        if isinstance(result, PluginDependency):
+            if result.retryable:
+                return
+            value = {"dependency": True, "message": result.message, "link": result.link}
+        else:
+            value = {"message": result}
+
+        entry = self.__entry(plugin_path)
+        entry["dependencies"][_settings_key(settings)] = value
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache, if it changed."""
+        logging.debug("Plugin cache: %d hits and %d misses", self.hits, self.misses)
+        if not self._dirty:
+            return
+
+        try:
+            utility.mkdir(os.path.dirname(self.path))
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w") as cache_file:
+                json.dump(
+                    {"environment": self.environment, "plugins": self.plugins},
+                    cache_file,
+                )
+            # replace the cache atomically, other instances may read it
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logging.error("Failed to write the plugin cache %s: %s", self.path, e)
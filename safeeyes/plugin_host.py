@@ -0,0 +1,628 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Run a plugin in a separate process.
+
+A plugin marked as "isolated" in the Safe Eyes config is imported by a worker
+process started with `python -m safeeyes.plugin_host`. Every hook call is sent
+to the worker as one JSON line on its stdin, and the result is read from its
+stdout.
+
+The worker is started and its methods are read on a separate thread, and
+hook calls made until then are queued. Most hooks do not wait for the worker,
+their replies are read by a GLib IO watch. The hooks whose result is used
+(on_pre_break, on_start_break and the get_* hooks) wait for their reply up to
+the time budget of the plugin, and return None if there is none. A call
+without a reply within the time budget counts as a timeout, and its late reply
+is dropped.
+
+Isolated plugins receive a copy of the context values instead of the context,
+so they cannot use the API, and their hooks can only return JSON values (no
+TrayAction).
+"""
+
+import dataclasses
+import datetime
+import importlib
+import inspect
+import json
+import logging
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+import typing
+
+from gi.repository import GLib
+
+from safeeyes import metrics, platform_probe, translations, utility
+from safeeyes.configuration import Config
+from safeeyes.context import Context
+from safeeyes.model import Break, BreakType, State
+
+DEFAULT_TIME_BUDGET = 1.0
+# importing the plugin and its dependencies takes longer than a hook call
+START_TIMEOUT = 10.0
+# restart a worker which timed out this many times in a row
+MAX_TIMEOUTS = 3
+MAX_RESTARTS = 3
+# the calls which may wait for a reply or for the start of the worker, so
+# that a hanging worker cannot fill the pipe to it
+MAX_PENDING = 16
+# the hooks, besides the get_* hooks, which wait for their reply
+WAITING_HOOKS = ["on_pre_break", "on_start_break"]
+
+# the context properties sent with every call
+CONTEXT_PROPERTIES = [
+    "version",
+    "desktop",
+    "is_wayland",
+    "skipped",
+    "postponed",
+    "skip_button_disabled",
+    "postpone_button_disabled",
+]
+
+
+def _encode(value: typing.Any) -> typing.Any:
+    """Convert the arguments of a hook to JSON values."""
+    if isinstance(value, Break):
+        return {
+            "__type__": "break",
+            "type": value.type.name,
+            "name": value.name,
+            "time": value.time,
+            "duration": value.duration,
+            "image": value.image,
+            "plugins": value.plugins,
+        }
+    if isinstance(value, datetime.datetime):
+        return {"__type__": "datetime", "value": value.isoformat()}
+    if isinstance(value, Config):
+        return {"__type__": "config", "value": value.as_dict()}
+    if isinstance(value, Context):
+        return {"__type__": "context"}
+    return value
+
+
+def _encode_context(context: Context) -> dict[str, typing.Any]:
+    values = {key: getattr(context, key) for key in CONTEXT_PROPERTIES}
+    values["state"] = context.state.name
+    return values
+
+
+class PluginHost:
+    """The worker process of an isolated plugin, seen from Safe Eyes.
+
+    All methods must be called from the main thread.
+    """
+
+    # None until the worker reported its methods
+    methods: typing.Optional[dict[str, int]] = None
+    restarts: int = 0
+    failed: bool = False
+
+    _process: typing.Optional[subprocess.Popen] = None
+
+    def __init__(
+        self,
+        plugin_id: str,
+        plugin_dir: str,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+    ) -> None:
+        self.plugin_id = plugin_id
+        self.plugin_dir = plugin_dir
+        self.time_budget = time_budget
+        self.context: typing.Optional[Context] = None
+        self.__next_id = 0
+        self.__timeouts = 0
+        self.__buffer = b""
+        # incremented by stop, so that a worker started before is discarded
+        self.__generation = 0
+        self.__starting = False
+        self.__watch_id: typing.Optional[int] = None
+        self.__timer_id: typing.Optional[int] = None
+        # the calls made before the worker started
+        self.__queued: list[tuple[str, list]] = []
+        # call id -> (method name, deadline)
+        self.__pending: dict[int, tuple[str, float]] = {}
+        # the call waited for, and its result once it completed
+        self.__waiting: typing.Optional[int] = None
+        self.__result: typing.Any = None
+        # replayed after a restart
+        self.__init_args: typing.Optional[list] = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether the worker is starting, or a call waits for its reply."""
+        return self.__starting or bool(self.__queued) or bool(self.__pending)
+
+    def start(self) -> None:
+        """Start the worker on a separate thread."""
+        if self.__starting or self._process is not None:
+            return
+
+        package_dir = os.path.dirname(utility.BIN_DIRECTORY)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [package_dir, env.get("PYTHONPATH")])
+        )
+        command = [
+            sys.executable,
+            "-m",
+            "safeeyes.plugin_host",
+            self.plugin_id,
+            self.plugin_dir,
+            json.dumps(
+                {
+                    "platform": dataclasses.asdict(platform_probe.get()),
+                    "log_level": logging.getLogger().getEffectiveLevel(),
+                }
+            ),
+        ]
+
+        self.__starting = True
+        self.methods = None
+        threading.Thread(
+            target=self.__spawn,
+            args=(self.__generation, command, env),
+            name=f"PluginHost-{self.plugin_id}",
+            daemon=True,
+        ).start()
+
+    def stop(self, wait: bool = False) -> None:
+        """Stop the worker, once it handled the calls sent to it.
+
+        The worker is killed if it does not exit within the time budget. With
+        wait, this waits for it, otherwise it is reaped by the main loop.
+        """
+        self.__generation += 1
+        self.__starting = False
+        self.__queued = []
+        self.__pending = {}
+        self.__buffer = b""
+        if self.__watch_id is not None:
+            GLib.source_remove(self.__watch_id)
+            self.__watch_id = None
+        if self.__timer_id is not None:
+            GLib.source_remove(self.__timer_id)
+            self.__timer_id = None
+
+        process = self._process
+        self._process = None
+        if process is None:
+            return
+
+        if process.stdin is not None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+        if wait:
+            try:
+                process.wait(self.time_budget)
+            except subprocess.TimeoutExpired:
+                pass
+            self.__reap(process)
+        else:
+            GLib.timeout_add(int(self.time_budget * 1000), self.__reap, process)
+
+    def has_method(self, method_name: str, num_args: int = 0) -> bool:
+        if self.methods is None:
+            # not known yet, the call is queued until the worker started
+            return not self.failed
+        return self.methods.get(method_name) == num_args
+
+    def call(self, method_name: str, args: typing.Sequence[typing.Any]) -> typing.Any:
+        """Call a hook of the plugin.
+
+        Returns the result of the hooks which wait for their reply, or None if
+        there is no reply within the time budget or the worker did not start
+        yet. Returns None without waiting for the other hooks.
+        """
+        if self.failed:
+            return None
+
+        if method_name == "init":
+            self.__init_args = list(args)
+            self.context = args[0]
+
+        if self._process is None or self.methods is None:
+            if len(self.__queued) < MAX_PENDING:
+                self.__queued.append((method_name, list(args)))
+            else:
+                logging.debug(
+                    "Drop %s of %s, it is starting", method_name, self.plugin_id
+                )
+            self.start()
+        elif len(self.__pending) < MAX_PENDING:
+            call_id = self.__send(method_name, list(args))
+            if call_id is not None and _waits(method_name):
+                return self.__wait(call_id)
+        else:
+            logging.debug("Drop %s of %s, it is busy", method_name, self.plugin_id)
+
+        return None
+
+    def __wait(self, call_id: int) -> typing.Any:
+        """Read the replies of the worker until the call completed.
+
+        This blocks the main loop for at most the time budget.
+        """
+        deadline = time.monotonic() + self.time_budget
+        self.__waiting = call_id
+        self.__result = None
+        while call_id in self.__pending:
+            remaining = deadline - time.monotonic()
+            if self._process is None or self._process.stdout is None:
+                break
+            fd = self._process.stdout.fileno()
+            if remaining > 0:
+                (readable, _, _) = select.select([fd], [], [], remaining)
+            else:
+                readable = []
+            if not readable:
+                (method_name, _) = self.__pending.pop(call_id)
+                self.__on_timeout(method_name)
+                break
+
+            try:
+                data = os.read(fd, 65536)
+            except OSError:
+                data = b""
+            if not data:
+                logging.error("The plugin host of %s exited", self.plugin_id)
+                self.__restart()
+                break
+
+            self.__buffer += data
+            self.__read_replies()
+
+        (result, self.__result) = (self.__result, None)
+        self.__waiting = None
+        return result
+
+    def __spawn(self, generation: int, command: list[str], env: dict) -> None:
+        """Start the worker and read its methods, on a separate thread."""
+        process: typing.Optional[subprocess.Popen] = None
+        try:
+            process = subprocess.Popen(
+                command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env
+            )
+            (reply, buffer) = _read_line(process, time.monotonic() + START_TIMEOUT)
+            error = "timed out" if reply is None else None
+        except OSError as e:
+            (reply, buffer, error) = (None, b"", str(e))
+
+        GLib.idle_add(self.__on_started, generation, process, reply, buffer, error)
+
+    def __on_started(
+        self,
+        generation: int,
+        process: typing.Optional[subprocess.Popen],
+        line: typing.Optional[bytes],
+        buffer: bytes,
+        error: typing.Optional[str],
+    ) -> bool:
+        if generation != self.__generation:
+            # stopped while starting
+            if process is not None:
+                self.__reap(process, kill=True)
+            return GLib.SOURCE_REMOVE
+
+        self.__starting = False
+        reply = None
+        if line is not None:
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                error = "invalid reply"
+        if reply is not None and "error" in reply:
+            error = reply["error"]
+
+        if process is None or reply is None or error is not None:
+            logging.error(
+                "Failed to start the plugin host of %s: %s", self.plugin_id, error
+            )
+            if process is not None:
+                self.__reap(process, kill=True)
+            self.failed = True
+            self.__queued = []
+            return GLib.SOURCE_REMOVE
+
+        assert process.stdout is not None
+        self._process = process
+        self.methods = reply["result"]
+        self.__buffer = buffer
+        self.__watch_id = GLib.io_add_watch(
+            process.stdout.fileno(),
+            GLib.PRIORITY_DEFAULT,
+            GLib.IOCondition.IN | GLib.IOCondition.HUP | GLib.IOCondition.ERR,
+            self.__on_readable,
+        )
+        logging.info("Started the plugin host of %s", self.plugin_id)
+
+        (queued, self.__queued) = (self.__queued, [])
+        for method_name, args in queued:
+            if self._process is not None and self.has_method(method_name, len(args)):
+                self.__send(method_name, args)
+        self.__read_replies()
+        return GLib.SOURCE_REMOVE
+
+    def __send(self, method_name: str, args: list) -> typing.Optional[int]:
+        """Send a call to the worker, and return its id if it was sent."""
+        assert self._process is not None and self._process.stdin is not None
+
+        self.__next_id += 1
+        call_id = self.__next_id
+        request = {
+            "id": call_id,
+            "method": method_name,
+            "args": [_encode(arg) for arg in args],
+        }
+        if self.context is not None:
+            request["context"] = _encode_context(self.context)
+
+        timeout = START_TIMEOUT if method_name == "init" else self.time_budget
+        try:
+            self._process.stdin.write(json.dumps(request).encode() + b"\n")
+            self._process.stdin.flush()
+        except (OSError, ValueError) as e:
+            logging.error("Failed to call %s of %s: %s", method_name, self.plugin_id, e)
+            self.__restart()
+            return None
+
+        self.__pending[call_id] = (method_name, time.monotonic() + timeout)
+        if self.__timer_id is None:
+            self.__timer_id = GLib.timeout_add(
+                int(self.time_budget * 1000), self.__check_deadlines
+            )
+        return call_id
+
+    def __on_readable(self, fd: int, condition: GLib.IOCondition) -> bool:
+        try:
+            data = os.read(fd, 65536)
+        except OSError:
+            data = b""
+
+        if not data:
+            self.__watch_id = None
+            logging.error("The plugin host of %s exited", self.plugin_id)
+            self.__restart()
+            return GLib.SOURCE_REMOVE
+
+        self.__buffer += data
+        self.__read_replies()
+        return GLib.SOURCE_CONTINUE
+
+    def __read_replies(self) -> None:
+        while b"\n" in self.__buffer:
+            (line, self.__buffer) = self.__buffer.split(b"\n", 1)
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                logging.warning("Invalid reply from the plugin %s", self.plugin_id)
+                continue
+
+            call = self.__pending.pop(reply.get("id"), None)
+            if call is None:
+                # the reply to a call which timed out
+                continue
+
+            method_name = call[0]
+            self.__timeouts = 0
+            result = None
+            if "error" in reply:
+                metrics.inc("safeeyes_plugin_host_errors_total", plugin=self.plugin_id)
+                logging.error(
+                    "Error in %s of %s: %s", method_name, self.plugin_id, reply["error"]
+                )
+            else:
+                result = reply.get("result")
+            if reply["id"] == self.__waiting:
+                self.__result = result
+
+    def __check_deadlines(self) -> bool:
+        now = time.monotonic()
+        for call_id, (method_name, deadline) in list(self.__pending.items()):
+            if deadline <= now and call_id in self.__pending:
+                del self.__pending[call_id]
+                self.__on_timeout(method_name)
+
+        if self.__pending:
+            return GLib.SOURCE_CONTINUE
+        self.__timer_id = None
+        return GLib.SOURCE_REMOVE
+
+    def __on_timeout(self, method_name: str) -> None:
+        metrics.inc("safeeyes_plugin_host_timeouts_total", plugin=self.plugin_id)
+        self.__timeouts += 1
+        logging.warning(
+            "%s of %s did not return within %.1f seconds",
+            method_name,
+            self.plugin_id,
+            self.time_budget,
+        )
+        if self.__timeouts >= MAX_TIMEOUTS:
+            logging.error("The plugin host of %s does not respond", self.plugin_id)
+            self.__restart()
+
+    def __restart(self) -> None:
+        self.stop()
+        self.__timeouts = 0
+
+        if self.restarts >= MAX_RESTARTS:
+            logging.error(
+                "The plugin host of %s failed too often, disable it", self.plugin_id
+            )
+            self.failed = True
+            return
+
+        self.restarts += 1
+        metrics.inc("safeeyes_plugin_host_restarts_total", plugin=self.plugin_id)
+        if self.__init_args is not None:
+            self.__queued.append(("init", self.__init_args))
+        self.start()
+
+    def __reap(self, process: subprocess.Popen, kill: bool = False) -> bool:
+        """Kill the worker if it is still running, and release it."""
+        if kill or process.poll() is None:
+            process.kill()
+        process.wait()
+        if process.stdin is not None:
+            process.stdin.close()
+        if process.stdout is not None:
+            process.stdout.close()
+        return GLib.SOURCE_REMOVE
+
+
+def _waits(method_name: str) -> bool:
+    """Whether a call of the hook waits for its reply."""
+    return method_name.startswith("get_") or method_name in WAITING_HOOKS
+
+
+def _read_line(
+    process: subprocess.Popen, deadline: float
+) -> tuple[typing.Optional[bytes], bytes]:
+    """Read the first line of the worker until the deadline.
+
+    Returns the line, or None if there is none, and the data after it.
+    """
+    assert process.stdout is not None
+    fd = process.stdout.fileno()
+    buffer = b""
+    while b"\n" not in buffer:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return (None, buffer)
+
+        (readable, _, _) = select.select([fd], [], [], remaining)
+        if not readable:
+            return (None, buffer)
+
+        data = os.read(fd, 65536)
+        if not data:
+            return (None, buffer)
+        buffer += data
+
+    (line, buffer) = buffer.split(b"\n", 1)
+    return (line, buffer)
+
+
+class _ContextCopy(dict):
+    """The context values of the main process, as items and attributes."""
+
+    def __getattr__(self, key: str) -> typing.Any:
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+
+def _decode(value: typing.Any, context: _ContextCopy) -> typing.Any:
+    if not isinstance(value, dict) or "__type__" not in value:
+        return value
+
+    value_type = value["__type__"]
+    if value_type == "break":
+        return Break(
+            BreakType[value["type"]],
+            value["name"],
+            value["time"],
+            value["duration"],
+            value["image"],
+            value["plugins"],
+        )
+    if value_type == "datetime":
+        return datetime.datetime.fromisoformat(value["value"])
+    if value_type == "config":
+        return Config(user_config=value["value"], system_config={})
+    if value_type == "context":
+        return context
+    raise ValueError(f"Unknown value type: {value_type}")
+
+
+def _serve(
+    module: typing.Any, requests: typing.IO[bytes], replies: typing.IO[bytes]
+) -> None:
+    context = _ContextCopy(session={"plugin": {}})
+
+    def reply(message: dict) -> None:
+        replies.write(json.dumps(message).encode() + b"\n")
+        replies.flush()
+
+    methods = {
+        name: len(inspect.getfullargspec(function).args)
+        for (name, function) in inspect.getmembers(module, inspect.isfunction)
+        if not name.startswith("_")
+    }
+    reply({"id": 0, "result": methods})
+
+    for line in requests:
+        request = json.loads(line)
+        if "context" in request:
+            values = request["context"]
+            values["state"] = State[values["state"]]
+            context.update(values)
+
+        try:
+            args = [_decode(arg, context) for arg in request["args"]]
+            result = getattr(module, request["method"])(*args)
+            json.dumps(result)
+        except Exception as e:
+            logging.exception("Error in %s", request["method"])
+            reply({"id": request["id"], "error": f"{type(e).__name__}: {e}"})
+        else:
+            reply({"id": request["id"], "result": result})
+
+
+def main() -> None:
+    """Import the plugin, and serve the hook calls on stdin and stdout."""
+    (plugin_id, plugin_dir, platform_json) = sys.argv[1:4]
+    platform = json.loads(platform_json)
+
+    # the replies use the original stdout, anything the plugin prints goes to
+    # stderr
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    logging.basicConfig(
+        level=platform["log_level"],
+        format=f"%(asctime)s [%(levelname)s]:[{plugin_id}] %(message)s",
+    )
+
+    platform_probe.set_info(platform_probe.PlatformInfo(**platform["platform"]))
+    translations.setup()
+
+    sys.path.append(plugin_dir)
+    try:
+        module = importlib.import_module(plugin_id + ".plugin")
+    except Exception as e:
+        logging.exception("Failed to import the plugin")
+        replies.write(
+            json.dumps({"id": 0, "error": f"{type(e).__name__}: {e}"}).encode() + b"\n"
+        )
+        replies.flush()
+        sys.exit(1)
+
+    _serve(module, sys.stdin.buffer, replies)
+
+
+if __name__ == "__main__":
+    main()
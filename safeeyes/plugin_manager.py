@@ -56,23 +56,51 @@ The plugin.py can additionally have the following methods:
  - get_widget_content(break_obj)
     Returns content of this plugin's widget on the break screen
     If this is used, it must also use get_widget_title to work correctly
+ - get_widget_token(break_obj)
+    Returns a value which changes whenever the widget changes
+    The widget of a break is reused as long as the token is the same, and is
+    rendered ahead during the prepare time of the break. Without this method,
+    or if it returns None, the widget is rendered at every break start.
+    Content which depends on the time can include e.g. the minute in the token.
+    The widgets of isolated plugins are never reused.
  - get_tray_action(break_obj) -> TrayAction | list[TrayAction]
     Display button(s) on the break screen's tray that triggers an action
 
 This method is unused:
  - description()
     If a custom description has to be displayed, use this function
+
+The config.json can declare the hooks of the plugin in a "hooks" list. Such a
+plugin is imported only when one of these hooks is called for the first time,
+and init is deferred until then. The other methods are not called while the
+plugin is not imported. Plugins without a "hooks" list are imported at startup.
+
+A plugin with "isolated": true in its entry of the Safe Eyes config runs in a
+separate process, see safeeyes.plugin_host. Its hooks may take at most
+"time_budget" seconds. Safe Eyes waits for on_pre_break, on_start_break and
+the get_* hooks up to that time, and does not wait for the other hooks.
+
+An isolated plugin, or a plugin with a "time_budget" in its entry, is bypassed
+for a while if its hooks repeatedly raise exceptions or take longer than its
+"time_budget", see safeeyes.circuit_breaker. Required plugins are never
+bypassed, and neither are the hooks which undo the effects of other hooks
+(TEARDOWN_HOOKS), so that a plugin is not left e.g. muting the audio.
 """
 
 import importlib
 import logging
 import os
 import sys
+import time
 import typing
 
-from safeeyes import utility
+from safeeyes import metrics, utility
+from safeeyes.circuit_breaker import CircuitBreaker
 from safeeyes.configuration import Config
 from safeeyes.context import Context
+from safeeyes.plugin_cache import PluginCache
+from safeeyes.plugin_host import DEFAULT_TIME_BUDGET, PluginHost
+from safeeyes.plugin_registry import PluginInfo, PluginRegistry
 from safeeyes.model import (
     Break,
     PluginDependency,
@@ -84,17 +112,25 @@ sys.path.append(os.path.abspath(utility.SYSTEM_PLUGINS_DIR))
 sys.path.append(os.path.abspath(utility.USER_PLUGINS_DIR))
 
 HORIZONTAL_LINE_LENGTH = 64
+# the hooks which are called even if the plugin is bypassed
+TEARDOWN_HOOKS = frozenset(["on_stop_break", "on_stop", "on_exit"])
 
 
 class PluginManager:
     """Imports the Safe Eyes plugins and calls the methods defined in those plugins."""
 
     __plugins: dict[str, "LoadedPlugin"]
+    # plugin id -> (break, token, widget) of the last rendered widget
+    __widgets: dict[str, tuple[Break, typing.Any, str]]
+    # plugin id -> number of the reload waiting for its dependency check
+    __reloads: dict[str, int]
     last_break: typing.Optional[Break]
 
     def __init__(self) -> None:
         logging.info("Load all the plugins")
         self.__plugins = {}
+        self.__widgets = {}
+        self.__reloads = {}
         self.last_break = None
         self.horizontal_line = "─" * HORIZONTAL_LINE_LENGTH
 
@@ -103,29 +139,18 @@ class PluginManager:
         plugin_config) function.
         """
         # Load the plugins
-        for plugin in config.get("plugins"):
-            try:
-                loaded_plugin = LoadedPlugin(plugin)
-                self.__plugins[loaded_plugin.id] = loaded_plugin
-            except RequiredPluginException as e:
-                raise e
-            except BaseException as e:
-                traceback_wanted = (
-                    logging.getLogger().getEffectiveLevel() == logging.DEBUG
-                )
-                if traceback_wanted:
-                    import traceback
-
-                    traceback.print_exc()
-                logging.error("Error in loading the plugin %s: %s", plugin["id"], e)
-                continue
+        self.__load_plugins(
+            config.plugin_registry, config.get("plugins"), raise_required=True
+        )
         # Initialize the plugins
         for plugin in self.__plugins.values():
             plugin.init_plugin(context, config)
 
     def reload(self, context: Context, config: Config) -> None:
         """Reinitialize all the plugins with updated config."""
+        self.__widgets.clear()
         plugin_ids: set[str] = set()
+        new_plugins = []
         # Load the plugins
         for plugin in config.get("plugins"):
             plugin_id = plugin["id"]
@@ -133,19 +158,8 @@ class PluginManager:
             if plugin_id in self.__plugins:
                 self.__plugins[plugin_id].reload_config(plugin)
             else:
-                try:
-                    loaded_plugin = LoadedPlugin(plugin)
-                    self.__plugins[loaded_plugin.id] = loaded_plugin
-                except BaseException as e:
-                    traceback_wanted = (
-                        logging.getLogger().getEffectiveLevel() == logging.DEBUG
-                    )
-                    if traceback_wanted:
-                        import traceback
-
-                        traceback.print_exc()
-                    logging.error("Error in loading the plugin %s: %s", plugin["id"], e)
-                    continue
+                new_plugins.append(plugin)
+        self.__load_plugins(config.plugin_registry, new_plugins, raise_required=False)
 
         removed_plugins = set(self.__plugins.keys()).difference(plugin_ids)
         for plugin_id in removed_plugins:
@@ -155,6 +169,73 @@ class PluginManager:
         for plugin in self.__plugins.values():
             plugin.init_plugin(context, config)
 
+    def __load_plugins(
+        self, registry: PluginRegistry, plugins: list[dict], raise_required: bool
+    ) -> None:
+        """Load the given plugins.
+
+        The dependencies of all plugins are checked concurrently, so that
+        loading takes as long as the slowest check instead of the sum of all.
+        The plugins are loaded in the given order once all checks finished.
+        The dependency check results are cached on disk.
+        """
+        cache = PluginCache()
+        loaded_plugins = []
+        for plugin in plugins:
+            try:
+                loaded_plugins.append(LoadedPlugin(plugin, registry.get(plugin["id"])))
+            except BaseException as e:
+                self.__log_load_error(plugin["id"], e)
+
+        checked_plugins = [
+            loaded_plugin
+            for loaded_plugin in loaded_plugins
+            if loaded_plugin.needs_dependency_check()
+        ]
+        results = utility.check_plugins_dependencies(
+            [
+                loaded_plugin.dependency_check_args()
+                for loaded_plugin in checked_plugins
+            ],
+            cache=cache,
+        )
+        cache.save()
+        messages = {
+            loaded_plugin.id: message
+            for (loaded_plugin, message) in zip(checked_plugins, results)
+        }
+
+        for loaded_plugin in loaded_plugins:
+            try:
+                if loaded_plugin.id in messages:
+                    loaded_plugin.load(messages[loaded_plugin.id])
+                self.__plugins[loaded_plugin.id] = loaded_plugin
+            except RequiredPluginException as e:
+                if raise_required:
+                    raise e
+                self.__log_load_error(loaded_plugin.id, e)
+            except BaseException as e:
+                self.__log_load_error(loaded_plugin.id, e)
+
+    def __log_load_error(self, plugin_id: str, error: BaseException) -> None:
+        traceback_wanted = logging.getLogger().getEffectiveLevel() == logging.DEBUG
+        if traceback_wanted:
+            import traceback
+
+            traceback.print_exception(error)
+        logging.error("Error in loading the plugin %s: %s", plugin_id, error)
+
+    def preload_next(self) -> bool:
+        """Import the next plugin whose import was deferred.
+
+        Returns whether to be called again, to be used as an idle callback.
+        """
+        for plugin in self.__plugins.values():
+            if plugin.deferred and (plugin.enabled or plugin.break_override_allowed):
+                plugin.preload()
+                return True
+        return False
+
     def needs_retry(self) -> bool:
         return self.get_retryable_error() is not None
 
@@ -171,6 +252,92 @@ class PluginManager:
 
         return None
 
+    def reload_plugin(
+        self, plugin_id: str, context: Context, config: Config, active: bool
+    ) -> None:
+        """Reload a plugin whose files changed, without touching the others.
+
+        The plugin is imported and initialized again once its dependencies
+        were checked, without blocking the main loop. It is started again if
+        Safe Eyes was active.
+        """
+        plugin = self.__plugins.get(plugin_id)
+        if plugin is None:
+            # not a configured plugin
+            return
+
+        self.__widgets.pop(plugin_id, None)
+        try:
+            plugin.unload_module(config)
+        except BaseException as e:
+            self.__log_load_error(plugin_id, e)
+            return
+
+        if not plugin.needs_dependency_check():
+            logging.info("Reloaded the plugin %s", plugin_id)
+            return
+
+        # the dependency check can take seconds, so it runs on a separate
+        # thread and the plugin is loaded by the main loop afterwards
+        generation = self.__reloads.get(plugin_id, 0) + 1
+        self.__reloads[plugin_id] = generation
+        utility.start_thread(
+            self.__check_reloaded_plugin,
+            plugin_id,
+            generation,
+            plugin.dependency_check_args(),
+            context,
+            config,
+            active,
+        )
+
+    def __check_reloaded_plugin(
+        self,
+        plugin_id: str,
+        generation: int,
+        check: tuple[str, dict, dict, str],
+        context: Context,
+        config: Config,
+        active: bool,
+    ) -> None:
+        """Check the dependencies of a reloaded plugin, on a separate thread."""
+        (message,) = utility.check_plugins_dependencies([check])
+        utility.execute_main_thread(
+            self.__finish_reload,
+            plugin_id,
+            generation,
+            message,
+            context,
+            config,
+            active,
+        )
+
+    def __finish_reload(
+        self,
+        plugin_id: str,
+        generation: int,
+        message: typing.Union[None, str, PluginDependency, BaseException],
+        context: Context,
+        config: Config,
+        active: bool,
+    ) -> None:
+        plugin = self.__plugins.get(plugin_id)
+        if plugin is None or self.__reloads.get(plugin_id) != generation:
+            # reloaded again in the meantime
+            return
+        del self.__reloads[plugin_id]
+
+        try:
+            plugin.load(message)
+            plugin.init_plugin(context, config)
+        except BaseException as e:
+            self.__log_load_error(plugin_id, e)
+            return
+
+        if active:
+            plugin.call_plugin_method("on_start")
+        logging.info("Reloaded the plugin %s", plugin_id)
+
     def retry_errored_plugins(self) -> None:
         for plugin in self.__plugins.values():
             if plugin.required_plugin and plugin.errored and plugin.enabled:
@@ -194,12 +361,17 @@ class PluginManager:
         """Execute the on_exit() function of plugins."""
         for plugin in self.__plugins.values():
             plugin.call_plugin_method("on_exit")
+            plugin.close(wait=True)
 
     def pre_break(self, break_obj) -> bool:
         """Execute the on_pre_break(break_obj) function of plugins."""
         for plugin in self.__plugins.values():
             if plugin.call_plugin_method_break_obj("on_pre_break", 1, break_obj):
                 return False
+
+        # render the cacheable widgets now instead of at the break start
+        for plugin in self.__plugins.values():
+            self.__get_widget(plugin, break_obj, cacheable_only=True)
         return True
 
     def start_break(self, break_obj) -> bool:
@@ -232,30 +404,70 @@ class PluginManager:
         """Return the HTML widget generated by the plugins.
 
         The widget is generated by calling the get_widget_title and
-        get_widget_content functions of plugins.
+        get_widget_content functions of plugins, unless the widget of the
+        plugin for this break is still valid according to get_widget_token.
         """
-        widget = ""
+        widgets = []
         for plugin in self.__plugins.values():
-            try:
-                title = plugin.call_plugin_method_break_obj(
-                    "get_widget_title", 1, break_obj
-                )
-                if title is None or not isinstance(title, str) or title == "":
-                    continue
-                content = plugin.call_plugin_method_break_obj(
-                    "get_widget_content", 1, break_obj
-                )
-                if content is None or not isinstance(content, str) or content == "":
-                    continue
-                title = title.upper().strip()
-                if title == "":
-                    continue
-                widget += "<b>{}</b>\n{}\n{}\n\n\n".format(
-                    title, self.horizontal_line, content
+            widget = self.__get_widget(plugin, break_obj)
+            if widget:
+                widgets.append(widget)
+        return "\n\n\n".join(widgets).strip()
+
+    def __get_widget(
+        self, plugin: "LoadedPlugin", break_obj: Break, cacheable_only: bool = False
+    ) -> str:
+        """Return the widget of one plugin, or an empty string.
+
+        With cacheable_only, widgets without a token are not rendered.
+        """
+        try:
+            token = None
+            if not plugin.isolated:
+                # a hook of an isolated plugin can time out, and the widget
+                # rendered then must not be reused
+                token = plugin.call_plugin_method_break_obj(
+                    "get_widget_token", 1, break_obj
                 )
-            except BaseException:
-                continue
-        return widget.strip()
+            if token is None:
+                self.__widgets.pop(plugin.id, None)
+                if cacheable_only:
+                    return ""
+                return self.__render_widget(plugin, break_obj)
+
+            cached = self.__widgets.get(plugin.id)
+            if cached is not None and cached[0] is break_obj and cached[1] == token:
+                return cached[2]
+
+            widget = self.__render_widget(plugin, break_obj)
+        except Exception:
+            logging.exception("Error in the break screen widget of %s", plugin.id)
+            return ""
+
+        self.__widgets[plugin.id] = (break_obj, token, widget)
+        return widget
+
+    def __render_widget(self, plugin: "LoadedPlugin", break_obj: Break) -> str:
+        title = plugin.call_plugin_method_break_obj("get_widget_title", 1, break_obj)
+        if title is None or not isinstance(title, str) or title == "":
+            return ""
+        content = plugin.call_plugin_method_break_obj(
+            "get_widget_content", 1, break_obj
+        )
+        if content is None or not isinstance(content, str) or content == "":
+            return ""
+        title = title.upper().strip()
+        if title == "":
+            return ""
+        return "<b>{}</b>\n{}\n{}".format(title, self.horizontal_line, content)
+
+    def get_bypassed_plugins(self) -> dict[str, CircuitBreaker]:
+        """Return the circuit breakers of the plugins which are bypassed."""
+        return {
+            plugin.id: plugin.circuit_breaker
+            for plugin in self.__plugins.values()
+            if plugin.circuit_breaker is not None and plugin.circuit_breaker.is_open()
+        }
 
     def get_break_screen_tray_actions(self, break_obj: Break) -> list[TrayAction]:
         """Return Tray Actions."""
@@ -286,13 +498,33 @@ class LoadedPlugin:
     # to confuse
     config: dict
     plugin_config: dict
+    # the settings of the plugin in the Safe Eyes config
+    settings: dict
     plugin_dir: str
     module: typing.Optional[typing.Any] = None
+    # the hooks which need the module, None if it is imported at startup
+    hooks: typing.Optional[frozenset[str]] = None
+    # whether the import is deferred until one of the hooks is called
+    deferred: bool = False
+    _init_args: typing.Optional[tuple[Context, Config]] = None
+    # whether the plugin runs in a separate process
+    isolated: bool = False
+    # whether the plugin is bypassed if its hooks fail repeatedly
+    bypassable: bool = False
+    time_budget: float = DEFAULT_TIME_BUDGET
+    host: typing.Optional[PluginHost] = None
+    # None for the plugins which are never bypassed
+    circuit_breaker: typing.Optional[CircuitBreaker] = None
     last_error: typing.Optional[typing.Union[str, PluginDependency]] = None
     id: str
 
-    def __init__(self, plugin: dict) -> None:
-        (plugin_config, plugin_dir) = self._load_config_json(plugin["id"])
+    def __init__(self, plugin: dict, plugin_info: typing.Optional[PluginInfo]) -> None:
+        if plugin_info is None:
+            raise Exception(
+                f"plugin.py or config.json not found for the plugin: {plugin['id']}"
+            )
+        plugin_config = plugin_info.copy_config()
+        plugin_dir = plugin_info.plugins_dir
 
         self.id = plugin["id"]
         self.plugin_config = plugin_config
@@ -300,28 +532,53 @@ class LoadedPlugin:
         self.enabled = plugin["enabled"]
         self.break_override_allowed = plugin_config.get("break_override_allowed", False)
         self.required_plugin = plugin_config.get("required_plugin", False)
-
-        self.config = dict(plugin.get("settings", {}))
+        if "hooks" in plugin_config:
+            self.hooks = frozenset(plugin_config["hooks"])
+        self.isolated = plugin.get("isolated", False)
+        self.time_budget = plugin.get("time_budget", DEFAULT_TIME_BUDGET)
+        self.bypassable = not self.required_plugin and (
+            self.isolated or "time_budget" in plugin
+        )
+        self.circuit_breaker = self.__new_circuit_breaker()
+
+        self.settings = plugin.get("settings", {})
+        self.config = dict(self.settings)
         self.config["path"] = os.path.join(plugin_dir, plugin["id"])
 
-        if self.enabled or self.break_override_allowed:
-            plugin_path = os.path.join(plugin_dir, self.id)
-            message = utility.check_plugin_dependencies(
-                plugin["id"], plugin_config, plugin.get("settings", {}), plugin_path
-            )
+    def __new_circuit_breaker(self) -> typing.Optional[CircuitBreaker]:
+        if not self.bypassable:
+            return None
+        return CircuitBreaker(self.id, self.time_budget)
 
-            if message:
-                self.errored = True
-                self.last_error = message
-                if self.required_plugin and not (
-                    isinstance(message, PluginDependency) and message.retryable
-                ):
-                    raise RequiredPluginException(
-                        plugin["id"], plugin_config["meta"]["name"], message
-                    )
-                return
+    def needs_dependency_check(self) -> bool:
+        return self.enabled or self.break_override_allowed
+
+    def dependency_check_args(self) -> tuple[str, dict, dict, str]:
+        """Return the arguments of utility.check_plugin_dependencies."""
+        plugin_path = os.path.join(self.plugin_dir, self.id)
+        return (self.id, self.plugin_config, self.settings, plugin_path)
+
+    def load(
+        self, message: typing.Union[None, str, PluginDependency, BaseException]
+    ) -> None:
+        """Import the plugin if its dependency check passed.
+
+        Raises the exception of the check, or RequiredPluginException if a
+        required plugin cannot be loaded.
+        """
+        if isinstance(message, BaseException):
+            raise message
+
+        if message:
+            self.errored = True
+            self.last_error = message
+            if self.required_plugin and not (
+                isinstance(message, PluginDependency) and message.retryable
+            ):
+                raise RequiredPluginException(self.id, self.get_name(), message)
+            return
 
-            self._import_plugin()
+        self._import_plugin()
 
     def reload_config(self, plugin: dict) -> None:
         if not plugin["enabled"]:
@@ -332,7 +589,8 @@ class LoadedPlugin:
             self.enabled = True
 
         # Update the config
-        self.config = dict(plugin.get("settings", {}))
+        self.settings = plugin.get("settings", {})
+        self.config = dict(self.settings)
         self.config["path"] = os.path.join(self.plugin_dir, plugin["id"])
 
         if self.enabled or self.break_override_allowed:
@@ -355,14 +613,60 @@ class LoadedPlugin:
     def disable(self) -> None:
         if self.enabled:
             self.enabled = False
+            if not self.break_override_allowed:
+                # imported on demand again, if the plugin is enabled again
+                self.deferred = False
+                self._init_args = None
             if (
                 not self.errored
                 and self.module is not None
-                and utility.has_method(self.module, "disable")
+                and self.__has_method("disable")
             ):
-                self.module.disable()
+                self.__call("disable")
+            if not self.break_override_allowed:
+                self.close()
             logging.info("Successfully unloaded the plugin '%s'", self.id)
 
+    def unload_module(self, safeeyes_config: Config) -> None:
+        """Forget the imported plugin after its files changed.
+
+        The config.json is read again. The plugin is imported again by load,
+        once its dependencies were checked, and must then be initialized.
+        """
+        if (
+            not self.errored
+            and self.module is not None
+            and self.__has_method("disable")
+        ):
+            self.__call("disable")
+        self.close()
+
+        # import the plugin and its modules from scratch
+        for name in list(sys.modules):
+            if name == self.id or name.startswith(self.id + "."):
+                del sys.modules[name]
+        importlib.invalidate_caches()
+
+        plugin_info = safeeyes_config.plugin_registry.refresh(self.id)
+        if plugin_info is None:
+            raise Exception(
+                f"plugin.py or config.json not found for the plugin: {self.id}"
+            )
+        self.plugin_config = plugin_info.copy_config()
+        self.plugin_dir = plugin_info.plugins_dir
+        self.break_override_allowed = self.plugin_config.get(
+            "break_override_allowed", False
+        )
+        self.hooks = None
+        if "hooks" in self.plugin_config:
+            self.hooks = frozenset(self.plugin_config["hooks"])
+        self.module = None
+        self.deferred = False
+        self._init_args = None
+        self.errored = False
+        self.last_error = None
+        self.circuit_breaker = self.__new_circuit_breaker()
+
     def reload_errored(self) -> None:
         if not self.errored:
             return
@@ -392,41 +696,79 @@ class LoadedPlugin:
             # do not try to import errored plugin
             return
 
-        self.module = importlib.import_module((self.id + ".plugin"))
-        logging.info("Successfully loaded %s", str(self.module))
+        if self.hooks is not None:
+            # import the module once one of its hooks is called
+            self.deferred = True
+            return
 
-        if utility.has_method(self.module, "enable"):
-            self.module.enable()
+        self.__import_module()
 
-    def _load_config_json(self, plugin_id: str) -> typing.Tuple[dict, str]:
-        # Look for plugin.py
-        if os.path.isfile(
-            os.path.join(utility.SYSTEM_PLUGINS_DIR, plugin_id, "plugin.py")
-        ):
-            plugin_dir = utility.SYSTEM_PLUGINS_DIR
-        elif os.path.isfile(
-            os.path.join(utility.USER_PLUGINS_DIR, plugin_id, "plugin.py")
-        ):
-            plugin_dir = utility.USER_PLUGINS_DIR
+    def preload(self) -> None:
+        """Import the module of a deferred plugin, and initialize it."""
+        if not self.deferred:
+            return
+
+        self.deferred = False
+        try:
+            self.__import_module()
+        except BaseException as e:
+            logging.error("Error in loading the plugin %s: %s", self.id, e)
+            self.errored = True
+            self.last_error = str(e)
+            return
+
+        if self._init_args is not None:
+            (context, safeeyes_config) = self._init_args
+            self._init_args = None
+            self.init_plugin(context, safeeyes_config)
+
+    def __import_module(self) -> None:
+        if self.isolated:
+            host = PluginHost(self.id, self.plugin_dir, self.time_budget)
+            host.start()
+            self.host = host
+            self.module = host
         else:
-            raise Exception("plugin.py not found for the plugin: %s", plugin_id)
-        # Look for config.json
-        plugin_path = os.path.join(plugin_dir, plugin_id)
-        plugin_config_path = os.path.join(plugin_path, "config.json")
-        if not os.path.isfile(plugin_config_path):
-            raise Exception("config.json not found for the plugin: %s", plugin_id)
-        plugin_config = utility.load_json(plugin_config_path)
-        if plugin_config is None:
-            raise Exception("config.json empty/invalid for the plugin: %s", plugin_id)
-
-        return (plugin_config, plugin_dir)
+            self.module = importlib.import_module((self.id + ".plugin"))
+        logging.info("Successfully loaded %s", str(self.module))
+
+        if self.__has_method("enable"):
+            self.__call("enable")
+
+    def close(self, wait: bool = False) -> None:
+        """Stop the process of an isolated plugin.
+
+        With wait, wait until it handled the calls sent to it, e.g. on exit.
+        """
+        if self.host is not None:
+            self.host.stop(wait)
+            self.host = None
+            self.module = None
+
+    def __has_method(self, method_name: str, num_args: int = 0) -> bool:
+        if self.host is not None:
+            return self.host.has_method(method_name, num_args)
+        return utility.has_method(self.module, method_name, num_args)
+
+    def __call(self, method_name: str, *args, **kwargs) -> typing.Any:
+        if self.host is None:
+            return getattr(self.module, method_name)(*args, **kwargs)
+
+        result = self.host.call(method_name, args)
+        if self.host.failed:
+            self.errored = True
+            self.last_error = "The plugin process failed too often"
+        return result
 
     def init_plugin(self, context: Context, safeeyes_config: Config) -> None:
         if self.errored:
             return
         if self.break_override_allowed or self.enabled:
-            if self.module is not None and utility.has_method(self.module, "init", 3):
-                self.module.init(context, safeeyes_config, self.config)
+            if self.deferred:
+                self._init_args = (context, safeeyes_config)
+                return
+            if self.module is not None and self.__has_method("init", 3):
+                self.__call("init", context, safeeyes_config, self.config)
 
     def call_plugin_method_break_obj(
         self, method_name: str, num_args, break_obj, *args, **kwargs
@@ -463,7 +805,39 @@ class LoadedPlugin:
     def _call_plugin_method_internal(
         self, method_name: str, num_args=0, *args, **kwargs
     ) -> typing.Any:
+        if self.deferred:
+            if self.hooks is None or method_name not in self.hooks:
+                return None
+            self.preload()
+
         # FIXME: cache if method exists
-        if utility.has_method(self.module, method_name, num_args):
-            return getattr(self.module, method_name)(*args, **kwargs)
-        return None
+        if not self.__has_method(method_name, num_args):
+            return None
+
+        circuit_breaker = self.circuit_breaker
+        teardown = method_name in TEARDOWN_HOOKS
+        if circuit_breaker is not None and not teardown:
+            if not circuit_breaker.allow():
+                return None
+
+        start = time.perf_counter()
+        error: typing.Optional[Exception] = None
+        try:
+            return self.__call(method_name, *args, **kwargs)
+        except Exception as e:
+            if circuit_breaker is None:
+                raise
+            error = e
+            if teardown or circuit_breaker.failures[method_name] == 0:
+                logging.exception("Error in %s of %s", method_name, self.id)
+            return None
+        finally:
+            duration = time.perf_counter() - start
+            metrics.observe(
+                "safeeyes_plugin_hook_seconds",
+                duration,
+                plugin=self.id,
+                hook=method_name,
+            )
+            if circuit_breaker is not None and not teardown:
+                circuit_breaker.record(method_name, duration, error)
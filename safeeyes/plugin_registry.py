@@ -0,0 +1,143 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""The plugins installed in the system and user plugin directories.
+
+The plugin directories are scanned once per configuration load. The registry
+is shared by the configuration, the plugin manager and the settings dialog, so
+that they do not probe the plugin directories again.
+
+A plugin is a directory with a plugin.py and a valid config.json. If a system
+plugin and a user plugin have the same id, the system plugin is used.
+"""
+
+import copy
+import logging
+import os
+import typing
+from dataclasses import dataclass
+
+from safeeyes import utility
+from safeeyes.plugin_cache import PluginCache
+
+
+@dataclass
+class PluginInfo:
+    id: str
+    # the directory containing the plugin directory
+    plugins_dir: str
+    path: str
+    # the parsed config.json, which must not be modified
+    config: dict
+    # the icon.png of the plugin, if any
+    icon: typing.Optional[str] = None
+
+    def copy_config(self) -> dict:
+        return copy.deepcopy(self.config)
+
+
+class PluginRegistry:
+    """The installed plugins, by id, in a stable order."""
+
+    def __init__(self, plugins: typing.Iterable[PluginInfo] = ()) -> None:
+        self.__plugins: dict[str, PluginInfo] = {}
+        for plugin in plugins:
+            self.__plugins.setdefault(plugin.id, plugin)
+
+    @classmethod
+    def scan(
+        cls,
+        directories: typing.Optional[list[str]] = None,
+        cache: typing.Optional[PluginCache] = None,
+    ) -> "PluginRegistry":
+        """Find the plugins in the given directories.
+
+        The directories default to the system and the user plugin directory.
+        The plugins of each directory are ordered by id.
+        """
+        if directories is None:
+            directories = [utility.SYSTEM_PLUGINS_DIR, utility.USER_PLUGINS_DIR]
+        if cache is None:
+            cache = PluginCache()
+
+        plugins = []
+        for directory in directories:
+            try:
+                with os.scandir(directory) as entries:
+                    plugin_ids = sorted(
+                        entry.name for entry in entries if entry.is_dir()
+                    )
+            except OSError:
+                continue
+
+            for plugin_id in plugin_ids:
+                plugin = _load(directory, plugin_id, cache)
+                if plugin is not None:
+                    plugins.append(plugin)
+
+        cache.save()
+        return cls(plugins)
+
+    def __contains__(self, plugin_id: str) -> bool:
+        return plugin_id in self.__plugins
+
+    def __iter__(self) -> typing.Iterator[PluginInfo]:
+        return iter(self.__plugins.values())
+
+    def __len__(self) -> int:
+        return len(self.__plugins)
+
+    def get(self, plugin_id: str) -> typing.Optional[PluginInfo]:
+        return self.__plugins.get(plugin_id)
+
+    def refresh(self, plugin_id: str) -> typing.Optional[PluginInfo]:
+        """Read a plugin from disk again, after its files changed."""
+        for directory in [utility.SYSTEM_PLUGINS_DIR, utility.USER_PLUGINS_DIR]:
+            plugin = _load(directory, plugin_id)
+            if plugin is not None:
+                self.__plugins[plugin_id] = plugin
+                return plugin
+
+        self.__plugins.pop(plugin_id, None)
+        return None
+
+
+def _load(
+    directory: str, plugin_id: str, cache: typing.Optional[PluginCache] = None
+) -> typing.Optional[PluginInfo]:
+    path = os.path.join(directory, plugin_id)
+    try:
+        with os.scandir(path) as entries:
+            files = {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return None
+
+    if "plugin.py" not in files or "config.json" not in files:
+        return None
+
+    if cache is not None:
+        config = cache.load_config(path)
+    else:
+        config = utility.load_json(os.path.join(path, "config.json"))
+    if config is None:
+        logging.error("Invalid config.json of the plugin %s", plugin_id)
+        return None
+
+    icon = None
+    if "icon.png" in files:
+        icon = os.path.join(path, "icon.png")
+    return PluginInfo(plugin_id, directory, path, config, icon)
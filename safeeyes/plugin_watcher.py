@@ -0,0 +1,166 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Watch the plugin directories for changes.
+
+Every plugin directory and all its subdirectories are watched with a
+Gio.FileMonitor, so that changes in the subpackages of a plugin are seen too.
+Directories created later are watched once they appear. Saving a plugin
+usually changes several files in quick succession, so the changes are
+debounced per plugin: the callback is called once the files of a plugin did
+not change for DEBOUNCE_INTERVAL milliseconds.
+"""
+
+import logging
+import os
+import typing
+
+from gi.repository import Gio, GLib
+
+DEBOUNCE_INTERVAL = 500
+# the delay before trying again, if the callback could not reload the plugin
+RETRY_INTERVAL = 5000
+IGNORED_NAMES = ("__pycache__",)
+IGNORED_SUFFIXES = (".pyc", ".swp", ".tmp", "~")
+
+
+class PluginWatcher:
+    """Call on_changed with the plugin id, whenever the files of a plugin in
+    one of the directories changed.
+
+    on_changed returns False to be called again later.
+    """
+
+    def __init__(
+        self, directories: list[str], on_changed: typing.Callable[[str], bool]
+    ) -> None:
+        self.directories = [os.path.abspath(directory) for directory in directories]
+        self._on_changed = on_changed
+        self._monitors: dict[str, Gio.FileMonitor] = {}
+        # plugin id -> timeout id
+        self._pending: dict[str, int] = {}
+
+        for directory in self.directories:
+            if os.path.isdir(directory):
+                self.__watch_tree(directory)
+
+    def stop(self) -> None:
+        for monitor in self._monitors.values():
+            monitor.cancel()
+        self._monitors.clear()
+
+        for timeout_id in self._pending.values():
+            GLib.source_remove(timeout_id)
+        self._pending.clear()
+
+    def __watch_tree(self, path: str) -> None:
+        """Watch the directory and its subdirectories."""
+        self.__watch(path)
+        try:
+            with os.scandir(path) as entries:
+                subdirectories = [
+                    entry.path
+                    for entry in entries
+                    if entry.is_dir(follow_symlinks=False)
+                    and entry.name not in IGNORED_NAMES
+                ]
+        except OSError as e:
+            logging.error("Cannot watch the plugin directory %s: %s", path, e)
+            return
+
+        for subdirectory in subdirectories:
+            self.__watch_tree(subdirectory)
+
+    def __unwatch_tree(self, path: str) -> None:
+        """Stop watching a removed directory and its subdirectories."""
+        for watched in list(self._monitors):
+            if watched == path or watched.startswith(path + os.sep):
+                self._monitors.pop(watched).cancel()
+
+    def __watch(self, path: str) -> None:
+        if path in self._monitors:
+            return
+
+        try:
+            monitor = Gio.File.new_for_path(path).monitor_directory(
+                Gio.FileMonitorFlags.WATCH_MOVES, None
+            )
+        except GLib.Error as e:
+            logging.error("Cannot watch the plugin directory %s: %s", path, e)
+            return
+
+        monitor.connect("changed", self.__on_changed)
+        self._monitors[path] = monitor
+
+    def __plugin_id(self, path: str) -> typing.Optional[str]:
+        for directory in self.directories:
+            if path.startswith(directory + os.sep):
+                return os.path.relpath(path, directory).split(os.sep)[0]
+        return None
+
+    def __on_changed(
+        self,
+        monitor: Gio.FileMonitor,
+        file: Gio.File,
+        other_file: typing.Optional[Gio.File],
+        event_type: Gio.FileMonitorEvent,
+    ) -> None:
+        if event_type == Gio.FileMonitorEvent.ATTRIBUTE_CHANGED:
+            return
+
+        path = file.get_path()
+        if path is None:
+            return
+        name = os.path.basename(path)
+        if name in IGNORED_NAMES or name.endswith(IGNORED_SUFFIXES):
+            return
+
+        plugin_id = self.__plugin_id(path)
+        if plugin_id is None or plugin_id in IGNORED_NAMES:
+            return
+
+        if event_type in (
+            Gio.FileMonitorEvent.DELETED,
+            Gio.FileMonitorEvent.MOVED_OUT,
+        ):
+            self.__unwatch_tree(path)
+        elif event_type == Gio.FileMonitorEvent.RENAMED:
+            self.__unwatch_tree(path)
+            new_path = other_file.get_path() if other_file is not None else None
+            if new_path is not None and os.path.isdir(new_path):
+                self.__watch_tree(new_path)
+        elif os.path.isdir(path):
+            # a new plugin or subpackage
+            self.__watch_tree(path)
+
+        self.__schedule(plugin_id, DEBOUNCE_INTERVAL)
+
+    def __schedule(self, plugin_id: str, interval: int) -> None:
+        timeout_id = self._pending.pop(plugin_id, None)
+        if timeout_id is not None:
+            GLib.source_remove(timeout_id)
+
+        self._pending[plugin_id] = GLib.timeout_add(interval, self.__fire, plugin_id)
+
+    def __fire(self, plugin_id: str) -> bool:
+        del self._pending[plugin_id]
+
+        logging.info("The files of the plugin %s changed", plugin_id)
+        if not self._on_changed(plugin_id):
+            self.__schedule(plugin_id, RETRY_INTERVAL)
+
+        return GLib.SOURCE_REMOVE
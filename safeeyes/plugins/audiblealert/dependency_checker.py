@@ -16,11 +16,25 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from gi.repository import GLib
+
 from safeeyes import utility
 from safeeyes.translations import translate as _
 
 
+def _gstreamer_available() -> bool:
+    try:
+        from .gst_player import is_available
+
+        return is_available()
+    except (ImportError, ValueError, GLib.Error):
+        return False
+
+
 def validate(plugin_config, plugin_settings):
+    if _gstreamer_available():
+        return None
+
     commands = ["ffplay", "pw-play"]
     exists = False
     for command in commands:
@@ -0,0 +1,149 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""In-process playback of the audible alerts using GStreamer."""
+
+import logging
+import time
+import typing
+import wave
+
+import gi
+
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+REQUIRED_ELEMENTS = ["appsrc", "audioconvert", "audioresample", "volume"]
+
+# sample width in bytes -> GStreamer raw audio format
+SAMPLE_FORMATS = {1: "U8", 2: "S16LE", 3: "S24LE", 4: "S32LE"}
+
+
+def is_available(sink: str = "autoaudiosink") -> bool:
+    """Check whether GStreamer and all the needed elements are installed."""
+    if not Gst.is_initialized():
+        Gst.init(None)
+
+    for element in [*REQUIRED_ELEMENTS, sink]:
+        if Gst.ElementFactory.find(element) is None:
+            return False
+    return True
+
+
+def read_wav(path: str) -> typing.Tuple[Gst.Caps, bytes]:
+    """Decode the PCM wav file at the given path.
+
+    Raises wave.Error if the file is not an uncompressed wav file.
+    """
+    with wave.open(path, "rb") as wav:
+        sample_format = SAMPLE_FORMATS.get(wav.getsampwidth())
+        if sample_format is None:
+            raise wave.Error(f"unsupported sample width {wav.getsampwidth()}")
+
+        caps = Gst.Caps.from_string(
+            f"audio/x-raw,format={sample_format},layout=interleaved,"
+            f"rate={wav.getframerate()},channels={wav.getnchannels()}"
+        )
+        if caps is None:
+            raise wave.Error("unsupported wav parameters")
+        data = wav.readframes(wav.getnframes())
+
+    return (caps, data)
+
+
+class GstAlertPlayer:
+    """Play a preloaded sound through a persistent GStreamer pipeline.
+
+    The wav file is decoded once, when the player is created. Every call to
+    play() pushes the same buffer through the pipeline again, so there is no
+    process to spawn and nothing to decode at alert time.
+    The volume is applied in software by the volume element.
+    """
+
+    # monotonic time of the last play() call, until it reached PLAYING
+    _play_requested: typing.Optional[float] = None
+
+    # seconds between the last play() call and the pipeline reaching PLAYING
+    latency: typing.Optional[float] = None
+
+    def __init__(self, path: str, volume: int, sink: str = "autoaudiosink") -> None:
+        (caps, data) = read_wav(path)
+
+        self.path = path
+        self._buffer = Gst.Buffer.new_wrapped(data)
+
+        self._pipeline = typing.cast(
+            Gst.Pipeline,
+            Gst.parse_launch(
+                "appsrc name=src format=time ! audioconvert ! audioresample"
+                f" ! volume name=volume ! {sink}"
+            ),
+        )
+        self._src = self._pipeline.get_by_name("src")
+        self._volume = self._pipeline.get_by_name("volume")
+        self._src.set_property("caps", caps)  # type: ignore[union-attr]
+        self.set_volume(volume)
+
+        bus = self._pipeline.get_bus()
+        bus.add_signal_watch()
+        bus.connect("message", self._on_message)
+
+        # Open the audio device right away, so the first alert is not delayed
+        self._pipeline.set_state(Gst.State.READY)
+
+    def set_volume(self, volume: int) -> None:
+        """Set the volume in percent."""
+        self._volume.set_property("volume", volume / 100)  # type: ignore[union-attr]
+
+    def play(self) -> None:
+        """Start playing the sound, without waiting for it to finish.
+
+        A sound that is still playing is restarted.
+        """
+        self._pipeline.set_state(Gst.State.READY)
+        self._play_requested = time.monotonic()
+        self._pipeline.set_state(Gst.State.PLAYING)
+        self._src.emit("push-buffer", self._buffer)  # type: ignore[union-attr]
+        self._src.emit("end-of-stream")  # type: ignore[union-attr]
+
+    def close(self) -> None:
+        """Release the pipeline and the audio device."""
+        bus = self._pipeline.get_bus()
+        bus.remove_signal_watch()
+        self._pipeline.set_state(Gst.State.NULL)
+
+    def _on_message(self, bus: Gst.Bus, message: Gst.Message) -> None:
+        if message.type == Gst.MessageType.EOS:
+            self._pipeline.set_state(Gst.State.READY)
+        elif message.type == Gst.MessageType.ERROR:
+            (error, _debug) = message.parse_error()
+            logging.error("Failed to play %s: %s", self.path, error.message)
+            self._pipeline.set_state(Gst.State.READY)
+        elif (
+            message.type == Gst.MessageType.STATE_CHANGED
+            and message.src == self._pipeline
+            and self._play_requested is not None
+        ):
+            (_old, new, _pending) = message.parse_state_changed()
+            if new == Gst.State.PLAYING:
+                self.latency = time.monotonic() - self._play_requested
+                self._play_requested = None
+                logging.debug(
+                    "Audible alert %s started after %.1f ms",
+                    self.path,
+                    self.latency * 1000,
+                )
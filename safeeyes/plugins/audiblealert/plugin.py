@@ -21,13 +21,25 @@ the break has end.
 """
 
 import logging
+import typing
+import wave
+
+from gi.repository import GLib
+
 from safeeyes import utility
 
+ALERT_SOUNDS = ["on_pre_break.wav", "on_stop_break.wav"]
+
 context = None
 pre_break_alert = False
 post_break_alert = False
 volume: int = 100
 
+# resource name -> in-process player, if GStreamer is available
+players: dict[str, typing.Any] = {}
+# external command used if a sound cannot be played in-process
+fallback_command: typing.Optional[str] = None
+
 
 def play_sound(resource_name):
     """Play the audio resource.
@@ -40,16 +52,22 @@ def play_sound(resource_name):
     global volume
 
     logging.info("Playing audible alert %s at volume %s%%", resource_name, volume)
+
+    player = players.get(resource_name)
+    if player is not None:
+        player.play()
+        return
+
     try:
         # Open the sound file
         path = utility.get_resource_path(resource_name)
         if path is None:
             return
-    except BaseException:
+    except OSError:
         logging.error("Failed to load resource %s", resource_name)
         return
 
-    if utility.command_exist("ffplay"):  # ffmpeg
+    if fallback_command == "ffplay":  # ffmpeg
         utility.execute_command(
             "ffplay",
             [
@@ -62,17 +80,68 @@ def play_sound(resource_name):
                 str(volume),
             ],
         )
-    elif utility.command_exist("pw-play"):  # pipewire
+    elif fallback_command == "pw-play":  # pipewire
         pwvol = volume / 100  # 0 = silent, 1.0 = 100% volume
         utility.execute_command("pw-play", ["--volume", str(pwvol), path])
 
 
+def __load_players() -> None:
+    """Decode the alert sounds and prepare the in-process players.
+
+    Sounds which are already loaded from the same file only get their volume
+    updated.
+    """
+    try:
+        from .gst_player import GstAlertPlayer, is_available
+
+        available = is_available()
+    except (ImportError, ValueError, GLib.Error) as e:
+        logging.info("Unable to play audible alerts in-process: %s", e)
+        __close_players()
+        return
+
+    if not available:
+        logging.info(
+            "Unable to play audible alerts in-process: "
+            "required GStreamer elements are missing"
+        )
+        __close_players()
+        return
+
+    for resource_name in ALERT_SOUNDS:
+        path = utility.get_resource_path(resource_name)
+        player = players.get(resource_name)
+
+        if player is not None and player.path == path:
+            player.set_volume(volume)
+            continue
+
+        if player is not None:
+            player.close()
+            del players[resource_name]
+
+        if path is None:
+            continue
+
+        try:
+            players[resource_name] = GstAlertPlayer(path, volume)
+        except (OSError, EOFError, wave.Error, GLib.Error) as e:
+            logging.warning("Unable to preload %s: %s", resource_name, e)
+
+
+def __close_players() -> None:
+    for player in players.values():
+        player.close()
+    players.clear()
+
+
 def init(ctx, safeeyes_config, plugin_config):
     """Initialize the plugin."""
     global context
     global pre_break_alert
     global post_break_alert
     global volume
+    global fallback_command
     logging.debug("Initialize Audible Alert plugin")
     context = ctx
     pre_break_alert = plugin_config["pre_break_alert"]
@@ -83,6 +152,14 @@ def init(ctx, safeeyes_config, plugin_config):
     if volume < 0:
         volume = 0
 
+    __load_players()
+
+    fallback_command = None
+    for command in ["ffplay", "pw-play"]:
+        if utility.command_exist(command):
+            fallback_command = command
+            break
+
 
 def on_pre_break(break_obj):
     """Play the pre_break sound if the option is enabled.
@@ -102,3 +179,8 @@ def on_stop_break():
     if context["skipped"] or context["postponed"] or not post_break_alert:
         return
     play_sound("on_stop_break.wav")
+
+
+def disable():
+    """Release the audio pipelines."""
+    __close_players()
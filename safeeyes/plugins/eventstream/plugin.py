@@ -0,0 +1,157 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Publish the Safe Eyes events as JSON lines on a Unix socket.
+
+The socket is created at $XDG_RUNTIME_DIR/safeeyes/events.sock. Every line is
+an object with the event name, the local time and event specific fields, e.g.
+{"event": "break_start", "time": "...", "break": "...", "type": "short"}
+"""
+
+import datetime
+import logging
+import os
+import typing
+
+from gi.repository import GLib
+
+from safeeyes import utility
+from safeeyes.model import State
+
+from .server import DEFAULT_BACKLOG, EventServer
+
+context = None
+server: typing.Optional[EventServer] = None
+last_state: typing.Optional[State] = None
+
+
+def socket_path() -> str:
+    return os.path.join(GLib.get_user_runtime_dir(), "safeeyes", "events.sock")
+
+
+def init(ctx, safeeyes_config, plugin_config):
+    """Start listening for subscribers."""
+    global context
+    global server
+    global last_state
+
+    logging.debug("Initialize Event Stream plugin")
+    backlog = plugin_config.get("backlog", DEFAULT_BACKLOG)
+
+    if server is None:
+        path = socket_path()
+        try:
+            utility.mkdir(os.path.dirname(path))
+            server = EventServer(path, backlog)
+        except OSError as e:
+            logging.error("Failed to create the event stream socket %s: %s", path, e)
+            return
+
+        context = ctx
+        last_state = ctx.state
+        context.on_state_changed += on_state_changed
+    else:
+        server.backlog = backlog
+
+
+def _publish(event: str, **fields) -> None:
+    if server is not None:
+        time = datetime.datetime.now().astimezone().isoformat(timespec="seconds")
+        server.publish(event, time=time, **fields)
+
+
+def _break_fields(break_obj) -> dict[str, typing.Any]:
+    return {
+        "break": break_obj.name,
+        "type": "long" if break_obj.is_long_break() else "short",
+        "duration": break_obj.duration,
+    }
+
+
+def on_state_changed(state: State) -> bool:
+    # called by the context directly, not through the plugin manager, so an
+    # error must not reach the state change of the core or the other handlers
+    try:
+        _publish_state(state)
+    except Exception:
+        logging.exception("Failed to publish the state %s", state.name)
+    return True
+
+
+def _publish_state(state: State) -> None:
+    global last_state
+
+    previous_state = last_state
+    last_state = state
+
+    _publish("state", state=state.name.lower())
+
+    # smart pause disables Safe Eyes with the RESTING state while idle
+    if state == State.RESTING:
+        _publish("idle_pause")
+    elif previous_state == State.RESTING and state not in (State.STOPPED, State.QUIT):
+        _publish("idle_resume")
+
+
+def on_pre_break(break_obj):
+    _publish("pre_break", **_break_fields(break_obj))
+
+
+def on_start_break(break_obj):
+    _publish("break_start", **_break_fields(break_obj))
+
+
+def on_stop_break():
+    if context is None:
+        return
+
+    if context.skipped:
+        _publish("skip")
+    elif context.postponed:
+        _publish("postpone")
+    _publish("break_stop")
+
+
+def update_next_break(break_obj, next_break_time):
+    _publish(
+        "next_break",
+        time_of_break=next_break_time.isoformat(timespec="seconds"),
+        **_break_fields(break_obj),
+    )
+
+
+def _close() -> None:
+    global context
+    global server
+
+    if context is not None:
+        context.on_state_changed -= on_state_changed
+        context = None
+
+    if server is not None:
+        server.close()
+        server = None
+
+
+def on_exit():
+    """Remove the socket."""
+    _close()
+
+
+def disable():
+    """Remove the socket."""
+    _close()
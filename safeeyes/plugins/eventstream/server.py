@@ -0,0 +1,193 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Non-blocking Unix socket server publishing newline-delimited JSON.
+
+All sockets are non-blocking and driven by GLib watches on the main loop.
+Every subscriber has a bounded backlog of unsent lines. A subscriber which
+does not read fast enough to stay within it is disconnected, instead of
+holding up the main loop or the other subscribers.
+"""
+
+import collections
+import json
+import logging
+import os
+import socket
+import typing
+
+from gi.repository import GLib
+
+DEFAULT_BACKLOG = 256
+
+
+class Subscriber:
+    """A connected client, and the lines which were not sent to it yet."""
+
+    def __init__(
+        self,
+        connection: socket.socket,
+        backlog: int,
+        on_close: typing.Callable[["Subscriber"], None],
+    ) -> None:
+        self.connection = connection
+        self.backlog = backlog
+        self._on_close = on_close
+        self._queue: collections.deque[bytes] = collections.deque()
+        self._write_watch_id: typing.Optional[int] = None
+
+        connection.setblocking(False)
+        self._read_watch_id: typing.Optional[int] = GLib.io_add_watch(
+            connection.fileno(),
+            GLib.PRIORITY_DEFAULT,
+            GLib.IOCondition.IN | GLib.IOCondition.HUP | GLib.IOCondition.ERR,
+            self.__on_readable,
+        )
+
+    def send(self, line: bytes) -> None:
+        if len(self._queue) >= self.backlog:
+            logging.warning("Disconnect event stream subscriber, it is too slow")
+            self.close()
+            return
+
+        self._queue.append(line)
+        if self._write_watch_id is None:
+            self.__flush()
+
+    def close(self) -> None:
+        for watch_id in (self._read_watch_id, self._write_watch_id):
+            if watch_id is not None:
+                GLib.source_remove(watch_id)
+        self._read_watch_id = None
+        self._write_watch_id = None
+
+        self._queue.clear()
+        self.connection.close()
+        self._on_close(self)
+
+    def __flush(self) -> bool:
+        """Send as much of the queue as the socket accepts without blocking."""
+        while self._queue:
+            data = self._queue[0]
+            try:
+                sent = self.connection.send(data)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                logging.debug("Event stream subscriber went away: %s", e)
+                self.close()
+                return GLib.SOURCE_REMOVE
+
+            if sent < len(data):
+                self._queue[0] = data[sent:]
+                break
+            self._queue.popleft()
+
+        if not self._queue:
+            self._write_watch_id = None
+            return GLib.SOURCE_REMOVE
+
+        if self._write_watch_id is None:
+            # Continue once the socket is writable again
+            self._write_watch_id = GLib.io_add_watch(
+                self.connection.fileno(),
+                GLib.PRIORITY_DEFAULT,
+                GLib.IOCondition.OUT,
+                self.__on_writable,
+            )
+        return GLib.SOURCE_CONTINUE
+
+    def __on_writable(self, _fd, _condition) -> bool:
+        return self.__flush()
+
+    def __on_readable(self, _fd, condition) -> bool:
+        # Subscribers are not expected to send anything, only detect when they
+        # disconnect
+        data = b""
+        if condition & GLib.IOCondition.IN:
+            try:
+                data = self.connection.recv(4096)
+            except BlockingIOError:
+                return GLib.SOURCE_CONTINUE
+            except OSError:
+                data = b""
+
+        if data:
+            return GLib.SOURCE_CONTINUE
+
+        self._read_watch_id = None
+        self.close()
+        return GLib.SOURCE_REMOVE
+
+
+class EventServer:
+    """Listen on a Unix socket, and send every published event to all
+    connected subscribers.
+    """
+
+    def __init__(self, path: str, backlog: int = DEFAULT_BACKLOG) -> None:
+        self.path = path
+        self.backlog = backlog
+        self.subscribers: list[Subscriber] = []
+
+        # Replace the socket left behind by a previous instance
+        if os.path.exists(path):
+            os.unlink(path)
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.setblocking(False)
+        self._socket.bind(path)
+        os.chmod(path, 0o600)
+        self._socket.listen()
+
+        self._accept_watch_id: typing.Optional[int] = GLib.io_add_watch(
+            self._socket.fileno(),
+            GLib.PRIORITY_DEFAULT,
+            GLib.IOCondition.IN,
+            self.__on_accept,
+        )
+
+    def publish(self, event: str, **fields: typing.Any) -> None:
+        line = json.dumps({"event": event, **fields}).encode() + b"\n"
+
+        # sending can disconnect subscribers, which modifies the list
+        for subscriber in list(self.subscribers):
+            subscriber.send(line)
+
+    def close(self) -> None:
+        if self._accept_watch_id is not None:
+            GLib.source_remove(self._accept_watch_id)
+            self._accept_watch_id = None
+
+        for subscriber in list(self.subscribers):
+            subscriber.close()
+
+        self._socket.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def __on_accept(self, _fd, _condition) -> bool:
+        try:
+            (connection, _address) = self._socket.accept()
+        except BlockingIOError:
+            return GLib.SOURCE_CONTINUE
+
+        logging.debug("New event stream subscriber")
+        self.subscribers.append(
+            Subscriber(connection, self.backlog, self.subscribers.remove)
+        )
+        return GLib.SOURCE_CONTINUE
@@ -0,0 +1,127 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Export the health statistics history as CSV or JSON Lines.
+
+Used by `safeeyes --stats`, which runs without starting the application.
+"""
+
+import csv
+import datetime
+import json
+import typing
+
+from .store import HealthStore, Rollup
+
+REPORTS = ["events", "daily", "weekly", "hourly"]
+FORMATS = ["csv", "jsonl"]
+
+ROLLUP_FIELDS = [
+    "breaks",
+    "completed_breaks",
+    "skipped_breaks",
+    "postponed_breaks",
+    "screen_time",
+    "compliance",
+    "skip_ratio",
+]
+
+
+def rollup_row(rollup: Rollup) -> dict[str, typing.Any]:
+    """Flatten a rollup, adding the derived ratios.
+
+    Compliance is the share of the started breaks that were taken until the
+    end, the skip ratio the share that was skipped.
+    """
+    row: dict[str, typing.Any] = {
+        "breaks": rollup.breaks,
+        "completed_breaks": rollup.completed_breaks,
+        "skipped_breaks": rollup.skipped_breaks,
+        "postponed_breaks": rollup.postponed_breaks,
+        "screen_time": rollup.screen_time,
+        "compliance": None,
+        "skip_ratio": None,
+    }
+    if rollup.breaks:
+        row["compliance"] = round(rollup.completed_breaks / rollup.breaks, 3)
+        row["skip_ratio"] = round(rollup.skipped_breaks / rollup.breaks, 3)
+    return row
+
+
+def report_rows(
+    store: HealthStore, report: str
+) -> typing.Tuple[list[str], typing.Iterator[dict[str, typing.Any]]]:
+    """Return the field names and a stream of rows for the given report."""
+    if report == "events":
+        return (
+            ["time", "event", "duration"],
+            (
+                {
+                    "time": datetime.datetime.fromtimestamp(
+                        event.timestamp
+                    ).isoformat(),
+                    "event": event.kind.name.lower(),
+                    "duration": event.duration,
+                }
+                for event in store.events()
+            ),
+        )
+    elif report == "daily":
+        return (
+            ["day", *ROLLUP_FIELDS],
+            (
+                {"day": day, **rollup_row(rollup)}
+                for day, rollup in store.daily_rollups()
+            ),
+        )
+    elif report == "weekly":
+        return (
+            ["week", *ROLLUP_FIELDS],
+            (
+                {"week": week, **rollup_row(rollup)}
+                for week, rollup in store.weekly_rollups()
+            ),
+        )
+    elif report == "hourly":
+        return (
+            ["hour", *ROLLUP_FIELDS],
+            (
+                {"hour": hour, **rollup_row(rollup)}
+                for hour, rollup in enumerate(store.hourly_rollups())
+            ),
+        )
+
+    raise ValueError(f"Unknown report '{report}', expected one of {REPORTS}")
+
+
+def export(
+    store: HealthStore, report: str, output_format: str, output: typing.TextIO
+) -> None:
+    """Write the report to output, one row at a time."""
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown format '{output_format}', expected one of {FORMATS}")
+
+    (fields, rows) = report_rows(store, report)
+
+    if output_format == "csv":
+        writer = csv.DictWriter(output, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            output.write(json.dumps(row))
+            output.write("\n")
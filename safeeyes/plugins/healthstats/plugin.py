@@ -21,10 +21,20 @@
 import croniter
 import datetime
 import logging
+import os
+import sqlite3
+import typing
+
+from safeeyes import utility
 from safeeyes.translations import translate as _
 
+from .store import DEFAULT_RETENTION_DAYS, HISTORY_FILE_NAME, EventKind, HealthStore
+
+HISTORY_FILE_PATH = os.path.join(utility.DATA_DIRECTORY, HISTORY_FILE_NAME)
+
 context = None
 session = None
+store: typing.Optional[HealthStore] = None
 statistics_reset_cron = None
 default_statistics_reset_cron = "0 0 * * *"  # Every midnight
 next_reset_time = None
@@ -36,12 +46,25 @@ def init(ctx, safeeyes_config, plugin_config):
     global context
     global session
     global statistics_reset_cron
+    global store
 
     logging.debug("Initialize Health Stats plugin")
     context = ctx
     statistics_reset_cron = plugin_config.get(
         "statistics_reset_cron", default_statistics_reset_cron
     )
+    retention_days = plugin_config.get("history_days", DEFAULT_RETENTION_DAYS)
+
+    if store is None:
+        try:
+            utility.mkdir(utility.DATA_DIRECTORY)
+            store = HealthStore(HISTORY_FILE_PATH, retention_days)
+        except (sqlite3.Error, OSError) as e:
+            logging.error("Failed to open the health statistics history: %s", e)
+
+    if store is not None:
+        store.retention_days = retention_days
+        _run_store(store.compact)
 
     if session is None:
         # Read the session
@@ -70,6 +93,11 @@ def on_stop_break():
     global session
     if context["skipped"]:
         session["skipped_breaks"] += 1
+        _record(EventKind.SKIP)
+    elif context["postponed"]:
+        _record(EventKind.POSTPONE)
+    else:
+        _record(EventKind.BREAK_END)
 
     # Screen time is starting again.
     on_start()
@@ -78,6 +106,7 @@ def on_stop_break():
 def on_start_break(break_obj):
     global session
     session["breaks"] += 1
+    _record(EventKind.BREAK_START)
 
     # Screen time has stopped.
     on_stop()
@@ -89,6 +118,7 @@ def on_stop():
     if start_time:
         screen_time = datetime.datetime.now() - start_time
         session["screen_time"] += round(screen_time.total_seconds())
+        _record(EventKind.SCREEN_TIME, start_time, round(screen_time.total_seconds()))
         start_time = None
 
 
@@ -116,6 +146,9 @@ def _reset_stats():
         session["skipped_breaks"] = 0
         session["screen_time"] = 0
 
+        if store is not None:
+            _run_store(store.compact)
+
 
 def get_widget_content(break_obj):
     """Return the statistics."""
@@ -144,6 +177,13 @@ def get_widget_content(break_obj):
         content[3] += f" [{_format_interval(session['total_screen_time'] / resets)}]"
 
     content = "\t".join(content)
+    if store is not None:
+        week = _run_store(store.week, datetime.date.today())
+        if week is not None:
+            content += (
+                f"\n\tTHIS WEEK: {week.breaks} BREAKS, {week.skipped_breaks} SKIPPED,"
+                f" {_format_interval(week.screen_time)} SCREEN TIME"
+            )
     if resets:
         content += f"\n\t[] = average of {resets} reset(s)"
     if next_reset_time is None:
@@ -153,6 +193,14 @@ def get_widget_content(break_obj):
     return content
 
 
+def on_exit():
+    """Close the history."""
+    global store
+    if store is not None:
+        _run_store(store.close)
+        store = None
+
+
 def on_start():
     """Track the start time."""
     global start_time
@@ -175,6 +223,24 @@ def _get_next_reset_time():
         next_reset_time = None
 
 
+def _record(kind, time=None, duration=0):
+    if store is not None:
+        _run_store(store.record, kind, time, duration)
+
+
+def _run_store(method, *args):
+    """Call a method of the store, logging instead of raising any error.
+
+    The history is not important enough to break the statistics on the break
+    screen, e.g. if the disk is full.
+    """
+    try:
+        return method(*args)
+    except (sqlite3.Error, OSError) as e:
+        logging.error("Error in the health statistics history: %s", e)
+        return None
+
+
 def _format_interval(seconds):
     screen_time = round(seconds / 60)
     hours, minutes = divmod(screen_time, 60)
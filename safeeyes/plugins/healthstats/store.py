@@ -0,0 +1,312 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Persistent history of the health statistics.
+
+Every break start, break end, skip, postpone and screen time interval is
+appended to an event log in a SQLite database. Daily and weekly rollups are
+updated in the same transaction, so reading the totals of a day or a week is a
+single row lookup.
+
+Raw events are only kept for a limited number of days, daily rollups for
+DAILY_ROLLUP_RETENTION_DAYS and weekly rollups forever.
+
+This module only depends on the standard library, so that the history can be
+read without starting Safe Eyes.
+"""
+
+from dataclasses import dataclass
+import datetime
+import enum
+import sqlite3
+import typing
+
+SCHEMA_VERSION = 1
+
+HISTORY_FILE_NAME = "healthstats.sqlite"
+
+DEFAULT_RETENTION_DAYS = 90
+DAILY_ROLLUP_RETENTION_DAYS = 730
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    timestamp INTEGER NOT NULL,
+    kind INTEGER NOT NULL,
+    duration INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp);
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT PRIMARY KEY,
+    breaks INTEGER NOT NULL DEFAULT 0,
+    completed_breaks INTEGER NOT NULL DEFAULT 0,
+    skipped_breaks INTEGER NOT NULL DEFAULT 0,
+    postponed_breaks INTEGER NOT NULL DEFAULT 0,
+    screen_time INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weekly (
+    week TEXT PRIMARY KEY,
+    breaks INTEGER NOT NULL DEFAULT 0,
+    completed_breaks INTEGER NOT NULL DEFAULT 0,
+    skipped_breaks INTEGER NOT NULL DEFAULT 0,
+    postponed_breaks INTEGER NOT NULL DEFAULT 0,
+    screen_time INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+
+class EventKind(enum.IntEnum):
+    """Kinds of events stored in the history."""
+
+    BREAK_START = 1
+    BREAK_END = 2
+    SKIP = 3
+    POSTPONE = 4
+    SCREEN_TIME = 5
+
+
+# event kind -> rollup column it increments by one
+ROLLUP_COUNTERS = {
+    EventKind.BREAK_START: "breaks",
+    EventKind.BREAK_END: "completed_breaks",
+    EventKind.SKIP: "skipped_breaks",
+    EventKind.POSTPONE: "postponed_breaks",
+}
+
+
+@dataclass
+class Event:
+    timestamp: int
+    kind: EventKind
+    duration: int = 0
+
+
+@dataclass
+class Rollup:
+    breaks: int = 0
+    completed_breaks: int = 0
+    skipped_breaks: int = 0
+    postponed_breaks: int = 0
+    screen_time: int = 0
+
+
+def day_key(date: datetime.date) -> str:
+    return date.isoformat()
+
+
+def week_key(date: datetime.date) -> str:
+    (year, week, _weekday) = date.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class HealthStore:
+    """Append-only event log with pre-aggregated rollups."""
+
+    def __init__(
+        self,
+        path: str,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        read_only: bool = False,
+    ) -> None:
+        self.retention_days = retention_days
+
+        if read_only:
+            self._connection = sqlite3.connect(
+                f"file:{path}?mode=ro", uri=True, isolation_level=None
+            )
+            return
+
+        self._connection = sqlite3.connect(path, isolation_level=None)
+
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            # Freed pages can only be returned to the file system if this is
+            # set before anything is written to the database
+            self._connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
+        # Commits do not need to wait for the disk in WAL mode
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        if version == 0:
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def record(
+        self,
+        kind: EventKind,
+        time: typing.Optional[datetime.datetime] = None,
+        duration: int = 0,
+    ) -> None:
+        """Append an event, and update the rollups.
+
+        For SCREEN_TIME events, time is the start of the interval and duration
+        its length in seconds.
+        """
+        if time is None:
+            time = datetime.datetime.now()
+
+        with self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.execute(
+                "INSERT INTO events (timestamp, kind, duration) VALUES (?, ?, ?)",
+                (int(time.timestamp()), int(kind), duration),
+            )
+            if kind == EventKind.SCREEN_TIME:
+                for date, seconds in self.__split_by_day(time, duration):
+                    self.__add_to_rollups(date, "screen_time", seconds)
+            else:
+                self.__add_to_rollups(time.date(), ROLLUP_COUNTERS[kind], 1)
+
+    def day(self, date: datetime.date) -> Rollup:
+        """Return the totals of the given day."""
+        return self.__rollup("daily", "day", day_key(date))
+
+    def week(self, date: datetime.date) -> Rollup:
+        """Return the totals of the week containing the given day."""
+        return self.__rollup("weekly", "week", week_key(date))
+
+    def events(
+        self,
+        since: typing.Optional[datetime.datetime] = None,
+        batch_size: int = 4096,
+    ) -> typing.Iterator[Event]:
+        """Stream the events in the order they happened."""
+        timestamp = int(since.timestamp()) if since is not None else 0
+        cursor = self._connection.execute(
+            "SELECT timestamp, kind, duration FROM events WHERE timestamp >= ?"
+            " ORDER BY timestamp",
+            (timestamp,),
+        )
+        while rows := cursor.fetchmany(batch_size):
+            for timestamp, kind, duration in rows:
+                yield Event(timestamp, EventKind(kind), duration)
+
+    def daily_rollups(self) -> typing.Iterator[typing.Tuple[str, Rollup]]:
+        """Stream the daily rollups, oldest first."""
+        return self.__rollups("daily", "day")
+
+    def weekly_rollups(self) -> typing.Iterator[typing.Tuple[str, Rollup]]:
+        """Stream the weekly rollups, oldest first."""
+        return self.__rollups("weekly", "week")
+
+    def hourly_rollups(self) -> list[Rollup]:
+        """Aggregate the events by the hour of the day they happened in.
+
+        Returns one rollup per hour, from 0 to 23. This only covers the events
+        which have not been compacted yet.
+        """
+        rollups = [Rollup() for _hour in range(24)]
+
+        # Let SQLite count the events, instead of streaming them all
+        for hour, kind, count in self._connection.execute(
+            "SELECT CAST(strftime('%H', timestamp, 'unixepoch', 'localtime')"
+            " AS INTEGER) AS hour, kind, COUNT(*) FROM events WHERE kind != ?"
+            " GROUP BY hour, kind",
+            (int(EventKind.SCREEN_TIME),),
+        ):
+            counter = ROLLUP_COUNTERS[EventKind(kind)]
+            setattr(rollups[hour], counter, count)
+
+        # Screen time intervals need to be split at every full hour
+        cursor = self._connection.execute(
+            "SELECT timestamp, duration FROM events WHERE kind = ?",
+            (int(EventKind.SCREEN_TIME),),
+        )
+        while rows := cursor.fetchmany(4096):
+            for timestamp, duration in rows:
+                start = datetime.datetime.fromtimestamp(timestamp)
+                end = start + datetime.timedelta(seconds=duration)
+                while start < end:
+                    next_hour = start.replace(
+                        minute=0, second=0, microsecond=0
+                    ) + datetime.timedelta(hours=1)
+                    part_end = min(next_hour, end)
+                    rollups[start.hour].screen_time += round(
+                        (part_end - start).total_seconds()
+                    )
+                    start = part_end
+
+        return rollups
+
+    def compact(self, now: typing.Optional[datetime.datetime] = None) -> None:
+        """Drop events and daily rollups older than their retention period,
+        and return the freed space to the file system.
+        """
+        if now is None:
+            now = datetime.datetime.now()
+
+        events_before = now - datetime.timedelta(days=self.retention_days)
+        days_before = now.date() - datetime.timedelta(days=DAILY_ROLLUP_RETENTION_DAYS)
+
+        with self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.execute(
+                "DELETE FROM events WHERE timestamp < ?",
+                (int(events_before.timestamp()),),
+            )
+            self._connection.execute(
+                "DELETE FROM daily WHERE day < ?", (day_key(days_before),)
+            )
+        self._connection.execute("PRAGMA incremental_vacuum")
+
+    def __rollups(
+        self, table: str, column: str
+    ) -> typing.Iterator[typing.Tuple[str, Rollup]]:
+        for key, *values in self._connection.execute(
+            "SELECT"
+            f" {column}, breaks, completed_breaks, skipped_breaks, postponed_breaks,"
+            f" screen_time FROM {table} ORDER BY {column}"
+        ):
+            yield (key, Rollup(*values))
+
+    def __rollup(self, table: str, column: str, key: str) -> Rollup:
+        row = self._connection.execute(
+            "SELECT breaks, completed_breaks, skipped_breaks, postponed_breaks,"
+            f" screen_time FROM {table} WHERE {column} = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return Rollup()
+        return Rollup(*row)
+
+    def __add_to_rollups(self, date: datetime.date, counter: str, value: int) -> None:
+        for table, column, key in [
+            ("daily", "day", day_key(date)),
+            ("weekly", "week", week_key(date)),
+        ]:
+            self._connection.execute(
+                f"INSERT INTO {table} ({column}, {counter}) VALUES (?, ?)"
+                f" ON CONFLICT ({column}) DO UPDATE SET {counter} = {counter} + ?",
+                (key, value, value),
+            )
+
+    @staticmethod
+    def __split_by_day(
+        start: datetime.datetime, duration: int
+    ) -> typing.Iterator[typing.Tuple[datetime.date, int]]:
+        """Split an interval at midnight, so every day gets its share."""
+        end = start + datetime.timedelta(seconds=duration)
+        while start.date() < end.date():
+            midnight = datetime.datetime.combine(
+                start.date() + datetime.timedelta(days=1), datetime.time(), start.tzinfo
+            )
+            yield (start.date(), round((midnight - start).total_seconds()))
+            start = midnight
+        yield (start.date(), round((end - start).total_seconds()))
@@ -83,6 +83,11 @@ def get_widget_title(break_obj):
     return _("Limit Consecutive Skipping")
 
 
+def get_widget_token(break_obj):
+    """Return the values shown in the widget."""
+    return (enabled, no_of_skipped_breaks, no_allowed_skips)
+
+
 def get_widget_content(break_obj):
     """Return the statistics."""
     # Check if the plugin is enabled
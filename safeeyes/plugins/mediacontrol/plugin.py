@@ -22,70 +22,198 @@ the break screen.
 
 import logging
 import os
-import re
+import typing
+
 import gi
 from safeeyes.model import TrayAction
 
 gi.require_version("Gio", "2.0")
-from gi.repository import Gio
+from gi.repository import Gio, GLib
+
+MPRIS_PREFIX = "org.mpris.MediaPlayer2."
 
 tray_icon_path = None
+registry: typing.Optional["MprisRegistry"] = None
+
+
+class MprisRegistry:
+    """Keep track of the MPRIS media players and their playback status.
+
+    Players are discovered once using ListNames, and afterwards the
+    NameOwnerChanged signal is followed to add or remove them. Each player
+    gets an asynchronously created proxy, which caches the PlaybackStatus
+    property and keeps it up to date using PropertiesChanged.
+    Nothing in here blocks the main loop.
+    """
+
+    _bus: typing.Optional[Gio.DBusConnection] = None
+    _cancellable: Gio.Cancellable
+    _name_owner_changed_id: typing.Optional[int] = None
+
+    # bus name -> proxy
+    _players: dict[str, Gio.DBusProxy]
+    # bus names of the players currently playing
+    _playing: set[str]
+
+    def __init__(self) -> None:
+        self._cancellable = Gio.Cancellable()
+        self._players = {}
+        self._playing = set()
+
+    def start(self) -> None:
+        Gio.bus_get(Gio.BusType.SESSION, self._cancellable, self._on_bus_ready)
+
+    def stop(self) -> None:
+        self._cancellable.cancel()
+
+        if self._bus is not None and self._name_owner_changed_id is not None:
+            self._bus.signal_unsubscribe(self._name_owner_changed_id)
+            self._name_owner_changed_id = None
+
+        self._bus = None
+        self._players.clear()
+        self._playing.clear()
+
+    def playing_players(self) -> list[Gio.DBusProxy]:
+        """List of all media players which are playing now."""
+        return [self._players[name] for name in self._playing]
+
+    def _on_bus_ready(self, _source, result) -> None:
+        try:
+            self._bus = Gio.bus_get_finish(result)
+        except GLib.Error as e:
+            if not e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                logging.error("Failed to connect to the session bus: %s", e.message)
+            return
+
+        # Subscribe before listing the names, so that no player is missed
+        self._name_owner_changed_id = self._bus.signal_subscribe(
+            "org.freedesktop.DBus",
+            "org.freedesktop.DBus",
+            "NameOwnerChanged",
+            "/org/freedesktop/DBus",
+            "org.mpris.MediaPlayer2",
+            Gio.DBusSignalFlags.MATCH_ARG0_NAMESPACE,
+            self._on_name_owner_changed,
+        )
+
+        self._bus.call(
+            "org.freedesktop.DBus",
+            "/org/freedesktop/DBus",
+            "org.freedesktop.DBus",
+            "ListNames",
+            None,
+            GLib.VariantType("(as)"),
+            Gio.DBusCallFlags.NONE,
+            -1,
+            self._cancellable,
+            self._on_list_names,
+        )
+
+    def _on_list_names(self, bus: Gio.DBusConnection, result) -> None:
+        try:
+            (names,) = bus.call_finish(result).unpack()
+        except GLib.Error as e:
+            if not e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                logging.error("Failed to list the media players: %s", e.message)
+            return
+
+        for name in names:
+            if name.startswith(MPRIS_PREFIX):
+                self._add_player(name)
+
+    def _on_name_owner_changed(
+        self, _bus, _sender, _path, _interface, _signal, parameters: GLib.Variant
+    ) -> None:
+        (name, _old_owner, new_owner) = parameters.unpack()
+
+        if not name.startswith(MPRIS_PREFIX):
+            return
+
+        if new_owner:
+            self._add_player(name)
+        else:
+            self._remove_player(name)
+
+    def _add_player(self, name: str) -> None:
+        if self._bus is None or name in self._players:
+            return
+
+        Gio.DBusProxy.new(
+            self._bus,
+            Gio.DBusProxyFlags.NONE,
+            None,
+            name,
+            "/org/mpris/MediaPlayer2",
+            "org.mpris.MediaPlayer2.Player",
+            self._cancellable,
+            self._on_player_ready,
+            name,
+        )
 
+    def _on_player_ready(self, _source, result, name: str) -> None:
+        try:
+            player = Gio.DBusProxy.new_finish(result)
+        except GLib.Error as e:
+            if not e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                logging.warning("Failed to connect to %s: %s", name, e.message)
+            return
 
-def __active_players():
-    """List of all media players which are playing now."""
-    players = []
+        if self._bus is None or name in self._players:
+            # stopped or raced with another NameOwnerChanged in the meantime
+            return
 
-    dbus_proxy = Gio.DBusProxy.new_for_bus_sync(
-        bus_type=Gio.BusType.SESSION,
-        flags=Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES,
-        info=None,
-        name="org.freedesktop.DBus",
-        object_path="/org/freedesktop/DBus",
-        interface_name="org.freedesktop.DBus",
-        cancellable=None,
-    )
+        self._players[name] = player
+        player.connect("g-properties-changed", self._on_properties_changed, name)
+        self._update_status(name, player)
 
-    for service in dbus_proxy.ListNames():
-        if re.match("org.mpris.MediaPlayer2.", service):
-            player = Gio.DBusProxy.new_for_bus_sync(
-                bus_type=Gio.BusType.SESSION,
-                flags=Gio.DBusProxyFlags.NONE,
-                info=None,
-                name=service,
-                object_path="/org/mpris/MediaPlayer2",
-                interface_name="org.mpris.MediaPlayer2.Player",
-                cancellable=None,
-            )
+    def _remove_player(self, name: str) -> None:
+        self._players.pop(name, None)
+        self._playing.discard(name)
 
-            playbackstatus = player.get_cached_property("PlaybackStatus")
+    def _on_properties_changed(
+        self, player: Gio.DBusProxy, changed, invalidated, name: str
+    ) -> None:
+        self._update_status(name, player)
 
-            if playbackstatus is not None:
-                status = playbackstatus.unpack().lower()
+    def _update_status(self, name: str, player: Gio.DBusProxy) -> None:
+        playbackstatus = player.get_cached_property("PlaybackStatus")
 
-                if status == "playing":
-                    players.append(player)
-            else:
-                logging.warning(f"Failed to get PlaybackStatus for {service}")
+        if playbackstatus is None:
+            # Either the player has not exported the property (yet), or it is
+            # gone - the proxy loads it again once the player reappears
+            self._playing.discard(name)
+            return
 
-    return players
+        if playbackstatus.unpack().lower() == "playing":
+            self._playing.add(name)
+        else:
+            self._playing.discard(name)
 
 
-def __pause_players(players):
+def __pause_players(players: list[Gio.DBusProxy]) -> None:
     """Pause all playing media players using dbus."""
     for player in players:
-        player.Pause()
+        player.call("Pause", None, Gio.DBusCallFlags.NONE, -1, None, None)
 
 
 def init(ctx, safeeyes_config, plugin_config):
-    """Initialize the screensaver plugin."""
+    """Initialize the media control plugin."""
     global tray_icon_path
+    global registry
     tray_icon_path = os.path.join(plugin_config["path"], "resource/pause.png")
 
+    if registry is None:
+        registry = MprisRegistry()
+        registry.start()
+
 
 def get_tray_action(break_obj):
     """Return TrayAction only if there is a media player currently playing."""
-    players = __active_players()
+    if registry is None:
+        return None
+
+    players = registry.playing_players()
     if players:
         return TrayAction.build(
             "Pause media",
@@ -93,3 +221,12 @@ def get_tray_action(break_obj):
             "media-playback-pause",
             lambda: __pause_players(players),
         )
+
+
+def disable() -> None:
+    """Stop following the media players."""
+    global registry
+
+    if registry is not None:
+        registry.stop()
+        registry = None
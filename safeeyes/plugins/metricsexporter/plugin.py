@@ -0,0 +1,172 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Write the metrics for the textfile collector of the node exporter.
+
+The metrics are written to safeeyes.prom in the configured directory. The file
+is replaced asynchronously through a temporary file, so the collector never
+reads a partial file and the main loop never waits for the disk.
+"""
+
+import logging
+import os
+import typing
+
+from gi.repository import Gio, GLib
+
+from safeeyes import metrics, utility
+from safeeyes.model import State
+
+FILE_NAME = "safeeyes.prom"
+DEFAULT_INTERVAL = 60
+
+context = None
+path: typing.Optional[str] = None
+interval = DEFAULT_INTERVAL
+timeout_id: typing.Optional[int] = None
+writing = False
+
+
+def init(ctx, safeeyes_config, plugin_config):
+    """Start writing the metrics periodically."""
+    global context
+    global path
+    global interval
+
+    logging.debug("Initialize Metrics Exporter plugin")
+
+    directory = plugin_config.get("directory") or os.path.join(
+        GLib.get_user_runtime_dir(), "safeeyes"
+    )
+    path = os.path.join(os.path.expanduser(directory), FILE_NAME)
+    interval = plugin_config.get("interval", DEFAULT_INTERVAL)
+
+    if context is None:
+        context = ctx
+        context.on_state_changed += on_state_changed
+    _set_state(context.state)
+
+    try:
+        utility.mkdir(os.path.dirname(path))
+    except OSError as e:
+        logging.error("Cannot create the metrics directory: %s", e)
+
+    _stop_timer()
+    _start_timer()
+
+
+def _set_state(state: State) -> None:
+    metrics.clear_gauge("safeeyes_state")
+    for value in State:
+        metrics.set_gauge(
+            "safeeyes_state", 1 if value == state else 0, state=value.name.lower()
+        )
+
+
+def on_state_changed(state: State) -> bool:
+    # called by the context directly, not through the plugin manager, so an
+    # error must not reach the state change of the core or the other handlers
+    try:
+        _set_state(state)
+
+        # smart pause disables Safe Eyes with the RESTING state while idle
+        if state == State.RESTING:
+            metrics.inc("safeeyes_idle_pauses_total")
+    except Exception:
+        logging.exception("Failed to record the state %s", state.name)
+    return True
+
+
+def on_start_break(break_obj):
+    metrics.inc("safeeyes_breaks_total")
+
+
+def on_stop_break():
+    if context is None:
+        return
+
+    if context.skipped:
+        metrics.inc("safeeyes_breaks_skipped_total")
+    elif context.postponed:
+        metrics.inc("safeeyes_breaks_postponed_total")
+    else:
+        metrics.inc("safeeyes_breaks_completed_total")
+
+
+def _start_timer() -> None:
+    global timeout_id
+    timeout_id = GLib.timeout_add_seconds(interval, _write)
+
+
+def _stop_timer() -> None:
+    global timeout_id
+    if timeout_id is not None:
+        GLib.source_remove(timeout_id)
+        timeout_id = None
+
+
+def _write() -> bool:
+    global writing
+
+    if path is None or writing:
+        # The previous write has not finished yet, skip this one
+        return GLib.SOURCE_CONTINUE
+
+    writing = True
+    data = GLib.Bytes.new(metrics.render().encode())
+    Gio.File.new_for_path(path).replace_contents_bytes_async(
+        data, None, False, Gio.FileCreateFlags.NONE, None, _on_written
+    )
+
+    return GLib.SOURCE_CONTINUE
+
+
+def _on_written(file: Gio.File, result: Gio.AsyncResult) -> None:
+    global writing
+    writing = False
+
+    try:
+        file.replace_contents_finish(result)
+    except GLib.Error as e:
+        logging.error("Failed to write the metrics to %s: %s", file.get_path(), e)
+
+
+def on_exit():
+    """Write the final state before exiting."""
+    _stop_timer()
+
+    if path is not None:
+        try:
+            Gio.File.new_for_path(path).replace_contents(
+                metrics.render().encode(), None, False, Gio.FileCreateFlags.NONE, None
+            )
+        except GLib.Error as e:
+            logging.error("Failed to write the metrics to %s: %s", path, e)
+
+
+def disable():
+    """Stop writing, and remove the metrics."""
+    global context
+
+    _stop_timer()
+
+    if context is not None:
+        context.on_state_changed -= on_state_changed
+        context = None
+
+    if path is not None:
+        utility.delete(path)
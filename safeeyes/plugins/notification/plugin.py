@@ -17,39 +17,170 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
+import time
+import typing
 
 import gi
 from safeeyes.model import BreakType
 from safeeyes.translations import translate as _
 
-gi.require_version("Notify", "0.7")
-from gi.repository import Notify
+gi.require_version("Gio", "2.0")
+from gi.repository import Gio, GLib
 
 """
 Safe Eyes Notification plugin
 """
 
 APPINDICATOR_ID = "safeeyes"
-notification = None
+APP_ICON = "io.github.slgobinath.SafeEyes-enabled"
+
+# Milliseconds to wait for a reply of the notification daemon
+DBUS_TIMEOUT = 5000
+
+notifier: typing.Optional["Notifier"] = None
 context = None
 warning_time = 10
 
-Notify.init(APPINDICATOR_ID)
+
+class Notifier:
+    """Send notifications to org.freedesktop.Notifications asynchronously.
+
+    There is only ever one notification, which is updated in place by passing
+    its id as replaces_id. None of the calls wait for the reply of the
+    notification daemon, so a slow daemon never delays the break.
+    """
+
+    _bus: typing.Optional[Gio.DBusConnection] = None
+    _cancellable: Gio.Cancellable
+
+    # id of the notification, assigned by the daemon
+    _notification_id: int = 0
+    # set while waiting for the reply to Notify
+    _show_requested: typing.Optional[float] = None
+    _close_requested: bool = False
+
+    # seconds between sending the last notification and the daemon accepting it
+    show_latency: typing.Optional[float] = None
+
+    def __init__(self) -> None:
+        self._cancellable = Gio.Cancellable()
+        Gio.bus_get(Gio.BusType.SESSION, self._cancellable, self._on_bus_ready)
+
+    def _on_bus_ready(self, _source, result: Gio.AsyncResult) -> None:
+        try:
+            self._bus = Gio.bus_get_finish(result)
+        except GLib.Error as e:
+            if not e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                logging.error("Failed to connect to the session bus: %s", e.message)
+
+    def show(self, summary: str, body: str) -> None:
+        if self._bus is None:
+            logging.error("Failed to show the notification: not connected")
+            return
+
+        self._show_requested = time.monotonic()
+        self._close_requested = False
+        self._call(
+            "Notify",
+            GLib.Variant(
+                "(susssasa{sv}i)",
+                (
+                    APPINDICATOR_ID,
+                    self._notification_id,
+                    APP_ICON,
+                    summary,
+                    body,
+                    [],
+                    {},
+                    -1,
+                ),
+            ),
+            GLib.VariantType("(u)"),
+            self._on_shown,
+        )
+
+    def close(self) -> None:
+        if self._show_requested is not None:
+            # Close it once the daemon has told us its id
+            self._close_requested = True
+            return
+
+        if self._bus is None or self._notification_id == 0:
+            return
+
+        self._call(
+            "CloseNotification",
+            GLib.Variant("(u)", (self._notification_id,)),
+            None,
+            self._on_closed,
+        )
+
+    def stop(self) -> None:
+        self._cancellable.cancel()
+
+    def _call(
+        self,
+        method: str,
+        parameters: GLib.Variant,
+        reply_type: typing.Optional[GLib.VariantType],
+        callback: typing.Callable[[Gio.DBusConnection, Gio.AsyncResult], None],
+    ) -> None:
+        self._bus.call(  # type: ignore[union-attr]
+            "org.freedesktop.Notifications",
+            "/org/freedesktop/Notifications",
+            "org.freedesktop.Notifications",
+            method,
+            parameters,
+            reply_type,
+            Gio.DBusCallFlags.NONE,
+            DBUS_TIMEOUT,
+            self._cancellable,
+            callback,
+        )
+
+    def _on_shown(self, bus: Gio.DBusConnection, result: Gio.AsyncResult) -> None:
+        show_requested = self._show_requested
+        self._show_requested = None
+
+        try:
+            (self._notification_id,) = bus.call_finish(result).unpack()
+        except GLib.Error as e:
+            if not e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                logging.error("Failed to show the notification: %s", e.message)
+            return
+
+        if show_requested is not None:
+            self.show_latency = time.monotonic() - show_requested
+            logging.debug("Notification shown after %.1f ms", self.show_latency * 1000)
+
+        if self._close_requested:
+            self._close_requested = False
+            self.close()
+
+    def _on_closed(self, bus: Gio.DBusConnection, result: Gio.AsyncResult) -> None:
+        try:
+            bus.call_finish(result)
+        except GLib.Error:
+            # Some operating systems automatically close the notification.
+            pass
 
 
 def init(ctx, safeeyes_config, plugin_config):
     """Initialize the plugin."""
     global context
+    global notifier
     global warning_time
     logging.debug("Initialize Notification plugin")
     context = ctx
     warning_time = safeeyes_config.get("pre_break_warning_time")
 
+    if notifier is None:
+        notifier = Notifier()
+
 
 def on_pre_break(break_obj):
     """Show the notification."""
     # Construct the message based on the type of the next break
-    global notification
     logging.info("Show the notification")
     message = "\n"
     if break_obj.type == BreakType.SHORT_BREAK:
@@ -57,29 +188,21 @@ def on_pre_break(break_obj):
     else:
         message += _("Ready for a long break in %s seconds") % warning_time
 
-    notification = Notify.Notification.new(
-        "Safe Eyes", message, icon="io.github.slgobinath.SafeEyes-enabled"
-    )
-    try:
-        notification.show()
-    except BaseException:
-        logging.error("Failed to show the notification")
+    if notifier is not None:
+        notifier.show("Safe Eyes", message)
 
 
 def on_start_break(break_obj):
     """Close the notification."""
-    global notification
     logging.info("Close pre-break notification")
-    if notification:
-        try:
-            notification.close()
-            notification = None
-        except BaseException:
-            # Some operating systems automatically close the notification.
-            pass
+    if notifier is not None:
+        notifier.close()
 
 
 def on_exit():
-    """Uninitialize the registered notification."""
+    """Stop sending notifications."""
+    global notifier
     logging.debug("Stop Notification plugin")
-    Notify.uninit()
+    if notifier is not None:
+        notifier.stop()
+        notifier = None
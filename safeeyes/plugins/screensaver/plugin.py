@@ -20,6 +20,7 @@
 after long breaks.
 """
 
+from dataclasses import dataclass
 import logging
 import os
 import typing
@@ -27,28 +28,59 @@ import typing
 import gi
 
 gi.require_version("Gio", "2.0")
-from gi.repository import Gio
+from gi.repository import Gio, GLib
 
 from safeeyes import utility
 from safeeyes.model import TrayAction
 
+
+@dataclass
+class DBusLockMethod:
+    """Lock the screen by calling a method without arguments on the session bus.
+
+    This assumes that the interface is the same as the destination.
+    """
+
+    destination: str
+    path: str
+    method: str = "Lock"
+
+
+LockMethod = typing.Union[list[str], DBusLockMethod]
+
+# Seconds to wait for a lock method, before giving up on it
+LOCK_TIMEOUT = 5
+
+# Environment variables identifying the desktop session
+SESSION_ENVIRONMENT = [
+    "DESKTOP_SESSION",
+    "XDG_CURRENT_DESKTOP",
+    "XDG_SESSION_ID",
+    "GNOME_DESKTOP_SESSION_ID",
+    "KDE_FULL_SESSION",
+]
+
 context = None
 is_long_break: bool = False
 user_locked_screen = False
-lock_screen_command: typing.Union[list[str], typing.Callable[[], None], None] = None
+custom_lock_command: typing.Optional[list[str]] = None
+lock_methods: list[LockMethod] = []
 min_seconds = 0
 seconds_passed = 0
 tray_icon_path = None
 icon_lock_later_path = None
 
+# desktop session -> detected lock methods
+_detected_lock_methods: dict[tuple[typing.Optional[str], ...], list[LockMethod]] = {}
 
-def __lock_screen_command() -> typing.Union[list[str], typing.Callable[[], None], None]:
-    """Function tries to detect the screensaver command based on the current
+
+def __detect_lock_methods() -> list[LockMethod]:
+    """Function tries to detect the screensaver commands based on the current
     envinroment.
 
-    Returns either a command to execute or function to call.
+    Returns the lock methods to try, in order of preference.
 
-    Possible results:
+    Preferred results:
         Modern GNOME:               DBus: org.gnome.ScreenSaver.Lock
         Old Gnome, Unity, Budgie:	['gnome-screensaver-command', '--lock']
         Cinnamon:					['cinnamon-screensaver-command', '--lock']
@@ -56,8 +88,11 @@ def __lock_screen_command() -> typing.Union[list[str], typing.Callable[[], None]
         Mate:						['mate-screensaver-command', '--lock']
         KDE:						DBus: org.freedesktop.ScreenSaver.Lock
         XFCE:						['xflock4']
-        Otherwise:					None
+        Otherwise:					nothing
+    If a preferred method was found, the generic ones are appended as a fallback:
+        systemd-logind:             ['loginctl', 'lock-session']
     """
+    methods: list[LockMethod] = []
     desktop_session = os.environ.get("DESKTOP_SESSION")
     current_desktop = os.environ.get("XDG_CURRENT_DESKTOP")
     if desktop_session is not None:
@@ -67,22 +102,22 @@ def __lock_screen_command() -> typing.Union[list[str], typing.Callable[[], None]
             or desktop_session.startswith("xubuntu")
             or (current_desktop is not None and "xfce" in current_desktop)
         ) and utility.command_exist("xflock4"):
-            return ["xflock4"]
+            methods.append(["xflock4"])
         elif desktop_session == "cinnamon" and utility.command_exist(
             "cinnamon-screensaver-command"
         ):
             # This calls org.cinnamon.ScreenSaver.Lock internally
-            return ["cinnamon-screensaver-command", "--lock"]
+            methods.append(["cinnamon-screensaver-command", "--lock"])
         elif (
             desktop_session == "pantheon" or desktop_session.startswith("lubuntu")
         ) and utility.command_exist("light-locker-command"):
-            return ["light-locker-command", "--lock"]
+            methods.append(["light-locker-command", "--lock"])
         elif desktop_session == "mate" and utility.command_exist(
             "mate-screensaver-command"
         ):
             # This calls org.mate.ScreenSaver.Lock internally
             # However, it warns not to rely on that
-            return ["mate-screensaver-command", "--lock"]
+            methods.append(["mate-screensaver-command", "--lock"])
         elif (
             desktop_session == "kde"
             or "plasma" in desktop_session
@@ -92,10 +127,10 @@ def __lock_screen_command() -> typing.Union[list[str], typing.Callable[[], None]
             # Note that this is unfortunately a non-standard KDE extension.
             # See https://gitlab.gnome.org/GNOME/gnome-settings-daemon/-/issues/632
             # for details.
-            return lambda: __lock_screen_dbus(
-                destination="org.freedesktop.ScreenSaver",
-                path="/ScreenSaver",
-                method="Lock",
+            methods.append(
+                DBusLockMethod(
+                    destination="org.freedesktop.ScreenSaver", path="/ScreenSaver"
+                )
             )
         elif (
             desktop_session in ["gnome", "unity", "budgie-desktop"]
@@ -103,34 +138,142 @@ def __lock_screen_command() -> typing.Union[list[str], typing.Callable[[], None]
             or desktop_session.startswith("gnome")
         ):
             if utility.command_exist("gnome-screensaver-command"):
-                return ["gnome-screensaver-command", "--lock"]
+                methods.append(["gnome-screensaver-command", "--lock"])
             # From Gnome 3.8 no gnome-screensaver-command
-            return lambda: __lock_screen_dbus(
-                destination="org.gnome.ScreenSaver",
-                path="/org/gnome/ScreenSaver",
-                method="Lock",
+            methods.append(
+                DBusLockMethod(
+                    destination="org.gnome.ScreenSaver",
+                    path="/org/gnome/ScreenSaver",
+                )
             )
         elif gd_session := os.environ.get("GNOME_DESKTOP_SESSION_ID"):
             if "deprecated" not in gd_session and utility.command_exist(
                 "gnome-screensaver-command"
             ):
                 # Gnome 2
-                return ["gnome-screensaver-command", "--lock"]
-    return None
-
-
-def __lock_screen_dbus(destination: str, path: str, method: str) -> None:
-    """This assumes that the interface is the same as the destination."""
-    dbus_proxy = Gio.DBusProxy.new_for_bus_sync(
-        bus_type=Gio.BusType.SESSION,
-        flags=Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES,
-        info=None,
-        name=destination,
-        object_path=path,
-        interface_name=destination,
-    )
+                methods.append(["gnome-screensaver-command", "--lock"])
 
-    dbus_proxy.call_sync(method, None, Gio.DBusCallFlags.NONE, -1)
+    if methods and utility.command_exist("loginctl"):
+        # Asks the screen locker of the session to lock, if it listens to logind
+        methods.append(["loginctl", "lock-session"])
+
+    return methods
+
+
+def __lock_methods() -> list[LockMethod]:
+    """Return the lock methods for the current desktop session.
+
+    The detection probes for several commands, so it is only done once per
+    desktop session.
+    """
+    session = tuple(os.environ.get(key) for key in SESSION_ENVIRONMENT)
+    if session not in _detected_lock_methods:
+        _detected_lock_methods[session] = __detect_lock_methods()
+        logging.debug(
+            "Detected screen lock methods: %s", _detected_lock_methods[session]
+        )
+    return _detected_lock_methods[session]
+
+
+class LockAttempt:
+    """Try the lock methods one after another, until one of them succeeds.
+
+    Nothing in here blocks the main loop. Each method gets LOCK_TIMEOUT seconds:
+    a D-Bus call that does not reply in time is considered failed, and the next
+    method is tried. A command that does not exit in time is left running, as it
+    might still be locking the screen.
+    """
+
+    _timeout_id: typing.Optional[int] = None
+
+    def __init__(self, methods: list[LockMethod]) -> None:
+        self._methods = list(methods)
+
+    def start(self) -> None:
+        self._try_next()
+
+    def _try_next(self) -> None:
+        if not self._methods:
+            logging.error("Failed to lock the screen")
+            return
+
+        method = self._methods.pop(0)
+        if isinstance(method, DBusLockMethod):
+            self._lock_dbus(method)
+        else:
+            self._lock_command(method)
+
+    def _lock_dbus(self, method: DBusLockMethod) -> None:
+        try:
+            bus = Gio.bus_get_sync(Gio.BusType.SESSION, None)
+        except GLib.Error as e:
+            logging.warning("Failed to connect to the session bus: %s", e.message)
+            self._try_next()
+            return
+
+        bus.call(
+            method.destination,
+            method.path,
+            method.destination,
+            method.method,
+            None,
+            None,
+            Gio.DBusCallFlags.NONE,
+            LOCK_TIMEOUT * 1000,
+            None,
+            self._on_dbus_done,
+            method,
+        )
+
+    def _on_dbus_done(
+        self, bus: Gio.DBusConnection, result: Gio.AsyncResult, method: DBusLockMethod
+    ) -> None:
+        try:
+            bus.call_finish(result)
+        except GLib.Error as e:
+            logging.warning(
+                "Failed to lock the screen using %s: %s", method.destination, e.message
+            )
+            self._try_next()
+
+    def _lock_command(self, command: list[str]) -> None:
+        try:
+            process = Gio.Subprocess.new(command, Gio.SubprocessFlags.NONE)
+        except GLib.Error as e:
+            logging.warning("Failed to execute %s: %s", command, e.message)
+            self._try_next()
+            return
+
+        self._timeout_id = GLib.timeout_add_seconds(
+            LOCK_TIMEOUT, self._on_command_timeout, command
+        )
+        process.wait_check_async(None, self._on_command_done, command)
+
+    def _on_command_timeout(self, command: list[str]) -> bool:
+        self._timeout_id = None
+        logging.warning(
+            "%s did not finish within %d seconds, not trying other methods",
+            command,
+            LOCK_TIMEOUT,
+        )
+        return GLib.SOURCE_REMOVE
+
+    def _on_command_done(
+        self, process: Gio.Subprocess, result: Gio.AsyncResult, command: list[str]
+    ) -> None:
+        if self._timeout_id is None:
+            # Already timed out
+            return
+        GLib.source_remove(self._timeout_id)
+        self._timeout_id = None
+
+        try:
+            process.wait_check_finish(result)
+        except GLib.Error as e:
+            logging.warning(
+                "Failed to lock the screen using %s: %s", command, e.message
+            )
+            self._try_next()
 
 
 def __lock_screen_later():
@@ -139,21 +282,20 @@ def __lock_screen_later():
 
 
 def __lock_screen_now() -> None:
-    global lock_screen_command
-
-    if lock_screen_command is None:
+    if custom_lock_command is not None:
+        # Custom commands may block until the screen is unlocked, and are run as-is
+        utility.execute_command(custom_lock_command)
         return
 
-    if isinstance(lock_screen_command, list):
-        utility.execute_command(lock_screen_command)
-    else:
-        lock_screen_command()
+    if lock_methods:
+        LockAttempt(lock_methods).start()
 
 
 def init(ctx, safeeyes_config, plugin_config):
     """Initialize the screensaver plugin."""
     global context
-    global lock_screen_command
+    global custom_lock_command
+    global lock_methods
     global min_seconds
     global tray_icon_path
     global icon_lock_later_path
@@ -165,9 +307,11 @@ def init(ctx, safeeyes_config, plugin_config):
         plugin_config["path"], "resource/rotation-lock-symbolic.svg"
     )
     if plugin_config["command"]:
-        lock_screen_command = plugin_config["command"].split()
+        custom_lock_command = plugin_config["command"].split()
+        lock_methods = []
     else:
-        lock_screen_command = __lock_screen_command()
+        custom_lock_command = None
+        lock_methods = __lock_methods()
 
 
 def on_start_break(break_obj):
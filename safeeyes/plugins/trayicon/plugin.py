@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import collections
 import datetime
 from safeeyes.model import BreakType
 import gi
@@ -118,17 +119,25 @@ MENU_NODE_INFO = Gio.DBusNodeInfo.new_for_xml(
             <arg type="u"/>
             <arg type="i"/>
         </signal>
+        <signal name="ItemsPropertiesUpdated">
+            <arg type="a(ia{sv})" name="updatedProps" direction="out"/>
+            <arg type="a(ias)" name="removedProps" direction="out"/>
+        </signal>
     </interface>
 </node>"""
 ).interfaces[0]
 
 
 class DBusService:
+    # signal name -> number of emissions
+    signal_counts: collections.Counter[str]
+
     def __init__(self, interface_info, object_path, bus):
         self.interface_info = interface_info
         self.bus = bus
         self.object_path = object_path
         self.registration_id = None
+        self.signal_counts = collections.Counter()
 
     def register(self):
         self.registration_id = self.bus.register_object(
@@ -166,7 +175,10 @@ class DBusService:
         out_arg_types = "".join([arg.signature for arg in method_info.out_args])
         return_value = None
 
-        if method_info.out_args:
+        if isinstance(result, GLib.Variant):
+            # already serialized by the method
+            return_value = result
+        elif method_info.out_args:
             return_value = GLib.Variant(f"({out_arg_types})", result)
 
         invocation.return_value(return_value)
@@ -191,17 +203,46 @@ class DBusService:
             signal_name=signal_name,
             parameters=parameters,
         )
+        self.signal_counts[signal_name] += 1
 
 
 class DBusMenuService(DBusService):
+    """Serve the tray menu over com.canonical.dbusmenu.
+
+    The items are indexed by id and by parent when they are set, and their
+    serialized properties and layouts are cached until the item changes. This
+    keeps GetLayout cheap for panels which poll it often.
+    """
+
     DBUS_SERVICE_PATH = "/io/github/slgobinath/SafeEyes/Menu"
 
+    ROOT_ID = 0
+    ROOT_PROPERTIES = {"children-display": GLib.Variant("s", "submenu")}
+
+    # dbusmenu property name -> variant type
+    PROPERTY_TYPES = {
+        "label": "s",
+        "icon-name": "s",
+        "type": "s",
+        "children-display": "s",
+        "enabled": "b",
+    }
+
     revision = 0
 
     # TODO: replace dict here with more exact typing for item
     items: list[dict] = []
     # TODO: replace dict here with more exact typing for item
-    idToItems: dict[str, dict] = {}
+    idToItems: dict[int, dict] = {}
+    # item id -> id of its parent, ROOT_ID for the top level items
+    idToParent: dict[int, int] = {}
+    # item id -> visible children, ROOT_ID for the top level items
+    # TODO: replace dict here with more exact typing for item
+    idToChildren: dict[int, list[dict]] = {}
+
+    _properties_cache: dict[int, dict[str, GLib.Variant]]
+    # item id -> recursion depth -> serialized layout
+    _layout_cache: dict[int, dict[int, GLib.Variant]]
 
     def __init__(self, session_bus, items):
         super().__init__(
@@ -210,111 +251,164 @@ class DBusMenuService(DBusService):
             bus=session_bus,
         )
 
+        self._properties_cache = {}
+        self._layout_cache = {}
+
         self.set_items(items)
 
     def set_items(self, items):
+        old_structure = self.getLayoutStructure(self.items)
+        old_id_to_items = self.idToItems
+
         self.items = items
 
-        self.idToItems = self.getItemsFlat(items, {})
+        self.idToItems = {}
+        self.idToParent = {}
+        self.idToChildren = {}
+        self.__index(self.ROOT_ID, items)
 
-        self.revision += 1
+        if self.getLayoutStructure(items) != old_structure:
+            # Items were added, removed, hidden or moved - the panel needs to
+            # fetch the whole layout again
+            self._properties_cache.clear()
+            self._layout_cache.clear()
 
-        self.LayoutUpdated(self.revision, 0)
+            self.revision += 1
 
-    @staticmethod
-    def getItemsFlat(items, idToItems):
-        for item in items:
-            if item.get("hidden", False):
+            self.LayoutUpdated(self.revision, 0)
+            return
+
+        # Only send the properties that actually changed
+        updated_props = []
+        removed_props = []
+        for idx, item in self.idToItems.items():
+            old_props = self.itemProps(old_id_to_items[idx])
+            new_props = self.itemProps(item)
+            if old_props == new_props:
                 continue
 
-            idToItems[item["id"]] = item
+            self.__invalidate(idx)
+
+            properties = self.getItemProperties(idx)
+            changed = {
+                key: properties[key]
+                for key, value in new_props.items()
+                if old_props.get(key) != value
+            }
+            if changed:
+                updated_props.append((idx, changed))
+
+            removed = [key for key in old_props if key not in new_props]
+            if removed:
+                removed_props.append((idx, removed))
 
-            if "children" in item:
-                idToItems = DBusMenuService.getItemsFlat(item["children"], idToItems)
+        if updated_props or removed_props:
+            self.ItemsPropertiesUpdated(updated_props, removed_props)
 
-        return idToItems
+    def __index(self, parent_id, items):
+        children = [item for item in items if not item.get("hidden", False)]
+        self.idToChildren[parent_id] = children
+
+        for item in children:
+            self.idToItems[item["id"]] = item
+            self.idToParent[item["id"]] = parent_id
+            self.__index(item["id"], item.get("children", []))
+
+    def __invalidate(self, idx):
+        """Drop the cached variants of an item.
+
+        The layouts of all its parents contain the item, so they are dropped
+        too.
+        """
+        self._properties_cache.pop(idx, None)
+
+        while True:
+            self._layout_cache.pop(idx, None)
+            if idx == self.ROOT_ID:
+                break
+            idx = self.idToParent[idx]
 
     @staticmethod
-    def singleItemToDbus(item):
-        props = DBusMenuService.itemPropsToDbus(item)
+    def getLayoutStructure(items):
+        """Return the ids and types of the visible items, as a nested tuple.
 
-        return (item["id"], props)
+        If this changes between two menus, the layout has to be sent again.
+        """
+        return tuple(
+            (
+                item["id"],
+                item.get("type"),
+                DBusMenuService.getLayoutStructure(item.get("children", [])),
+            )
+            for item in items
+            if not item.get("hidden", False)
+        )
+
+    @staticmethod
+    def itemProps(item):
+        return {key: item[key] for key in DBusMenuService.PROPERTY_TYPES if key in item}
 
     @staticmethod
     def itemPropsToDbus(item):
-        result = {}
+        return {
+            key: GLib.Variant(DBusMenuService.PROPERTY_TYPES[key], value)
+            for key, value in DBusMenuService.itemProps(item).items()
+        }
 
-        string_props = ["label", "icon-name", "type", "children-display"]
-        for key in string_props:
-            if key in item:
-                result[key] = GLib.Variant("s", item[key])
+    def getItemProperties(self, idx):
+        """Return the serialized properties of an item."""
+        if idx == self.ROOT_ID:
+            return self.ROOT_PROPERTIES
 
-        bool_props = ["enabled"]
-        for key in bool_props:
-            if key in item:
-                result[key] = GLib.Variant("b", item[key])
+        properties = self._properties_cache.get(idx)
+        if properties is None:
+            properties = self.itemPropsToDbus(self.idToItems[idx])
+            self._properties_cache[idx] = properties
 
-        return result
+        return properties
 
-    @staticmethod
-    def itemToDbus(item, recursion_depth):
-        if item.get("hidden", False):
-            return None
+    def getItemLayout(self, idx, recursion_depth):
+        """Return the serialized layout of an item.
 
-        props = DBusMenuService.itemPropsToDbus(item)
+        A recursion depth of -1 includes all descendants, 0 none of them.
+        """
+        if recursion_depth < 0:
+            recursion_depth = -1
+
+        layouts = self._layout_cache.setdefault(idx, {})
+        layout = layouts.get(recursion_depth)
 
-        children = []
-        if recursion_depth > 1 or recursion_depth == -1:
-            if "children" in item:
+        if layout is None:
+            children = []
+            if recursion_depth != 0:
+                child_depth = recursion_depth - 1 if recursion_depth > 0 else -1
                 children = [
-                    DBusMenuService.itemToDbus(item, recursion_depth - 1)
-                    for item in item["children"]
+                    self.getItemLayout(child["id"], child_depth)
+                    for child in self.idToChildren[idx]
                 ]
-                children = [i for i in children if i is not None]
 
-        return GLib.Variant("(ia{sv}av)", (item["id"], props, children))
+            layout = GLib.Variant(
+                "(ia{sv}av)", (idx, self.getItemProperties(idx), children)
+            )
+            layouts[recursion_depth] = layout
 
-    def findItemsWithParent(self, parent_id, items):
-        for item in items:
-            if item.get("hidden", False):
-                continue
-            if "children" in item:
-                if item["id"] == parent_id:
-                    return item["children"]
-                else:
-                    ret = self.findItemsWithParent(parent_id, item["children"])
-                    if ret is not None:
-                        return ret
-        return None
+        return layout
 
     def GetLayout(self, parent_id, recursion_depth, property_names):
-        children = []
-
-        if parent_id == 0:
-            children = self.items
+        if parent_id != self.ROOT_ID and parent_id not in self.idToItems:
+            layout = GLib.Variant("(ia{sv}av)", (parent_id, {}, []))
         else:
-            children = self.findItemsWithParent(parent_id, self.items)
-            if children is None:
-                children = []
+            layout = self.getItemLayout(parent_id, recursion_depth)
 
-        children = [self.itemToDbus(item, recursion_depth) for item in children]
-        children = [i for i in children if i is not None]
-
-        ret = (
-            self.revision,
-            (0, {"children-display": GLib.Variant("s", "submenu")}, children),
-        )
-
-        return ret
+        # The reply is assembled from the cached layout, without unpacking it
+        return GLib.Variant.new_tuple(GLib.Variant("u", self.revision), layout)
 
     def GetGroupProperties(self, ids, property_names):
         ret = []
 
         for idx in ids:
             if idx in self.idToItems:
-                props = DBusMenuService.singleItemToDbus(self.idToItems[idx])
-                if props is not None:
-                    ret.append(props)
+                ret.append((idx, self.getItemProperties(idx)))
 
         return (ret,)
 
@@ -322,11 +416,9 @@ class DBusMenuService(DBusService):
         ret = None
 
         if idx in self.idToItems:
-            props = DBusMenuService.singleItemToDbus(self.idToItems[idx])
-            if props is not None and name in props:
-                ret = props[name]
+            ret = self.getItemProperties(idx).get(name)
 
-        return ret
+        return (ret,)
 
     def Event(self, idx, event_id, data, timestamp):
         if event_id != "clicked":
@@ -370,6 +462,9 @@ class DBusMenuService(DBusService):
     def LayoutUpdated(self, revision, parent):
         self.emit_signal("LayoutUpdated", (revision, parent))
 
+    def ItemsPropertiesUpdated(self, updated_props, removed_props):
+        self.emit_signal("ItemsPropertiesUpdated", (updated_props, removed_props))
+
 
 class StatusNotifierItemService(DBusService):
     DBUS_SERVICE_PATH = "/org/ayatana/NotificationItem/io_github_slgobinath_SafeEyes"
@@ -452,20 +547,34 @@ class StatusNotifierItemService(DBusService):
         self._menu.set_items(items)
 
     def set_icon(self, icon):
+        if icon == self.IconName:
+            return
+
         self.IconName = icon
 
         self.emit_signal("NewIcon")
 
     def set_tooltip(self, title, description):
-        self.ToolTip = ("", [], title, description)
+        tooltip = ("", [], title, description)
+        if tooltip == self.ToolTip:
+            return
+
+        self.ToolTip = tooltip
 
         self.emit_signal("NewTooltip")
 
     def set_xayatanalabel(self, label):
+        if label == self.XAyatanaLabel:
+            return
+
         self.XAyatanaLabel = label
 
         self.emit_signal("XAyatanaNewLabel", (label, ""))
 
+    def total_signal_counts(self) -> collections.Counter[str]:
+        """Return the number of signals emitted by the item and its menu."""
+        return self.signal_counts + self._menu.signal_counts
+
     def ProvideXdgActivationToken(self, token: str) -> None:
         self.last_activation_token = token
 
@@ -486,6 +595,13 @@ class TrayIcon:
 
     _resume_timeout_id: typing.Optional[int] = None
 
+    # Changes are collected and published together from an idle callback,
+    # so that several updates in one main loop iteration cause one emission
+    _publish_idle_id: typing.Optional[int] = None
+    _pending_menu: bool = False
+    _pending_tooltip: bool = False
+    _pending_icon: typing.Optional[str] = None
+
     _session_bus: Gio.DBusConnection
 
     def __init__(self, context: Context, plugin_config):
@@ -534,6 +650,15 @@ class TrayIcon:
         self.update_tooltip()
 
     def unregister(self) -> None:
+        if self._publish_idle_id is not None:
+            GLib.source_remove(self._publish_idle_id)
+            self._publish_idle_id = None
+
+        logging.debug(
+            "Tray icon emitted D-Bus signals: %s",
+            dict(self.sni_service.total_signal_counts()),
+        )
+
         self.sni_service.unregister()
         self._session_bus.close_sync()
 
@@ -697,9 +822,43 @@ class TrayIcon:
         ]
 
     def update_menu(self):
-        self.sni_service.set_items(self.get_items())
+        self._pending_menu = True
+        self.__schedule_publish()
 
     def update_tooltip(self):
+        self._pending_tooltip = True
+        self.__schedule_publish()
+
+    def set_icon(self, icon: str) -> None:
+        self._pending_icon = icon
+        self.__schedule_publish()
+
+    def __schedule_publish(self) -> None:
+        if self._publish_idle_id is None:
+            self._publish_idle_id = GLib.idle_add(self.__publish)
+
+    def __publish(self) -> bool:
+        """Send the changes collected since the last main loop iteration.
+
+        The services only emit signals for values which actually changed.
+        """
+        self._publish_idle_id = None
+
+        if self._pending_icon is not None:
+            self.sni_service.set_icon(self._pending_icon)
+            self._pending_icon = None
+
+        if self._pending_menu:
+            self._pending_menu = False
+            self.sni_service.set_items(self.get_items())
+
+        if self._pending_tooltip:
+            self._pending_tooltip = False
+            self.__publish_tooltip()
+
+        return GLib.SOURCE_REMOVE
+
+    def __publish_tooltip(self) -> None:
         next_break = self.get_next_break_time()
 
         if next_break is not None and self.plugin_config.get(
@@ -837,7 +996,7 @@ class TrayIcon:
             logging.info("Disable Safe Eyes")
             self.active = False
 
-            self.sni_service.set_icon("io.github.slgobinath.SafeEyes-disabled")
+            self.set_icon("io.github.slgobinath.SafeEyes-disabled")
             self.update_menu()
 
     def enable_ui(self):
@@ -846,7 +1005,7 @@ class TrayIcon:
             logging.info("Enable Safe Eyes")
             self.active = True
 
-            self.sni_service.set_icon("io.github.slgobinath.SafeEyes-enabled")
+            self.set_icon("io.github.slgobinath.SafeEyes-enabled")
             self.update_menu()
 
     def __resume(self):
@@ -877,9 +1036,9 @@ class TrayIcon:
             return GLib.SOURCE_REMOVE
 
         if self._animation_icon_enabled:
-            self.sni_service.set_icon("io.github.slgobinath.SafeEyes-enabled")
+            self.set_icon("io.github.slgobinath.SafeEyes-enabled")
         else:
-            self.sni_service.set_icon("io.github.slgobinath.SafeEyes-disabled")
+            self.set_icon("io.github.slgobinath.SafeEyes-disabled")
 
         self._animation_icon_enabled = not self._animation_icon_enabled
 
@@ -891,9 +1050,9 @@ class TrayIcon:
             self._animation_timeout_id = None
 
         if self.active:
-            self.sni_service.set_icon("io.github.slgobinath.SafeEyes-enabled")
+            self.set_icon("io.github.slgobinath.SafeEyes-enabled")
         else:
-            self.sni_service.set_icon("io.github.slgobinath.SafeEyes-disabled")
+            self.set_icon("io.github.slgobinath.SafeEyes-disabled")
 
 
 def init(ctx, safeeyes_cfg, plugin_config):
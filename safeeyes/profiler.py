@@ -0,0 +1,158 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Sampling profiler for long running sessions.
+
+A background thread takes the stacks of all threads at a fixed rate, and
+counts identical stacks. Every rotation interval the counts are written in the
+collapsed stack format understood by flamegraph.pl and speedscope, one line
+per stack: "outer;...;inner count".
+
+The samples of the main thread, which runs the GLib main loop, are written to
+a -main.folded file. The samples of the other threads are written to a
+-workers.folded file, with the thread name as the outermost frame.
+"""
+
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+import types
+import typing
+
+DEFAULT_RATE = 10
+DEFAULT_ROTATION = 3600
+
+
+class SamplingProfiler:
+    """Sample the stacks of all threads rate times per second, and write them
+    to directory every rotation seconds.
+    """
+
+    _thread: typing.Optional[threading.Thread] = None
+
+    def __init__(
+        self,
+        directory: str,
+        rate: int = DEFAULT_RATE,
+        rotation: float = DEFAULT_ROTATION,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"Invalid sampling rate: {rate}")
+
+        self.directory = directory
+        self.rate = rate
+        self.rotation = rotation
+        self.files: list[str] = []
+
+        self._main_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._main_samples: collections.Counter[str] = collections.Counter()
+        self._worker_samples: collections.Counter[str] = collections.Counter()
+        # the same code objects are seen over and over again
+        self._labels: dict[types.CodeType, str] = {}
+
+    def start(self) -> None:
+        """Start sampling, must be called from the main thread."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._main_thread_id = threading.get_ident()
+        self._stopped.clear()
+
+        self._thread = threading.Thread(
+            target=self.__run, name="SamplingProfiler", daemon=True
+        )
+        self._thread.start()
+        logging.info("Write profiles to %s", self.directory)
+
+    def stop(self) -> None:
+        """Stop sampling, and write the samples of the last interval."""
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        self.__write()
+
+    def sample(self) -> None:
+        """Take one sample of every thread, except the profiler itself."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own_id = threading.get_ident()
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+
+            stack = self.__collapse(frame)
+            if thread_id == self._main_thread_id:
+                self._main_samples[stack] += 1
+            else:
+                name = names.get(thread_id, str(thread_id))
+                self._worker_samples[f"{name};{stack}"] += 1
+
+    def __label(self, code: types.CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def __collapse(self, frame: typing.Optional[types.FrameType]) -> str:
+        labels = []
+        while frame is not None:
+            labels.append(self.__label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+    def __run(self) -> None:
+        interval = 1 / self.rate
+        rotate_at = time.monotonic() + self.rotation
+
+        while not self._stopped.wait(interval):
+            self.sample()
+
+            if time.monotonic() >= rotate_at:
+                rotate_at += self.rotation
+                self.__write()
+
+    def __write(self) -> None:
+        prefix = os.path.join(
+            self.directory, time.strftime("profile-%Y%m%d-%H%M%S", time.localtime())
+        )
+        for suffix, samples in (
+            ("main", self._main_samples),
+            ("workers", self._worker_samples),
+        ):
+            if not samples:
+                continue
+
+            path = f"{prefix}-{suffix}.folded"
+            try:
+                # two writes within the same second go to the same file
+                with open(path, "a", encoding="utf-8") as profile:
+                    for stack, count in samples.items():
+                        profile.write(f"{stack} {count}\n")
+            except OSError as e:
+                logging.error("Failed to write the profile %s: %s", path, e)
+                continue
+
+            if path not in self.files:
+                self.files.append(path)
+            samples.clear()
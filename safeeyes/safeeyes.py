@@ -24,12 +24,17 @@ import atexit
 import gettext
 import logging
 from importlib import metadata
+import os
 from pathlib import Path
 import re
+import sqlite3
+import sys
+import time
 import typing
 
 import gi
-from safeeyes import context, utility
+from safeeyes import context, metrics, platform_probe, utility
+from safeeyes.control import ControlService
 from safeeyes.ui.about_dialog import AboutDialog
 from safeeyes.ui.break_screen import BreakScreen
 from safeeyes.ui.required_plugin_dialog import RequiredPluginDialog
@@ -37,8 +42,11 @@ from safeeyes.configuration import Config
 from safeeyes.model import BreakType, State, RequiredPluginException
 from safeeyes.translations import translate as _
 from safeeyes.plugin_manager import PluginManager
+from safeeyes.plugin_watcher import PluginWatcher
 from safeeyes.core import SafeEyesCore
 from safeeyes.ui.settings_dialog import SettingsDialog
+from safeeyes.profiler import DEFAULT_RATE, SamplingProfiler
+from safeeyes.watchdog import StallWatchdog
 
 gi.require_version("Gtk", "4.0")
 from gi.repository import Gtk, Gio, GLib
@@ -95,6 +103,12 @@ class SafeEyes(Gtk.Application):
     config: Config
 
     _settings_dialog: typing.Optional[SettingsDialog] = None
+    _control_service: typing.Optional[ControlService] = None
+    _watchdog: typing.Optional[StallWatchdog] = None
+    _profiler: typing.Optional[SamplingProfiler] = None
+    _plugin_watcher: typing.Optional[PluginWatcher] = None
+    # perf_counter() at the start of the current break
+    _break_started_at: typing.Optional[float] = None
 
     def __init__(self, system_locale: gettext.NullTranslations) -> None:
         super().__init__(
@@ -130,6 +144,10 @@ class SafeEyes(Gtk.Application):
             # toggle
             ("debug", None, _("start Safe Eyes in debug mode")),
             # TODO: translate
+            ("json-log", None, "write the debug log as JSON lines"),
+            # TODO: translate
+            ("profile", None, "sample the CPU profile of Safe Eyes while it runs"),
+            # TODO: translate
             ("version", None, "show program's version number and exit"),
         ]
 
@@ -144,6 +162,30 @@ class SafeEyes(Gtk.Application):
                 None,
             )
 
+        options = [
+            # TODO: translate
+            (
+                "stats",
+                "print the health statistics history (events, daily, weekly or"
+                " hourly) and exit",
+                "REPORT",
+            ),
+            # TODO: translate
+            ("stats-format", "output format of --stats (csv or jsonl)", "FORMAT"),
+            # TODO: translate
+            ("profile-rate", "samples per second taken by --profile", "HZ"),
+        ]
+
+        for option, desc, arg_desc in options:
+            self.add_main_option(
+                option,
+                0,
+                GLib.OptionFlags.NONE,
+                GLib.OptionArg.STRING,
+                desc,
+                arg_desc,
+            )
+
     def __register_actions(self) -> None:
         actions = [
             ("show_about", self.show_about),
@@ -192,8 +234,14 @@ class SafeEyes(Gtk.Application):
             debug = True
 
         # Initialize the logging
-        utility.initialize_logging(debug)
+        utility.initialize_logging(debug, options.contains("json-log"))
+
+        if options.contains("stats"):
+            return self._print_stats(options)
+
         utility.initialize_platform()
+        # ask logind for the session type while the application starts up
+        platform_probe.start()
         utility.cleanup_old_user_stylesheet()
 
         if options.contains("version"):
@@ -257,6 +305,59 @@ class SafeEyes(Gtk.Application):
                 self.activate_action("quit", None)
                 return 1
 
+            if options.contains("profile"):
+                return self._start_profiler(options)
+
+        return -1  # continue default handling
+
+    def _print_stats(self, options) -> int:
+        """Print the health statistics history, without starting Safe Eyes."""
+        from safeeyes.plugins.healthstats import export, store
+
+        report = options.lookup_value("stats", GLib.VariantType("s")).unpack()
+        output_format = "csv"
+        if options.contains("stats-format"):
+            output_format = options.lookup_value(
+                "stats-format", GLib.VariantType("s")
+            ).unpack()
+
+        path = os.path.join(utility.DATA_DIRECTORY, store.HISTORY_FILE_NAME)
+        if not os.path.isfile(path):
+            print(f"No health statistics found at {path}", file=sys.stderr)
+            return 1
+
+        history = None
+        try:
+            history = store.HealthStore(path, read_only=True)
+            export.export(history, report, output_format, sys.stdout)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 1
+        except sqlite3.Error as error:
+            print(f"Cannot read the health statistics: {error}", file=sys.stderr)
+            return 1
+        finally:
+            if history is not None:
+                history.close()
+
+        return 0
+
+    def _start_profiler(self, options) -> int:
+        """Start sampling the stacks until Safe Eyes quits."""
+        directory = os.path.join(utility.DATA_DIRECTORY, "profiles")
+        rate = str(DEFAULT_RATE)
+        if options.contains("profile-rate"):
+            rate = options.lookup_value("profile-rate", GLib.VariantType("s")).unpack()
+
+        try:
+            self._profiler = SamplingProfiler(directory, int(rate))
+        except ValueError:
+            print(f"Invalid --profile-rate: {rate}", file=sys.stderr)
+            return 1
+
+        self._profiler.start()
+        atexit.register(self._profiler.stop)
+
         return -1  # continue default handling
 
     def do_command_line(self, command_line):
@@ -292,12 +393,30 @@ class SafeEyes(Gtk.Application):
 
         return 0
 
+    def do_dbus_register(self, connection, object_path) -> bool:
+        Gtk.Application.do_dbus_register(self, connection, object_path)
+
+        self._control_service = ControlService(self, connection, object_path)
+        self._control_service.register()
+
+        return True
+
+    def do_dbus_unregister(self, connection, object_path) -> None:
+        if self._control_service is not None:
+            self._control_service.unregister()
+            self._control_service = None
+
+        Gtk.Application.do_dbus_unregister(self, connection, object_path)
+
     def do_startup(self) -> None:
         Gtk.Application.do_startup(self)
 
         logging.info("Starting up Application")
 
+        # the plugin cache depends on the platform
+        platform_probe.get()
         self.config = Config.load()
+        self.__update_watchdog()
 
         # Initialize the Safe Eyes Context
         if self.config.get("persist_state"):
@@ -311,6 +430,7 @@ class SafeEyes(Gtk.Application):
             version=SAFE_EYES_VERSION,
             session=session,
         )
+        self.context.on_state_changed += self.on_state_changed
 
         # Initialize the theme
         self._initialize_styles()
@@ -333,6 +453,14 @@ class SafeEyes(Gtk.Application):
             self.plugins_manager.init(self.context, self.config)
         except RequiredPluginException as e:
             self.show_required_plugin_dialog(e)
+        self.__update_plugin_watcher()
+
+        if self.config.get("preload_plugins"):
+            # import the lazily imported plugins once there is nothing else to do
+            GLib.idle_add(
+                self.plugins_manager.preload_next,
+                priority=GLib.PRIORITY_LOW,  # type: ignore[call-arg]
+            )
 
         self.hold()
 
@@ -389,6 +517,18 @@ class SafeEyes(Gtk.Application):
 
         GLib.timeout_add_seconds(timeout, self._retry_errored_plugins)
 
+    def __get_plugin_warnings(self) -> dict[str, str]:
+        """Describe the plugins which are bypassed by their circuit breaker."""
+        warnings = {}
+        for plugin_id, breaker in self.plugins_manager.get_bypassed_plugins().items():
+            warnings[plugin_id] = _(
+                "Paused for %(seconds)d seconds after repeated failures: %(reason)s"
+            ) % {
+                "seconds": breaker.remaining() + 1,
+                "reason": breaker.last_failure,
+            }
+        return warnings
+
     def show_settings(self, activation_token: typing.Optional[str] = None) -> None:
         """Listen to tray icon Settings action and send the signal to Settings
         dialog.
@@ -396,7 +536,10 @@ class SafeEyes(Gtk.Application):
         if self._settings_dialog is None:
             logging.info("Show Settings dialog")
             self._settings_dialog = SettingsDialog(
-                self, self.config.clone(), self.save_settings
+                self,
+                self.config.clone(),
+                self.save_settings,
+                self.__get_plugin_warnings(),
             )
 
         if activation_token is not None:
@@ -455,6 +598,14 @@ class SafeEyes(Gtk.Application):
         self.plugins_manager.exit()
         self.persist_session()
 
+        if self._watchdog is not None:
+            self._watchdog.stop()
+            self._watchdog = None
+
+        if self._plugin_watcher is not None:
+            self._plugin_watcher.stop()
+            self._plugin_watcher = None
+
         self.release()
 
         super().quit()
@@ -540,6 +691,8 @@ class SafeEyes(Gtk.Application):
 
         # Restart the core and initialize the components
         self.config = config
+        self.__update_watchdog()
+        self.__update_plugin_watcher()
         self.safe_eyes_core.initialize(config)
         self.break_screen.initialize(config)
 
@@ -556,6 +709,46 @@ class SafeEyes(Gtk.Application):
             self.safe_eyes_core.start()
             self.plugins_manager.start()
 
+    def __update_watchdog(self) -> None:
+        """Start, stop or reconfigure the main loop stall watchdog."""
+        threshold = self.config.get("stall_watchdog_threshold", 0)
+
+        if self._watchdog is not None:
+            if self._watchdog.threshold == threshold:
+                return
+            self._watchdog.stop()
+            self._watchdog = None
+
+        if threshold > 0:
+            logging.info("Watch for main loop stalls over %s seconds", threshold)
+            self._watchdog = StallWatchdog(threshold)
+            self._watchdog.start()
+
+    def __update_plugin_watcher(self) -> None:
+        """Start or stop reloading the plugins when their files change."""
+        if not self.config.get("reload_plugins_on_change"):
+            if self._plugin_watcher is not None:
+                self._plugin_watcher.stop()
+                self._plugin_watcher = None
+            return
+
+        if self._plugin_watcher is None:
+            logging.info("Reload the plugins when their files change")
+            self._plugin_watcher = PluginWatcher(
+                [utility.SYSTEM_PLUGINS_DIR, utility.USER_PLUGINS_DIR],
+                self.__on_plugin_changed,
+            )
+
+    def __on_plugin_changed(self, plugin_id: str) -> bool:
+        if self.context.state in (State.PRE_BREAK, State.BREAK):
+            # do not replace a plugin in the middle of a break, try again later
+            return False
+
+        self.plugins_manager.reload_plugin(
+            plugin_id, self.context, self.config, self.active
+        )
+        return True
+
     def enable_safeeyes(self, scheduled_next_break_time=-1):
         """Listen to tray icon enable action and send the signal to core."""
         if (
@@ -579,6 +772,7 @@ class SafeEyes(Gtk.Application):
 
     def on_start_break(self, break_obj):
         """Pass the break information to plugins."""
+        self._break_started_at = time.perf_counter()
         if not self.plugins_manager.start_break(break_obj):
             return False
         return True
@@ -590,6 +784,13 @@ class SafeEyes(Gtk.Application):
         actions = self.plugins_manager.get_break_screen_tray_actions(break_obj)
         self.break_screen.show_message(break_obj, widget, actions)
 
+        if self._break_started_at is not None:
+            metrics.observe(
+                "safeeyes_break_screen_show_seconds",
+                time.perf_counter() - self._break_started_at,
+            )
+            self._break_started_at = None
+
     def countdown(self, countdown, seconds):
         """Pass the countdown to plugins and break screen."""
         self.break_screen.show_count_down(countdown, seconds)
@@ -600,6 +801,8 @@ class SafeEyes(Gtk.Application):
         """Update the next break to plugins and save the session."""
         self.plugins_manager.update_next_break(break_obj, break_time)
         self._status = _("Next break at %s") % (utility.format_time(break_time))
+        if self._control_service is not None:
+            self._control_service.next_break_changed()
         if self.config.get("persist_state"):
             utility.write_json(utility.SESSION_FILE_PATH, self.context["session"])
 
@@ -613,6 +816,23 @@ class SafeEyes(Gtk.Application):
         """Take a break now."""
         self.safe_eyes_core.take_break(break_type)
 
+    def postpone_break(self) -> bool:
+        """Postpone the current break, if the Postpone button is shown."""
+        if (
+            self.context.state != State.BREAK
+            or not self.break_screen.show_postpone_button
+        ):
+            return False
+
+        self.break_screen.postpone_break()
+        return True
+
+    def on_state_changed(self, state: State) -> bool:
+        """Announce the new state on D-Bus."""
+        if self._control_service is not None:
+            self._control_service.state_changed(state)
+        return True
+
     def status(self):
         """Return the status of Safe Eyes."""
         return self._status
@@ -0,0 +1,75 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+
+import pytest
+
+from safeeyes import utility
+
+try:
+    from safeeyes.plugins.audiblealert import gst_player
+except (ImportError, ValueError):
+    pytest.skip("GStreamer is not available", allow_module_level=True)
+
+from gi.repository import GLib
+
+NULL_SINK = "fakesink sync=true"
+
+
+@pytest.fixture(autouse=True)
+def require_elements() -> None:
+    if not gst_player.is_available(sink="fakesink"):
+        pytest.skip("required GStreamer elements are missing")
+
+
+def resource(name: str) -> str:
+    return os.path.join(utility.BIN_DIRECTORY, "resource", name)
+
+
+class TestGstAlertPlayer:
+    @pytest.mark.parametrize("name", ["on_pre_break.wav", "on_stop_break.wav"])
+    def test_read_wav(self, name: str) -> None:
+        (caps, data) = gst_player.read_wav(resource(name))
+
+        structure = caps.get_structure(0)
+        assert structure.get_name() == "audio/x-raw"
+        assert len(data) > 0
+
+    def test_play_latency(self) -> None:
+        player = gst_player.GstAlertPlayer(
+            resource("on_stop_break.wav"), 50, sink=NULL_SINK
+        )
+        loop = GLib.MainLoop()
+        deadline = time.monotonic() + 5
+
+        def check_started() -> bool:
+            if player.latency is not None or time.monotonic() > deadline:
+                loop.quit()
+                return GLib.SOURCE_REMOVE
+            return GLib.SOURCE_CONTINUE
+
+        player.play()
+        GLib.timeout_add(10, check_started)
+        loop.run()
+        player.close()
+
+        assert player.latency is not None
+        # nothing is spawned or decoded at alert time
+        assert player.latency < 0.5
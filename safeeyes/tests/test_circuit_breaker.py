@@ -0,0 +1,94 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from safeeyes.circuit_breaker import CircuitBreaker
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_breaker(clock: Clock) -> CircuitBreaker:
+    return CircuitBreaker(
+        "example", 1.0, threshold=3, base_backoff=60, max_backoff=200, clock=clock
+    )
+
+
+def fail(breaker: CircuitBreaker, hook: str = "on_pre_break") -> None:
+    assert breaker.allow()
+    breaker.record(hook, 0.01, RuntimeError("failed"))
+
+
+class TestCircuitBreaker:
+    def test_opens_after_repeated_failures(self) -> None:
+        clock = Clock()
+        breaker = create_breaker(clock)
+
+        fail(breaker)
+        fail(breaker)
+        assert not breaker.is_open()
+        fail(breaker)
+
+        assert breaker.is_open()
+        assert not breaker.allow()
+        assert breaker.remaining() == 60
+        assert breaker.last_failure == "on_pre_break RuntimeError: failed"
+
+    def test_success_resets_the_failures(self) -> None:
+        breaker = create_breaker(Clock())
+
+        fail(breaker)
+        fail(breaker)
+        breaker.record("on_pre_break", 0.01, None)
+        fail(breaker)
+        # failures of different hooks are counted separately
+        fail(breaker, "on_start_break")
+
+        assert not breaker.is_open()
+
+    def test_slow_calls_fail(self) -> None:
+        breaker = create_breaker(Clock())
+
+        for _ in range(3):
+            breaker.record("on_start_break", 1.5, None)
+
+        assert breaker.is_open()
+        assert breaker.last_failure == "on_start_break took 1.5 seconds"
+
+    def test_backoff(self) -> None:
+        clock = Clock()
+        breaker = create_breaker(clock)
+        for _ in range(3):
+            fail(breaker)
+
+        for backoff in [120, 200, 200]:
+            clock.now += breaker.remaining()
+            # a single failed trial call opens the circuit again
+            fail(breaker)
+            assert breaker.remaining() == backoff
+
+        clock.now += breaker.remaining()
+        assert breaker.allow()
+        breaker.record("on_pre_break", 0.01, None)
+
+        assert not breaker.is_open()
+        assert breaker.backoff == 0
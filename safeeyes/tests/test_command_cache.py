@@ -0,0 +1,74 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+
+from gi.repository import GLib
+
+from safeeyes.command_cache import CommandCache
+
+
+def add_command(directory, name: str) -> str:
+    path = directory / name
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def wait_for_change(cache: CommandCache, timeout: float = 30) -> None:
+    """Run the main loop until the cache sees a change of a PATH directory."""
+    generation = cache.generation
+    deadline = time.monotonic() + timeout
+    context = GLib.MainContext.default()
+    while cache.generation == generation:
+        assert time.monotonic() < deadline, "the change was not reported"
+        if not context.iteration(False):
+            time.sleep(0.01)
+
+
+class TestCommandCache:
+    def test_cached_until_changed(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setenv("PATH", str(tmp_path))
+        command = add_command(tmp_path, "command")
+        cache = CommandCache()
+
+        assert cache.which("command") == command
+        assert cache.which("missing") is None
+
+        os.remove(command)
+        # not seen before the main loop dispatches the change
+        assert cache.which("command") == command
+
+        add_command(tmp_path, "missing")
+        wait_for_change(cache)
+        assert cache.which("command") is None
+        assert cache.which("missing") == str(tmp_path / "missing")
+
+    def test_path_changed(self, tmp_path, monkeypatch) -> None:
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        add_command(tmp_path / "a", "command")
+        command = add_command(tmp_path / "b", "command")
+        cache = CommandCache()
+
+        monkeypatch.setenv("PATH", str(tmp_path / "a"))
+        cache.which("command")
+        monkeypatch.setenv("PATH", str(tmp_path / "b"))
+
+        assert cache.which("command") == command
@@ -0,0 +1,167 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+import shutil
+import types
+import typing
+
+import pytest
+
+from gi.repository import Gio, GLib
+
+from safeeyes import control
+from safeeyes.model import BreakType, State
+
+OBJECT_PATH = "/io/github/slgobinath/SafeEyes"
+
+
+class FakeApplication:
+    def __init__(self) -> None:
+        self.active = True
+        self.context = types.SimpleNamespace(state=State.WAITING)
+        self.safe_eyes_core = types.SimpleNamespace(get_break_time=self.break_time)
+        self.breaks_taken: list[typing.Optional[BreakType]] = []
+
+    def break_time(self, break_type=None) -> typing.Optional[datetime.datetime]:
+        if break_type is None:
+            return datetime.datetime.fromtimestamp(1772445600)
+        return None
+
+    def status(self) -> str:
+        return "Next break at 10:00"
+
+    def take_break(self, break_type) -> None:
+        self.breaks_taken.append(break_type)
+
+    def postpone_break(self) -> bool:
+        return False
+
+
+def connect(address: str) -> Gio.DBusConnection:
+    return Gio.DBusConnection.new_for_address_sync(
+        address,
+        Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT
+        | Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+    )
+
+
+@pytest.fixture
+def private_bus() -> typing.Iterator[str]:
+    if shutil.which("dbus-daemon") is None:
+        pytest.skip("dbus-daemon is not available")
+
+    bus = Gio.TestDBus.new(Gio.TestDBusFlags.NONE)
+    bus.up()
+    address = bus.get_bus_address()
+    assert address is not None
+    yield address
+    bus.down()
+
+
+class TestControlService:
+    @pytest.fixture(autouse=True)
+    def setup(self, private_bus: str) -> typing.Iterator[None]:
+        self.application = FakeApplication()
+        self.service_connection = connect(private_bus)
+        self.client = connect(private_bus)
+
+        self.service = control.ControlService(
+            self.application,  # type: ignore[arg-type]
+            self.service_connection,
+            OBJECT_PATH,
+        )
+        self.service.register()
+        yield
+        self.service.unregister()
+
+    def call(self, method: str, parameters=None) -> typing.Any:
+        """Call a method, running the main loop until the reply arrives."""
+        result: list[typing.Any] = []
+
+        def on_reply(connection, task):
+            try:
+                result.append(connection.call_finish(task).unpack())
+            except GLib.Error as error:
+                result.append(error)
+
+        self.client.call(
+            self.service_connection.get_unique_name(),
+            OBJECT_PATH,
+            control.INTERFACE_NAME,
+            method,
+            parameters,
+            None,
+            Gio.DBusCallFlags.NONE,
+            -1,
+            None,
+            on_reply,
+        )
+        context = GLib.MainContext.default()
+        while not result:
+            context.iteration(True)
+
+        return result[0]
+
+    def test_get_status(self) -> None:
+        assert self.call("GetStatus") == ("waiting", True, "Next break at 10:00")
+        assert self.call("GetNextBreaks") == (1772445600, 0)
+
+    def test_take_break(self) -> None:
+        self.call("TakeBreak", GLib.Variant("(s)", ("long",)))
+        assert self.application.breaks_taken == [BreakType.LONG_BREAK]
+
+        error = self.call("TakeBreak", GLib.Variant("(s)", ("lunch",)))
+        assert isinstance(error, GLib.Error)
+        assert "InvalidArgs" in error.message
+
+    def test_postpone_outside_of_break(self) -> None:
+        error = self.call("Postpone")
+        assert isinstance(error, GLib.Error)
+        assert "NotPostponable" in error.message
+
+    def test_unexpected_error(self) -> None:
+        def status() -> str:
+            raise RuntimeError("broken")
+
+        self.application.status = status  # type: ignore[method-assign]
+
+        error = self.call("GetStatus")
+        assert isinstance(error, GLib.Error)
+        assert "broken" in error.message
+
+    def test_state_changed_signal(self) -> None:
+        states = []
+        self.client.signal_subscribe(
+            None,
+            control.INTERFACE_NAME,
+            "StateChanged",
+            OBJECT_PATH,
+            None,
+            Gio.DBusSignalFlags.NONE,
+            lambda *args: states.append(args[5].unpack()),
+        )
+
+        self.service.state_changed(State.BREAK)
+        # the reply to this call is sent after the signal
+        self.call("GetStatus")
+        context = GLib.MainContext.default()
+        while context.pending():
+            context.iteration(False)
+
+        assert states == [("break",)]
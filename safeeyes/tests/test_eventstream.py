@@ -0,0 +1,105 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import pathlib
+import socket
+import typing
+
+import pytest
+
+from gi.repository import GLib
+
+from safeeyes.model import State
+from safeeyes.plugins.eventstream import plugin
+from safeeyes.plugins.eventstream.server import EventServer
+
+
+def run_main_loop() -> None:
+    context = GLib.MainContext.default()
+    while context.pending():
+        context.iteration(False)
+
+
+@pytest.fixture
+def server(tmp_path: pathlib.Path) -> typing.Iterator[EventServer]:
+    server = EventServer(str(tmp_path / "events.sock"), backlog=4)
+    yield server
+    server.close()
+
+
+def subscribe(server: EventServer) -> socket.socket:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(server.path)
+    run_main_loop()
+    return client
+
+
+class TestEventServer:
+    def test_publish(self, server: EventServer) -> None:
+        client = subscribe(server)
+
+        server.publish("break_start", type="short")
+        server.publish("break_stop")
+        run_main_loop()
+
+        lines = client.recv(4096).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"event": "break_start", "type": "short"},
+            {"event": "break_stop"},
+        ]
+        client.close()
+
+    def test_disconnected_subscriber(self, server: EventServer) -> None:
+        client = subscribe(server)
+        assert len(server.subscribers) == 1
+
+        client.close()
+        run_main_loop()
+
+        assert server.subscribers == []
+
+    def test_slow_subscriber_dropped(self, server: EventServer) -> None:
+        client = subscribe(server)
+        client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+
+        # fill the socket buffers, and then the backlog, without ever reading
+        line = "x" * 4096
+        for _i in range(1000):
+            server.publish("flood", data=line)
+            if not server.subscribers:
+                break
+
+        assert server.subscribers == []
+        client.close()
+
+
+class TestPlugin:
+    def test_state_changed_error(self, monkeypatch, caplog) -> None:
+        class FailingServer:
+            def publish(self, event: str, **fields) -> None:
+                raise OSError("failed")
+
+        monkeypatch.setattr(plugin, "server", FailingServer())
+
+        # the error does not reach the state change of the core
+        with caplog.at_level(logging.ERROR):
+            assert plugin.on_state_changed(State.WAITING)
+
+        assert caplog.records[0].exc_info is not None
@@ -0,0 +1,170 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+import io
+import json
+import pathlib
+import typing
+
+import pytest
+
+from safeeyes.plugins.healthstats import export, store
+from safeeyes.plugins.healthstats.store import EventKind, HealthStore, Rollup
+
+
+@pytest.fixture
+def health_store(tmp_path: pathlib.Path) -> typing.Iterator[HealthStore]:
+    health_store = HealthStore(str(tmp_path / "healthstats.sqlite"), 30)
+    yield health_store
+    health_store.close()
+
+
+def at(iso: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(iso)
+
+
+class TestHealthStore:
+    def test_empty(self, health_store: HealthStore) -> None:
+        assert health_store.day(datetime.date(2026, 3, 2)) == Rollup()
+        assert health_store.week(datetime.date(2026, 3, 2)) == Rollup()
+        assert list(health_store.events()) == []
+
+    def test_rollups(self, health_store: HealthStore) -> None:
+        health_store.record(EventKind.BREAK_START, at("2026-03-02T10:00:00"))
+        health_store.record(EventKind.BREAK_END, at("2026-03-02T10:00:15"))
+        health_store.record(EventKind.BREAK_START, at("2026-03-03T10:00:00"))
+        health_store.record(EventKind.SKIP, at("2026-03-03T10:00:02"))
+        health_store.record(EventKind.POSTPONE, at("2026-03-03T11:00:00"))
+        health_store.record(EventKind.SCREEN_TIME, at("2026-03-03T09:00:00"), 600)
+
+        assert health_store.day(datetime.date(2026, 3, 2)) == Rollup(
+            breaks=1, completed_breaks=1
+        )
+        assert health_store.day(datetime.date(2026, 3, 3)) == Rollup(
+            breaks=1, skipped_breaks=1, postponed_breaks=1, screen_time=600
+        )
+        # both days are in the same ISO week
+        assert health_store.week(datetime.date(2026, 3, 8)) == Rollup(
+            breaks=2,
+            completed_breaks=1,
+            skipped_breaks=1,
+            postponed_breaks=1,
+            screen_time=600,
+        )
+        assert health_store.week(datetime.date(2026, 3, 9)) == Rollup()
+
+    def test_screen_time_split_at_midnight(self, health_store: HealthStore) -> None:
+        health_store.record(EventKind.SCREEN_TIME, at("2026-03-08T23:50:00"), 1200)
+
+        assert health_store.day(datetime.date(2026, 3, 8)).screen_time == 600
+        assert health_store.day(datetime.date(2026, 3, 9)).screen_time == 600
+        assert health_store.week(datetime.date(2026, 3, 8)).screen_time == 600
+        assert health_store.week(datetime.date(2026, 3, 9)).screen_time == 600
+
+    def test_events_in_order(self, health_store: HealthStore) -> None:
+        health_store.record(EventKind.BREAK_END, at("2026-03-02T10:00:15"))
+        health_store.record(EventKind.BREAK_START, at("2026-03-02T10:00:00"))
+
+        events = list(health_store.events(batch_size=1))
+
+        assert [event.kind for event in events] == [
+            EventKind.BREAK_START,
+            EventKind.BREAK_END,
+        ]
+        assert events[0].timestamp == int(at("2026-03-02T10:00:00").timestamp())
+
+    def test_compact(self, health_store: HealthStore) -> None:
+        old = at("2024-01-10T10:00:00")
+        recent = at("2026-02-20T10:00:00")
+        health_store.record(EventKind.BREAK_START, old)
+        health_store.record(EventKind.BREAK_START, recent)
+
+        health_store.compact(at("2026-03-02T10:00:00"))
+
+        assert [event.kind for event in health_store.events()] == [
+            EventKind.BREAK_START
+        ]
+        assert health_store.day(old.date()) == Rollup()
+        assert health_store.day(recent.date()).breaks == 1
+        # weekly rollups are kept forever
+        assert health_store.week(old.date()).breaks == 1
+
+    def test_reopen(self, tmp_path: pathlib.Path) -> None:
+        path = str(tmp_path / "healthstats.sqlite")
+        health_store = HealthStore(path)
+        health_store.record(EventKind.BREAK_START, at("2026-03-02T10:00:00"))
+        health_store.close()
+
+        health_store = HealthStore(path)
+        assert health_store.day(datetime.date(2026, 3, 2)).breaks == 1
+        health_store.close()
+
+        health_store = HealthStore(path, read_only=True)
+        assert health_store.day(datetime.date(2026, 3, 2)).breaks == 1
+        health_store.close()
+
+    def test_hourly_rollups(self, health_store: HealthStore) -> None:
+        health_store.record(EventKind.BREAK_START, at("2026-03-02T10:00:00"))
+        health_store.record(EventKind.SKIP, at("2026-03-02T10:00:02"))
+        health_store.record(EventKind.BREAK_START, at("2026-03-03T10:30:00"))
+        health_store.record(EventKind.SCREEN_TIME, at("2026-03-03T09:50:00"), 1200)
+
+        rollups = health_store.hourly_rollups()
+
+        assert len(rollups) == 24
+        assert rollups[9] == Rollup(screen_time=600)
+        assert rollups[10] == Rollup(breaks=2, skipped_breaks=1, screen_time=600)
+        assert rollups[11] == Rollup()
+
+    def test_week_key(self) -> None:
+        assert store.week_key(datetime.date(2026, 1, 1)) == "2026-W01"
+        assert store.week_key(datetime.date(2027, 1, 1)) == "2026-W53"
+
+
+class TestExport:
+    def test_daily_csv(self, health_store: HealthStore) -> None:
+        health_store.record(EventKind.BREAK_START, at("2026-03-02T10:00:00"))
+        health_store.record(EventKind.BREAK_END, at("2026-03-02T10:00:15"))
+        health_store.record(EventKind.BREAK_START, at("2026-03-02T11:00:00"))
+        health_store.record(EventKind.SKIP, at("2026-03-02T11:00:02"))
+        output = io.StringIO()
+
+        export.export(health_store, "daily", "csv", output)
+
+        assert output.getvalue().splitlines() == [
+            "day,breaks,completed_breaks,skipped_breaks,postponed_breaks,"
+            "screen_time,compliance,skip_ratio",
+            "2026-03-02,2,1,1,0,0,0.5,0.5",
+        ]
+
+    def test_events_jsonl(self, health_store: HealthStore) -> None:
+        health_store.record(EventKind.POSTPONE, at("2026-03-02T10:00:00"))
+        output = io.StringIO()
+
+        export.export(health_store, "events", "jsonl", output)
+
+        assert [json.loads(line) for line in output.getvalue().splitlines()] == [
+            {"time": "2026-03-02T10:00:00", "event": "postpone", "duration": 0}
+        ]
+
+    def test_invalid(self, health_store: HealthStore) -> None:
+        with pytest.raises(ValueError):
+            export.export(health_store, "monthly", "csv", io.StringIO())
+        with pytest.raises(ValueError):
+            export.export(health_store, "daily", "xml", io.StringIO())
@@ -0,0 +1,90 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import typing
+
+import pytest
+
+from safeeyes import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics() -> typing.Iterator[None]:
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestMetrics:
+    def test_empty(self) -> None:
+        assert metrics.render() == ""
+
+    def test_render(self) -> None:
+        metrics.inc("safeeyes_breaks_total")
+        metrics.inc("safeeyes_breaks_total")
+        metrics.observe("safeeyes_plugin_hook_seconds", 0.5, plugin="a", hook="x")
+        metrics.observe("safeeyes_plugin_hook_seconds", 0.25, plugin="a", hook="x")
+        metrics.set_gauge("safeeyes_state", 1, state="waiting")
+
+        assert metrics.render().splitlines() == [
+            "# HELP safeeyes_breaks_total Breaks started.",
+            "# TYPE safeeyes_breaks_total counter",
+            "safeeyes_breaks_total 2",
+            "# HELP safeeyes_plugin_hook_seconds"
+            " Time spent in plugin hooks, by plugin and hook.",
+            "# TYPE safeeyes_plugin_hook_seconds summary",
+            'safeeyes_plugin_hook_seconds_count{hook="x",plugin="a"} 2',
+            'safeeyes_plugin_hook_seconds_sum{hook="x",plugin="a"} 0.75',
+            "# HELP safeeyes_state Current state, 1 for the active state.",
+            "# TYPE safeeyes_state gauge",
+            'safeeyes_state{state="waiting"} 1',
+        ]
+
+    def test_label_escaping(self) -> None:
+        metrics.inc("safeeyes_breaks_total", plugin='a"b\\c\nd')
+
+        assert 'safeeyes_breaks_total{plugin="a\\"b\\\\c\\nd"} 1' in (
+            metrics.render().splitlines()
+        )
+
+    def test_clear_gauge(self) -> None:
+        metrics.set_gauge("safeeyes_state", 1, state="waiting")
+        metrics.set_gauge("safeeyes_state", 0, state="break")
+
+        metrics.clear_gauge("safeeyes_state")
+
+        assert metrics.render() == ""
+
+    def test_threads(self) -> None:
+        def record() -> None:
+            for _ in range(10000):
+                metrics.inc("safeeyes_breaks_total")
+                metrics.observe("safeeyes_plugin_hook_seconds", 1, plugin="a")
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            metrics.render()
+        for thread in threads:
+            thread.join()
+
+        lines = metrics.render().splitlines()
+        assert "safeeyes_breaks_total 40000" in lines
+        assert 'safeeyes_plugin_hook_seconds_count{plugin="a"} 40000' in lines
@@ -0,0 +1,149 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import typing
+
+import pytest
+
+from gi.repository import Gio, GLib
+
+from safeeyes.plugins.notification.plugin import Notifier
+
+
+class FakeBus:
+    """Record the D-Bus calls, which are answered by the test."""
+
+    def __init__(self) -> None:
+        # (method, arguments, callback)
+        self.calls: list[tuple[str, typing.Any, typing.Callable]] = []
+
+    def call(
+        self,
+        destination,
+        path,
+        interface,
+        method,
+        parameters,
+        reply_type,
+        flags,
+        timeout,
+        cancellable,
+        callback,
+    ) -> None:
+        self.calls.append((method, parameters.unpack(), callback))
+
+    def call_finish(self, result: typing.Any) -> GLib.Variant:
+        if isinstance(result, GLib.Error):
+            raise result
+        return result
+
+    def reply(self, index: int, result: typing.Any) -> None:
+        """Answer a call with a variant or an error."""
+        self.calls[index][2](self, result)
+
+    def methods(self) -> list[str]:
+        return [method for (method, _args, _callback) in self.calls]
+
+
+def io_error(code: Gio.IOErrorEnum, message: str) -> GLib.Error:
+    return GLib.Error.new_literal(Gio.io_error_quark(), message, code)
+
+
+class TestNotifier:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch) -> None:
+        monkeypatch.setattr(
+            Gio, "bus_get", lambda bus_type, cancellable, callback: None
+        )
+        self.bus = FakeBus()
+        self.notifier = Notifier()
+        self.notifier._bus = self.bus  # type: ignore[assignment]
+
+    def test_replaces_id(self) -> None:
+        self.notifier.show("Safe Eyes", "first")
+        self.bus.reply(0, GLib.Variant("(u)", (42,)))
+        self.notifier.show("Safe Eyes", "second")
+
+        # the second notification replaces the first one
+        assert [args[1] for (_method, args, _callback) in self.bus.calls] == [0, 42]
+        assert self.bus.calls[1][1][4] == "second"
+        assert self.notifier.show_latency is not None
+
+        self.bus.reply(1, GLib.Variant("(u)", (42,)))
+        self.notifier.close()
+        assert self.bus.calls[2][:2] == ("CloseNotification", (42,))
+
+    def test_deferred_close(self) -> None:
+        self.notifier.show("Safe Eyes", "message")
+        self.notifier.close()
+
+        # closed once the daemon replied with the id
+        assert self.bus.methods() == ["Notify"]
+        self.bus.reply(0, GLib.Variant("(u)", (7,)))
+        assert self.bus.methods() == ["Notify", "CloseNotification"]
+        assert self.bus.calls[1][1] == (7,)
+
+    def test_show_again_before_close(self) -> None:
+        self.notifier.show("Safe Eyes", "first")
+        self.notifier.close()
+        self.notifier.show("Safe Eyes", "second")
+        self.bus.reply(0, GLib.Variant("(u)", (7,)))
+
+        # the close was for the first notification, which was replaced
+        assert self.bus.methods() == ["Notify", "Notify"]
+
+    def test_error(self, caplog) -> None:
+        with caplog.at_level(logging.ERROR):
+            self.notifier.show("Safe Eyes", "message")
+            self.notifier.close()
+            self.bus.reply(0, io_error(Gio.IOErrorEnum.FAILED, "No daemon"))
+
+        assert [record.getMessage() for record in caplog.records] == [
+            "Failed to show the notification: No daemon"
+        ]
+        # there is no notification to close
+        assert self.bus.methods() == ["Notify"]
+
+        self.notifier.close()
+        assert self.bus.methods() == ["Notify"]
+
+    def test_cancelled(self, caplog) -> None:
+        with caplog.at_level(logging.ERROR):
+            self.notifier.show("Safe Eyes", "message")
+            self.bus.reply(0, io_error(Gio.IOErrorEnum.CANCELLED, "Cancelled"))
+
+        assert caplog.records == []
+
+    def test_close_error(self) -> None:
+        self.notifier.show("Safe Eyes", "message")
+        self.bus.reply(0, GLib.Variant("(u)", (7,)))
+        self.notifier.close()
+
+        # closed by the daemon already
+        self.bus.reply(1, io_error(Gio.IOErrorEnum.FAILED, "Invalid id"))
+
+    def test_not_connected(self, caplog) -> None:
+        self.notifier._bus = None
+
+        with caplog.at_level(logging.ERROR):
+            self.notifier.show("Safe Eyes", "message")
+
+        assert [record.getMessage() for record in caplog.records] == [
+            "Failed to show the notification: not connected"
+        ]
@@ -0,0 +1,63 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from safeeyes import platform_probe, utility
+
+
+class TestPlatformProbe:
+    def test_session_type(self) -> None:
+        assert (
+            platform_probe._environment_session_type(
+                {"WAYLAND_DISPLAY": "wayland-0", "XDG_SESSION_TYPE": "x11"}
+            )
+            == "wayland"
+        )
+        assert (
+            platform_probe._environment_session_type({"XDG_SESSION_TYPE": "X11"})
+            == "x11"
+        )
+        assert platform_probe._environment_session_type({}) is None
+
+    def test_desktop(self) -> None:
+        environ = {"DESKTOP_SESSION": "plasmawayland", "KDE_FULL_SESSION": "true"}
+        desktop = platform_probe._desktop_environment(environ)
+
+        assert desktop == "kde"
+        assert platform_probe._compositor(environ, desktop) == "kwin"
+
+        environ = {"XDG_CURRENT_DESKTOP": "sway", "SWAYSOCK": "/run/sway.sock"}
+        desktop = platform_probe._desktop_environment(environ)
+
+        assert desktop == "sway"
+        assert platform_probe._compositor(environ, desktop) == "sway"
+
+    def test_shared_with_utility(self, monkeypatch) -> None:
+        # get() writes the shared values, restore them for the other tests
+        monkeypatch.setattr(platform_probe, "_info", None)
+        monkeypatch.setattr(utility, "IS_WAYLAND", utility.IS_WAYLAND)
+        monkeypatch.setattr(utility, "DESKTOP_ENVIRONMENT", utility.DESKTOP_ENVIRONMENT)
+        monkeypatch.setenv("WAYLAND_DISPLAY", "wayland-0")
+        monkeypatch.setenv("XDG_CURRENT_DESKTOP", "sway")
+        monkeypatch.delenv("DESKTOP_SESSION", raising=False)
+
+        info = platform_probe.get()
+
+        assert info.is_wayland
+        assert utility.IS_WAYLAND
+        assert utility.DESKTOP_ENVIRONMENT == "sway"
+        assert platform_probe.get() is info
@@ -0,0 +1,126 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+
+import pytest
+
+from safeeyes.model import PluginDependency
+from safeeyes.plugin_cache import PluginCache
+
+
+@pytest.fixture
+def plugin_path(tmp_path) -> str:
+    path = tmp_path / "plugin"
+    path.mkdir()
+    (path / "config.json").write_text(json.dumps({"meta": {"name": "Plugin"}}))
+    (path / "plugin.py").write_text("")
+    return str(path)
+
+
+@pytest.fixture
+def cache_path(tmp_path) -> str:
+    return str(tmp_path / "cache" / "plugins.json")
+
+
+class TestPluginCache:
+    def test_config(self, plugin_path, cache_path) -> None:
+        cache = PluginCache(cache_path)
+        config = cache.load_config(plugin_path)
+        assert config == {"meta": {"name": "Plugin"}}
+        cache.save()
+        assert cache.misses == 1
+
+        # modifying the returned config does not modify the cache
+        config["error"] = True
+
+        cache = PluginCache(cache_path)
+        assert cache.load_config(plugin_path) == {"meta": {"name": "Plugin"}}
+        assert cache.hits == 1
+
+    def test_changed_plugin(self, plugin_path, cache_path) -> None:
+        cache = PluginCache(cache_path)
+        cache.load_config(plugin_path)
+        cache.save()
+
+        config_path = os.path.join(plugin_path, "config.json")
+        with open(config_path, "w") as config_file:
+            json.dump({"meta": {"name": "Changed"}}, config_file)
+        os.utime(config_path, ns=(0, 0))
+
+        cache = PluginCache(cache_path)
+        assert cache.load_config(plugin_path) == {"meta": {"name": "Changed"}}
+        assert cache.misses == 1
+
+    @pytest.mark.parametrize(
+        "result",
+        [
+            None,
+            "Please install the command-line tool 'xprintidle'",
+            PluginDependency("Missing", "https://example.com"),
+        ],
+    )
+    def test_dependencies(self, plugin_path, cache_path, result) -> None:
+        cache = PluginCache(cache_path)
+        assert cache.get_dependencies(plugin_path, {}) == (False, None)
+        cache.set_dependencies(plugin_path, {}, result)
+        cache.save()
+
+        cache = PluginCache(cache_path)
+        assert cache.get_dependencies(plugin_path, {}) == (True, result)
+        # the result depends on the settings
+        assert cache.get_dependencies(plugin_path, {"a": 1}) == (False, None)
+
+    def test_retryable_dependency(self, plugin_path, cache_path) -> None:
+        cache = PluginCache(cache_path)
+        cache.set_dependencies(
+            plugin_path, {}, PluginDependency("Not running", retryable=True)
+        )
+        cache.save()
+
+        cache = PluginCache(cache_path)
+        assert cache.get_dependencies(plugin_path, {}) == (False, None)
+
+    def test_changed_environment(self, plugin_path, cache_path, monkeypatch) -> None:
+        cache = PluginCache(cache_path)
+        cache.set_dependencies(plugin_path, {}, None)
+        cache.save()
+
+        monkeypatch.setenv("PATH", "/nonexistent")
+
+        cache = PluginCache(cache_path)
+        assert cache.get_dependencies(plugin_path, {}) == (False, None)
+
+    def test_installed_command(
+        self, plugin_path, cache_path, tmp_path, monkeypatch
+    ) -> None:
+        bin_path = tmp_path / "bin"
+        bin_path.mkdir()
+        monkeypatch.setenv("PATH", str(bin_path))
+        cache = PluginCache(cache_path)
+        cache.set_dependencies(
+            plugin_path, {}, "Please install the command-line tool 'xprintidle'"
+        )
+        cache.save()
+
+        (bin_path / "xprintidle").write_text("")
+        os.utime(bin_path, ns=(0, 0))
+
+        cache = PluginCache(cache_path)
+        assert cache.get_dependencies(plugin_path, {}) == (False, None)
@@ -0,0 +1,151 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import textwrap
+import time
+import typing
+
+import pytest
+
+from gi.repository import GLib
+
+from safeeyes.model import Break, BreakType
+from safeeyes.plugin_host import PluginHost
+
+PLUGIN = """
+import os
+import time
+
+
+def on_pre_break(break_obj):
+    print("printed output does not break the protocol")
+    return break_obj.is_long_break()
+
+
+def get_widget_title(break_obj):
+    return break_obj.name
+
+
+def get_widget_content(break_obj):
+    return str(break_obj.duration)
+
+
+def get_tray_action(break_obj):
+    time.sleep(10)
+
+
+def hang():
+    time.sleep(10)
+
+
+def fail():
+    raise RuntimeError("failed")
+
+
+def crash():
+    os._exit(1)
+"""
+
+
+def wait(condition: typing.Callable[[], bool], timeout: float = 30) -> None:
+    """Run the main loop until the condition is met."""
+    deadline = time.monotonic() + timeout
+    context = GLib.MainContext.default()
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        if not context.iteration(False):
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def host(tmp_path) -> typing.Iterator[PluginHost]:
+    plugin_dir = tmp_path / "example"
+    plugin_dir.mkdir()
+    (plugin_dir / "plugin.py").write_text(textwrap.dedent(PLUGIN))
+
+    host = PluginHost("example", str(tmp_path), time_budget=0.5)
+    host.start()
+    wait(lambda: not host.busy)
+    yield host
+    host.stop(wait=True)
+
+
+class TestPluginHost:
+    def test_call(self, host) -> None:
+        long_break = Break(BreakType.LONG_BREAK, "Walk", 0, 60, None, {})
+
+        short_break = Break(BreakType.SHORT_BREAK, "Blink", 0, 15, None, {})
+
+        assert host.has_method("on_pre_break", 1)
+        assert not host.has_method("init", 3)
+        assert host.call("on_pre_break", [long_break]) is True
+        assert host.call("on_pre_break", [short_break]) is False
+        assert host.call("get_widget_title", [long_break]) == "Walk"
+        assert host.call("get_widget_content", [long_break]) == "60"
+        assert host.call("get_widget_content", [short_break]) == "15"
+
+    def test_calls_before_start(self, tmp_path) -> None:
+        plugin_dir = tmp_path / "example"
+        plugin_dir.mkdir()
+        (plugin_dir / "plugin.py").write_text(textwrap.dedent(PLUGIN))
+        long_break = Break(BreakType.LONG_BREAK, "Walk", 0, 60, None, {})
+        host = PluginHost("example", str(tmp_path))
+
+        start = time.monotonic()
+        host.start()
+        assert host.has_method("get_widget_title", 1)
+        # queued until the worker started
+        assert host.call("get_widget_title", [long_break]) is None
+        assert time.monotonic() - start < 0.5
+
+        wait(lambda: not host.busy)
+        assert host.call("get_widget_title", [long_break]) == "Walk"
+        host.stop(wait=True)
+
+    def test_error(self, host) -> None:
+        host.call("fail", [])
+        wait(lambda: not host.busy)
+        assert not host.failed
+
+    def test_timeout(self, host) -> None:
+        long_break = Break(BreakType.LONG_BREAK, "Walk", 0, 60, None, {})
+
+        start = time.monotonic()
+        assert host.call("hang", []) is None
+        assert time.monotonic() - start < 0.5
+        wait(lambda: not host.busy)
+
+        # waits for the time budget, and the late reply is dropped
+        start = time.monotonic()
+        assert host.call("get_tray_action", [long_break]) is None
+        assert 0.4 < time.monotonic() - start < 1
+        assert not host.busy
+        assert host.restarts == 0
+
+    def test_restart(self, host) -> None:
+        long_break = Break(BreakType.LONG_BREAK, "Walk", 0, 60, None, {})
+
+        host.call("crash", [])
+        wait(lambda: host.restarts == 1 and not host.busy)
+        assert host.call("get_widget_title", [long_break]) == "Walk"
+
+    def test_import_error(self, tmp_path) -> None:
+        host = PluginHost("missing", str(tmp_path))
+        host.start()
+        wait(lambda: host.failed)
+        assert not host.busy
@@ -0,0 +1,260 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import sys
+import time
+import types
+import typing
+
+import pytest
+
+from gi.repository import GLib
+
+from safeeyes import utility
+from safeeyes.model import Break, BreakType
+from safeeyes.plugin_cache import PluginCache
+from safeeyes.plugin_manager import LoadedPlugin, PluginManager
+from safeeyes.plugin_registry import PluginInfo, PluginRegistry
+
+DEPENDENCIES: dict[str, list[str]] = {
+    "desktop_environments": [],
+    "python_modules": [],
+    "shell_commands": [],
+    "resources": [],
+}
+
+WIDGET_PLUGIN = """
+token = 1
+
+
+def get_widget_token(break_obj):
+    return token
+
+
+def get_widget_title(break_obj):
+    return "Example"
+
+
+def get_widget_content(break_obj):
+    return str(token)
+"""
+
+
+class FailingModule:
+    """A plugin module whose hooks raise exceptions."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def on_start_break(self, break_obj) -> None:
+        self.calls.append("on_start_break")
+        raise RuntimeError("failed")
+
+    def on_stop_break(self) -> None:
+        self.calls.append("on_stop_break")
+        raise RuntimeError("failed")
+
+
+def load_plugin(
+    module: typing.Any,
+    settings: typing.Optional[dict] = None,
+    required: bool = False,
+) -> LoadedPlugin:
+    config = {
+        "meta": {"name": "Example"},
+        "dependencies": DEPENDENCIES,
+        "required_plugin": required,
+    }
+    info = PluginInfo("example", "/plugins", "/plugins/example", config)
+    entry = {"id": "example", "enabled": True, **(settings or {})}
+    plugin = LoadedPlugin(entry, info)
+    plugin.module = module
+    return plugin
+
+
+def call_hook(plugin: LoadedPlugin, method_name: str, *args) -> typing.Any:
+    # getfullargspec counts the self of the methods of FailingModule
+    return plugin.call_plugin_method(method_name, len(args) + 1, *args)
+
+
+class TestCircuitBreaker:
+    def test_not_bypassable_by_default(self) -> None:
+        plugin = load_plugin(types.SimpleNamespace(on_stop=lambda: 1 / 0))
+
+        assert plugin.circuit_breaker is None
+        with pytest.raises(ZeroDivisionError):
+            plugin.call_plugin_method("on_stop")
+
+    def test_required_plugin(self) -> None:
+        plugin = load_plugin(FailingModule(), {"time_budget": 1}, required=True)
+
+        assert plugin.circuit_breaker is None
+
+    def test_bypass(self, caplog) -> None:
+        module = FailingModule()
+        plugin = load_plugin(module, {"time_budget": 1})
+        assert plugin.circuit_breaker is not None
+
+        with caplog.at_level(logging.WARNING):
+            for _ in range(4):
+                assert call_hook(plugin, "on_start_break", None) is None
+
+        # bypassed after three failures
+        assert module.calls == ["on_start_break"] * 3
+        assert plugin.circuit_breaker.is_open()
+        # the traceback of the first failure is logged
+        tracebacks = [record for record in caplog.records if record.exc_info]
+        assert len(tracebacks) == 1
+
+        # the teardown hooks are still called, and do not open the circuit
+        for _ in range(3):
+            call_hook(plugin, "on_stop_break")
+        assert module.calls.count("on_stop_break") == 3
+
+
+class WidgetModule:
+    """A plugin module which counts the rendered widgets.
+
+    The hooks are functions, not methods, to have the number of arguments of
+    the hooks of a plugin module.
+    """
+
+    def __init__(self, token: typing.Any = 1) -> None:
+        self.token = token
+        self.renders = 0
+
+        def get_widget_token(break_obj) -> typing.Any:
+            return self.token
+
+        def get_widget_title(break_obj) -> str:
+            self.renders += 1
+            return "Example"
+
+        def get_widget_content(break_obj) -> str:
+            return f"render {self.renders}"
+
+        self.get_widget_token = get_widget_token
+        self.get_widget_title = get_widget_title
+        self.get_widget_content = get_widget_content
+
+
+def new_manager(*plugins: LoadedPlugin) -> PluginManager:
+    manager = PluginManager()
+    for plugin in plugins:
+        manager._PluginManager__plugins[plugin.id] = plugin  # type: ignore[attr-defined]
+    return manager
+
+
+class TestWidgetCache:
+    def setup_method(self) -> None:
+        self.break_obj = Break(BreakType.SHORT_BREAK, "Blink", 0, 15, None, {})
+
+    def test_cache(self) -> None:
+        module = WidgetModule()
+        manager = new_manager(load_plugin(module))
+
+        assert manager.pre_break(self.break_obj)
+        widget = manager.get_break_screen_widgets(self.break_obj)
+
+        # rendered ahead by pre_break, and reused at the break start
+        assert "render 1" in widget
+        assert module.renders == 1
+
+        module.token = 2
+        assert "render 2" in manager.get_break_screen_widgets(self.break_obj)
+
+        other_break = Break(BreakType.SHORT_BREAK, "Blink", 0, 15, None, {})
+        assert "render 3" in manager.get_break_screen_widgets(other_break)
+
+    def test_without_token(self) -> None:
+        module = WidgetModule(token=None)
+        manager = new_manager(load_plugin(module))
+
+        manager.pre_break(self.break_obj)
+        assert module.renders == 0
+
+        manager.get_break_screen_widgets(self.break_obj)
+        manager.get_break_screen_widgets(self.break_obj)
+        assert module.renders == 2
+
+    def test_isolated(self) -> None:
+        module = WidgetModule()
+        manager = new_manager(load_plugin(module, {"isolated": True}))
+
+        manager.pre_break(self.break_obj)
+        manager.get_break_screen_widgets(self.break_obj)
+        manager.get_break_screen_widgets(self.break_obj)
+        assert module.renders == 2
+
+    def test_reload(self) -> None:
+        module = WidgetModule()
+        plugin = load_plugin(module)
+        manager = new_manager(plugin)
+        entry = {"id": "example", "enabled": True}
+        config = types.SimpleNamespace(
+            get=lambda key: [entry], plugin_registry=PluginRegistry()
+        )
+
+        manager.get_break_screen_widgets(self.break_obj)
+        manager.reload(None, config)  # type: ignore[arg-type]
+        manager.get_break_screen_widgets(self.break_obj)
+        assert module.renders == 2
+
+    def test_reload_plugin(self, tmp_path, monkeypatch) -> None:
+        plugin_dir = tmp_path / "widgetexample"
+        plugin_dir.mkdir()
+        (plugin_dir / "plugin.py").write_text(WIDGET_PLUGIN)
+        config = {"meta": {"name": "Example"}, "dependencies": DEPENDENCIES}
+        (plugin_dir / "config.json").write_text(json.dumps(config))
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.setattr(utility, "SYSTEM_PLUGINS_DIR", str(tmp_path))
+        monkeypatch.delitem(sys.modules, "widgetexample", raising=False)
+        monkeypatch.delitem(sys.modules, "widgetexample.plugin", raising=False)
+
+        registry = PluginRegistry.scan(
+            [str(tmp_path)], PluginCache(str(tmp_path / "cache.json"))
+        )
+        entry = {"id": "widgetexample", "enabled": True}
+        plugin = LoadedPlugin(entry, registry.get("widgetexample"))
+        plugin.load(None)
+        manager = new_manager(plugin)
+        safeeyes_config = types.SimpleNamespace(plugin_registry=registry)
+
+        assert "1" in manager.get_break_screen_widgets(self.break_obj)
+
+        # the token is the same, but the widget is rendered by the new code
+        (plugin_dir / "plugin.py").write_text(
+            WIDGET_PLUGIN.replace("str(token)", '"reloaded"')
+        )
+        manager.reload_plugin(
+            "widgetexample",
+            None,  # type: ignore[arg-type]
+            safeeyes_config,  # type: ignore[arg-type]
+            active=False,
+        )
+        # loaded by the main loop, once the dependencies were checked
+        assert manager.get_break_screen_widgets(self.break_obj) == ""
+        context = GLib.MainContext.default()
+        deadline = time.monotonic() + 30
+        while plugin.module is None:
+            assert time.monotonic() < deadline, "timed out"
+            if not context.iteration(False):
+                time.sleep(0.01)
+        assert "reloaded" in manager.get_break_screen_widgets(self.break_obj)
@@ -0,0 +1,92 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+
+from safeeyes import utility
+from safeeyes.plugin_cache import PluginCache
+from safeeyes.plugin_registry import PluginRegistry
+
+
+def add_plugin(directory, plugin_id, version="1.0.0", icon=False) -> None:
+    path = directory / plugin_id
+    path.mkdir(parents=True)
+    config = {
+        "meta": {"name": plugin_id, "version": version},
+        "settings": [{"id": "setting", "default": 1}],
+    }
+    (path / "config.json").write_text(json.dumps(config))
+    (path / "plugin.py").write_text("")
+    if icon:
+        (path / "icon.png").write_bytes(b"")
+
+
+def scan(tmp_path) -> PluginRegistry:
+    return PluginRegistry.scan(
+        [str(tmp_path / "system"), str(tmp_path / "user")],
+        PluginCache(str(tmp_path / "cache.json")),
+    )
+
+
+class TestPluginRegistry:
+    def test_scan(self, tmp_path) -> None:
+        add_plugin(tmp_path / "system", "b")
+        add_plugin(tmp_path / "system", "a", icon=True)
+        add_plugin(tmp_path / "user", "a", version="2.0.0")
+        add_plugin(tmp_path / "user", "c")
+        (tmp_path / "user" / "incomplete").mkdir()
+
+        registry = scan(tmp_path)
+
+        assert [plugin.id for plugin in registry] == ["a", "b", "c"]
+        plugin = registry.get("a")
+        assert plugin is not None
+        assert plugin.plugins_dir == str(tmp_path / "system")
+        assert plugin.icon == str(tmp_path / "system" / "a" / "icon.png")
+        plugin = registry.get("c")
+        assert plugin is not None
+        assert plugin.icon is None
+        assert "incomplete" not in registry
+
+    def test_merge_plugins(self, tmp_path) -> None:
+        add_plugin(tmp_path / "system", "a", version="2.0.0")
+        add_plugin(tmp_path / "system", "b")
+        config = {
+            "plugins": [
+                {"id": "removed", "enabled": True},
+                {"id": "a", "enabled": True, "version": "1.0.0", "settings": {}},
+                {"id": "a", "enabled": False},
+            ]
+        }
+
+        utility.merge_plugins(config, scan(tmp_path))
+
+        assert config["plugins"] == [
+            {
+                "id": "a",
+                "enabled": True,
+                "version": "2.0.0",
+                "settings": {"setting": 1},
+            },
+            {
+                "id": "b",
+                "enabled": False,
+                "version": "1.0.0",
+                "settings": {"setting": 1},
+            },
+        ]
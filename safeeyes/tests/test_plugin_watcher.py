@@ -0,0 +1,95 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import GLib
+
+from safeeyes import plugin_watcher
+from safeeyes.plugin_watcher import PluginWatcher
+
+
+def run(seconds: float) -> None:
+    loop = GLib.MainLoop()
+    GLib.timeout_add(int(seconds * 1000), loop.quit)
+    loop.run()
+
+
+class TestPluginWatcher:
+    def test_debounce(self, tmp_path) -> None:
+        plugin = tmp_path / "plugin"
+        plugin.mkdir()
+        changed = []
+
+        def on_changed(plugin_id: str) -> bool:
+            changed.append(plugin_id)
+            return True
+
+        watcher = PluginWatcher([str(tmp_path)], on_changed)
+        try:
+            (plugin / "plugin.py").write_text("")
+            (plugin / "config.json").write_text("{}")
+            (plugin / "plugin.pyc").write_text("")
+            run(1)
+        finally:
+            watcher.stop()
+
+        assert changed == ["plugin"]
+
+    def test_retry(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(plugin_watcher, "RETRY_INTERVAL", 200)
+        plugin = tmp_path / "plugin"
+        plugin.mkdir()
+        results = [False, True]
+        changed = []
+
+        def on_changed(plugin_id: str) -> bool:
+            changed.append(plugin_id)
+            return results.pop(0)
+
+        watcher = PluginWatcher([str(tmp_path)], on_changed)
+        try:
+            (plugin / "plugin.py").write_text("")
+            run(1.5)
+        finally:
+            watcher.stop()
+
+        assert changed == ["plugin", "plugin"]
+
+    def test_subpackages(self, tmp_path) -> None:
+        package = tmp_path / "plugin" / "package"
+        package.mkdir(parents=True)
+        changed = []
+
+        def on_changed(plugin_id: str) -> bool:
+            changed.append(plugin_id)
+            return True
+
+        watcher = PluginWatcher([str(tmp_path)], on_changed)
+        try:
+            (package / "module.py").write_text("")
+            run(1)
+            assert changed == ["plugin"]
+
+            # a subpackage created after the watcher started
+            (package / "new").mkdir()
+            run(1)
+            (package / "new" / "module.py").write_text("")
+            run(1)
+        finally:
+            watcher.stop()
+
+        assert changed == ["plugin", "plugin", "plugin"]
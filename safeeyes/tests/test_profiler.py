@@ -0,0 +1,90 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import time
+
+import pytest
+
+from safeeyes.profiler import SamplingProfiler
+
+
+def busy_main_thread(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def busy_worker(stopped: threading.Event) -> None:
+    stopped.wait()
+
+
+def read_profile(path: str) -> dict[str, int]:
+    stacks = {}
+    with open(path, encoding="utf-8") as profile:
+        for line in profile:
+            (stack, count) = line.rsplit(" ", 1)
+            stacks[stack] = int(count)
+    return stacks
+
+
+class TestSamplingProfiler:
+    def test_invalid_rate(self, tmp_path) -> None:
+        with pytest.raises(ValueError):
+            SamplingProfiler(str(tmp_path), 0)
+
+    def test_main_and_worker_samples(self, tmp_path) -> None:
+        stopped = threading.Event()
+        worker = threading.Thread(target=busy_worker, args=(stopped,), name="Worker")
+        worker.start()
+
+        profiler = SamplingProfiler(str(tmp_path), rate=100)
+        profiler.start()
+        try:
+            busy_main_thread(0.3)
+        finally:
+            profiler.stop()
+            stopped.set()
+            worker.join()
+
+        assert len(profiler.files) == 2
+        (main_file, workers_file) = profiler.files
+        assert main_file.endswith("-main.folded")
+        assert workers_file.endswith("-workers.folded")
+
+        main_stacks = read_profile(main_file)
+        assert any("busy_main_thread" in stack for stack in main_stacks)
+        assert not any("busy_worker" in stack for stack in main_stacks)
+        assert sum(main_stacks.values()) > 5
+
+        worker_stacks = read_profile(workers_file)
+        assert any(
+            stack.startswith("Worker;") and "busy_worker" in stack
+            for stack in worker_stacks
+        )
+        assert not any("SamplingProfiler" in stack for stack in worker_stacks)
+
+    def test_rotation(self, tmp_path) -> None:
+        profiler = SamplingProfiler(str(tmp_path), rate=100, rotation=0.1)
+        profiler.start()
+        try:
+            busy_main_thread(0.3)
+        finally:
+            profiler.stop()
+
+        # the samples written at each rotation are appended to a file per second
+        total = sum(sum(read_profile(path).values()) for path in profiler.files)
+        assert total > 5
@@ -0,0 +1,186 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import time
+import typing
+
+import pytest
+
+from gi.repository import Gio, GLib
+
+from safeeyes import utility
+from safeeyes.plugins.screensaver import plugin
+from safeeyes.plugins.screensaver.plugin import DBusLockMethod, LockAttempt
+
+GNOME_LOCK = DBusLockMethod("org.gnome.ScreenSaver", "/org/gnome/ScreenSaver")
+KDE_LOCK = DBusLockMethod("org.freedesktop.ScreenSaver", "/ScreenSaver")
+
+
+class FakeBus:
+    """Reply to D-Bus calls with the given errors, by destination."""
+
+    def __init__(self, errors: typing.Optional[dict[str, GLib.Error]] = None) -> None:
+        self.errors = errors or {}
+        self.calls: list[tuple[str, str, int]] = []
+
+    def call(
+        self,
+        destination,
+        path,
+        interface,
+        method,
+        parameters,
+        reply_type,
+        flags,
+        timeout,
+        cancellable,
+        callback,
+        user_data,
+    ) -> None:
+        self.calls.append((destination, method, timeout))
+        GLib.idle_add(callback, self, self.errors.get(destination), user_data)
+
+    def call_finish(self, result: typing.Optional[GLib.Error]) -> None:
+        if result is not None:
+            raise result
+
+
+def io_error(code: Gio.IOErrorEnum, message: str) -> GLib.Error:
+    return GLib.Error.new_literal(Gio.io_error_quark(), message, code)
+
+
+def wait(condition: typing.Callable[[], bool], timeout: float = 30) -> None:
+    """Run the main loop until the condition is met."""
+    deadline = time.monotonic() + timeout
+    context = GLib.MainContext.default()
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        if not context.iteration(False):
+            time.sleep(0.01)
+
+
+def finished(attempt: LockAttempt, remaining: int) -> typing.Callable[[], bool]:
+    """Whether the attempt stopped with the given number of untried methods."""
+    return lambda: (
+        len(attempt._methods) == remaining
+        and attempt._timeout_id is None
+        and not GLib.MainContext.default().pending()
+    )
+
+
+class TestLockAttempt:
+    @pytest.fixture(autouse=True)
+    def bus(self, monkeypatch) -> FakeBus:
+        bus = FakeBus(
+            {
+                GNOME_LOCK.destination: io_error(
+                    Gio.IOErrorEnum.TIMED_OUT, "Timeout was reached"
+                ),
+                KDE_LOCK.destination: io_error(
+                    Gio.IOErrorEnum.FAILED, "No such interface"
+                ),
+            }
+        )
+        monkeypatch.setattr(Gio, "bus_get_sync", lambda bus_type, cancellable: bus)
+        self.bus = bus
+        return bus
+
+    def test_dbus_success(self) -> None:
+        method = DBusLockMethod("org.example.ScreenSaver", "/ScreenSaver")
+        attempt = LockAttempt([method, ["true"]])
+
+        attempt.start()
+        wait(finished(attempt, 1))
+
+        assert self.bus.calls == [
+            ("org.example.ScreenSaver", "Lock", plugin.LOCK_TIMEOUT * 1000)
+        ]
+
+    def test_fallback_chain(self, caplog) -> None:
+        attempt = LockAttempt(
+            [
+                GNOME_LOCK,
+                KDE_LOCK,
+                ["/nonexistent/lock"],
+                ["false"],
+                ["true"],
+                ["false"],
+            ]
+        )
+
+        with caplog.at_level(logging.WARNING):
+            attempt.start()
+            wait(finished(attempt, 1))
+
+        # the D-Bus calls failed, the first command could not be started,
+        # the second one failed, and the third one locked the screen
+        assert [call[0] for call in self.bus.calls] == [
+            GNOME_LOCK.destination,
+            KDE_LOCK.destination,
+        ]
+        messages = [record.getMessage() for record in caplog.records]
+        assert len(messages) == 4
+        assert "Timeout was reached" in messages[0]
+        assert "/nonexistent/lock" in messages[2]
+
+    def test_all_failed(self, caplog) -> None:
+        attempt = LockAttempt([KDE_LOCK, ["false"]])
+
+        with caplog.at_level(logging.ERROR):
+            attempt.start()
+            wait(finished(attempt, 0))
+
+        assert [record.getMessage() for record in caplog.records] == [
+            "Failed to lock the screen"
+        ]
+
+    def test_command_timeout(self, monkeypatch) -> None:
+        monkeypatch.setattr(plugin, "LOCK_TIMEOUT", 1)
+        attempt = LockAttempt([["sleep", "3"], ["true"]])
+
+        attempt.start()
+        assert attempt._timeout_id is not None
+        wait(lambda: attempt._timeout_id is None)
+
+        # the command may still lock the screen, so the next one is not tried
+        assert attempt._methods == [["true"]]
+
+
+class TestLockMethods:
+    def test_cached_per_session(self, monkeypatch) -> None:
+        commands: list[str] = []
+
+        def command_exist(command: str) -> bool:
+            commands.append(command)
+            return True
+
+        monkeypatch.setattr(utility, "command_exist", command_exist)
+        monkeypatch.setattr(plugin, "_detected_lock_methods", {})
+        for key in plugin.SESSION_ENVIRONMENT:
+            monkeypatch.delenv(key, raising=False)
+        lock_methods = getattr(plugin, "__lock_methods")
+
+        monkeypatch.setenv("DESKTOP_SESSION", "kde")
+        assert lock_methods() == [KDE_LOCK, ["loginctl", "lock-session"]]
+        assert lock_methods() == [KDE_LOCK, ["loginctl", "lock-session"]]
+        assert commands == ["loginctl"]
+
+        monkeypatch.setenv("DESKTOP_SESSION", "xfce")
+        assert lock_methods() == [["xflock4"], ["loginctl", "lock-session"]]
+        assert commands == ["loginctl", "xflock4", "loginctl"]
@@ -0,0 +1,170 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import typing
+
+from gi.repository import GLib
+
+from safeeyes.plugins.trayicon.plugin import (
+    DBusMenuService,
+    StatusNotifierItemService,
+    TrayIcon,
+)
+
+ITEMS: list[dict[str, typing.Any]] = [
+    {"id": 1, "label": "Next break at 10:00", "enabled": True},
+    {
+        "id": 2,
+        "label": "Take a break now",
+        "children": [
+            {"id": 3, "label": "Short break"},
+            {"id": 4, "label": "Long break", "icon-name": "break"},
+        ],
+    },
+    {"id": 5, "label": "Quit"},
+]
+
+
+class FakeConnection:
+    """Record the signals emitted by a service, instead of sending them."""
+
+    def __init__(self) -> None:
+        self.signals: list[tuple[str, typing.Any]] = []
+
+    def emit_signal(
+        self, destination_bus_name, object_path, interface_name, signal_name, parameters
+    ) -> None:
+        args = parameters.unpack() if parameters is not None else None
+        self.signals.append((signal_name, args))
+
+
+def items(**changes: typing.Any) -> list[dict]:
+    """Return a copy of ITEMS, with the given properties of item 4 changed."""
+    result = copy.deepcopy(ITEMS)
+    result[1]["children"][1].update(changes)
+    return result
+
+
+class TestDBusMenuService:
+    def setup_method(self) -> None:
+        self.bus = FakeConnection()
+        self.menu = DBusMenuService(self.bus, items())
+        self.bus.signals.clear()
+
+    def test_property_change(self) -> None:
+        revision = self.menu.revision
+
+        self.menu.set_items(items(label="Long break (1)"))
+
+        assert self.bus.signals == [
+            ("ItemsPropertiesUpdated", ([(4, {"label": "Long break (1)"})], []))
+        ]
+        assert self.menu.revision == revision
+        assert self.menu.GetLayout(4, 0, [])[0] == revision
+
+    def test_removed_property(self) -> None:
+        new_items = items()
+        del new_items[1]["children"][1]["icon-name"]
+        self.menu.set_items(new_items)
+
+        assert self.bus.signals == [
+            ("ItemsPropertiesUpdated", ([], [(4, ["icon-name"])]))
+        ]
+
+    def test_unchanged(self) -> None:
+        self.menu.set_items(items())
+
+        assert self.bus.signals == []
+
+    def test_structure_change(self) -> None:
+        revision = self.menu.revision
+
+        self.menu.set_items(items(hidden=True))
+
+        assert self.bus.signals == [("LayoutUpdated", (revision + 1, 0))]
+        assert self.menu.revision == revision + 1
+        (_revision, (_id, _properties, children)) = self.menu.GetLayout(2, -1, [])
+        assert [child[0] for child in children] == [3]
+
+    def test_cache_invalidation(self) -> None:
+        for idx in [DBusMenuService.ROOT_ID, 1, 2, 3, 4, 5]:
+            self.menu.getItemLayout(idx, -1)
+
+        self.menu.set_items(items(label="Long break (1)"))
+
+        # the item and its parents up to the root are dropped, not the others
+        assert sorted(self.menu._layout_cache) == [1, 3, 5]
+        assert self.menu._properties_cache[4]["label"].unpack() == "Long break (1)"
+        (_revision, layout) = self.menu.GetLayout(DBusMenuService.ROOT_ID, -1, [])
+        child = layout[2][1][2][1]
+        assert child[1]["label"] == "Long break (1)"
+
+
+class TestStatusNotifierItemService:
+    def test_unchanged_properties(self) -> None:
+        bus = FakeConnection()
+        service = StatusNotifierItemService(bus, items())
+        bus.signals.clear()
+
+        service.set_icon(service.IconName)
+        service.set_tooltip("Safe Eyes", "")
+        service.set_xayatanalabel("")
+        assert bus.signals == []
+
+        service.set_icon("io.github.slgobinath.SafeEyes-disabled")
+        service.set_icon("io.github.slgobinath.SafeEyes-disabled")
+        service.set_tooltip("Safe Eyes", "10:00")
+        service.set_xayatanalabel("10:00")
+        assert [signal for (signal, _args) in bus.signals] == [
+            "NewIcon",
+            "NewTooltip",
+            "XAyatanaNewLabel",
+        ]
+        assert service.total_signal_counts()["NewIcon"] == 1
+
+
+class TestTrayIcon:
+    def test_coalesce_updates(self) -> None:
+        bus = FakeConnection()
+        tray_icon = TrayIcon.__new__(TrayIcon)
+        tray_icon.sni_service = StatusNotifierItemService(bus, items())
+        bus.signals.clear()
+        tray_icon.plugin_config = {"show_time_in_tray": True}
+        menus = [items(label="Long break (1)"), items(label="Long break (2)")]
+        tray_icon.get_items = lambda: menus.pop(0)  # type: ignore[method-assign]
+        tray_icon.get_next_break_time = lambda: ("10:00", None, False)  # type: ignore[method-assign]
+
+        tray_icon.update_menu()
+        tray_icon.update_tooltip()
+        tray_icon.set_icon("io.github.slgobinath.SafeEyes-disabled")
+        tray_icon.update_menu()
+        assert bus.signals == []
+
+        context = GLib.MainContext.default()
+        while context.pending():
+            context.iteration(False)
+
+        assert [signal for (signal, _args) in bus.signals] == [
+            "NewIcon",
+            "ItemsPropertiesUpdated",
+            "NewTooltip",
+            "XAyatanaNewLabel",
+        ]
+        # the menu was built once, for all the updates
+        assert len(menus) == 1
@@ -0,0 +1,56 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+
+from gi.repository import GLib
+
+from safeeyes.watchdog import StallWatchdog
+
+
+def block_main_loop() -> bool:
+    time.sleep(0.6)
+    return GLib.SOURCE_REMOVE
+
+
+class TestStallWatchdog:
+    def run(self, watchdog: StallWatchdog, seconds: float) -> None:
+        loop = GLib.MainLoop()
+        GLib.timeout_add(int(seconds * 1000), loop.quit)
+        watchdog.start()
+        try:
+            loop.run()
+        finally:
+            watchdog.stop()
+
+    def test_no_stall(self) -> None:
+        watchdog = StallWatchdog(0.2)
+
+        self.run(watchdog, 0.5)
+
+        assert watchdog.stalls == 0
+
+    def test_stall(self) -> None:
+        watchdog = StallWatchdog(0.2)
+        GLib.timeout_add(100, block_main_loop)
+
+        self.run(watchdog, 1)
+
+        assert watchdog.stalls == 1
+        assert watchdog.last_stack is not None
+        assert "block_main_loop" in watchdog.last_stack
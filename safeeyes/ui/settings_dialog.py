@@ -90,11 +90,13 @@ class SettingsDialog(Gtk.ApplicationWindow):
         application: Gtk.Application,
         config: Config,
         on_save_settings: typing.Callable[[Config], None],
+        plugin_warnings: typing.Optional[dict[str, str]] = None,
     ):
         super().__init__(application=application)
 
         self.config = config
         self.on_save_settings = on_save_settings
+        self.plugin_warnings = plugin_warnings or {}
         self.plugin_items = {}
         self.plugin_map = {}
         self.last_short_break_interval = config.get("short_break_interval")
@@ -117,6 +119,7 @@ class SettingsDialog(Gtk.ApplicationWindow):
             self.__create_break_item(long_break, False)
 
         for plugin_config in utility.load_plugins_config(config):
+            plugin_config["warning"] = self.plugin_warnings.get(plugin_config["id"])
             self.box_plugins.append(self.__create_plugin_item(plugin_config))
 
         self.spin_short_break_duration.set_value(config.get("short_break_duration"))
@@ -448,9 +451,12 @@ class PluginItem(Gtk.Box):
             if plugin_config["enabled"]:
                 self.btn_disable_errored.set_visible(True)
         else:
-            self.lbl_plugin_description.set_label(
-                _(plugin_config["meta"]["description"])
-            )
+            if plugin_config.get("warning"):
+                self.lbl_plugin_description.set_label(plugin_config["warning"])
+            else:
+                self.lbl_plugin_description.set_label(
+                    _(plugin_config["meta"]["description"])
+                )
             if plugin_config["settings"]:
                 self.btn_properties.set_sensitive(True)
             else:
@@ -18,6 +18,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """This module contains utility functions for Safe Eyes and its plugins."""
 
+import atexit
 import errno
 import hashlib
 import inspect
@@ -26,13 +27,13 @@ import json
 import locale
 import logging
 import os
-import re
+import queue
 import sys
-import shutil
 import subprocess
 import threading
+import time
 import typing
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 import babel.core
@@ -48,12 +49,22 @@ from gi.repository import GLib
 from gi.repository import GdkPixbuf
 from packaging.version import parse
 
+from safeeyes import command_cache, metrics
+
 BIN_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
 HOME_DIRECTORY = os.environ.get("HOME") or os.path.expanduser("~")
 CONFIG_DIRECTORY = os.path.join(
     os.environ.get("XDG_CONFIG_HOME") or os.path.join(HOME_DIRECTORY, ".config"),
     "safeeyes",
 )
+DATA_DIRECTORY = os.path.join(
+    os.environ.get("XDG_DATA_HOME") or os.path.join(HOME_DIRECTORY, ".local", "share"),
+    "safeeyes",
+)
+CACHE_DIRECTORY = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(HOME_DIRECTORY, ".cache"),
+    "safeeyes",
+)
 STYLE_SHEET_DIRECTORY = os.path.join(CONFIG_DIRECTORY, "style")
 CONFIG_FILE_PATH = os.path.join(CONFIG_DIRECTORY, "safeeyes.json")
 CONFIG_RESOURCE = os.path.join(CONFIG_DIRECTORY, "resource")
@@ -65,6 +76,7 @@ CUSTOM_STYLE_SHEET_PATH = os.path.join(
 SYSTEM_CONFIG_FILE_PATH = os.path.join(BIN_DIRECTORY, "config/safeeyes.json")
 SYSTEM_STYLE_SHEET_PATH = os.path.join(BIN_DIRECTORY, "config/style/safeeyes_style.css")
 LOG_FILE_PATH = os.path.join(HOME_DIRECTORY, "safeeyes.log")
+DEPENDENCY_CHECK_TIMEOUT = 10
 SYSTEM_PLUGINS_DIR = os.path.join(BIN_DIRECTORY, "plugins")
 USER_PLUGINS_DIR = os.path.join(CONFIG_DIRECTORY, "plugins")
 LOCALE_PATH = os.path.join(BIN_DIRECTORY, "config/locale")
@@ -72,7 +84,8 @@ SYSTEM_DESKTOP_FILE = os.path.join(
     BIN_DIRECTORY, "platform/io.github.slgobinath.SafeEyes.desktop"
 )
 SYSTEM_ICONS = os.path.join(BIN_DIRECTORY, "platform/icons")
-DESKTOP_ENVIRONMENT = None
+# detected by safeeyes.platform_probe
+DESKTOP_ENVIRONMENT: typing.Optional[str] = None
 IS_WAYLAND = False
 
 
@@ -237,122 +250,131 @@ def check_plugin_dependencies(plugin_id, plugin_config, plugin_settings, plugin_
     return None
 
 
+def check_plugins_dependencies(checks, timeout=DEPENDENCY_CHECK_TIMEOUT, cache=None):
+    """Check the dependencies of several plugins concurrently.
+
+    Every check is a tuple of the check_plugin_dependencies arguments. The
+    results are returned in the same order. If a check raises an exception,
+    the exception is returned instead. If a check does not finish within
+    timeout seconds, a retryable PluginDependency is returned and the check is
+    abandoned.
+
+    If a PluginCache is given, the cached results are used, and only the
+    remaining checks are run.
+    """
+    from safeeyes.model import PluginDependency
+    from safeeyes.translations import translate as _
+
+    results: list[typing.Any] = [None] * len(checks)
+    cached = [False] * len(checks)
+
+    def run(index, check):
+        try:
+            results[index] = check_plugin_dependencies(*check)
+        except BaseException as e:
+            results[index] = e
+
+    threads = []
+    for index, check in enumerate(checks):
+        if cache is not None:
+            (cached[index], results[index]) = cache.get_dependencies(check[3], check[2])
+            if cached[index]:
+                threads.append(None)
+                continue
+
+        # daemon threads, so that a hanging check does not block exiting
+        thread = threading.Thread(
+            target=run,
+            args=(index, check),
+            name=f"DependencyCheck-{check[0]}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+
+    deadline = time.monotonic() + timeout
+    checked = []
+    for index, thread in enumerate(threads):
+        if thread is None:
+            checked.append(results[index])
+            continue
+
+        thread.join(max(0, deadline - time.monotonic()))
+        if thread.is_alive():
+            plugin_id = checks[index][0]
+            logging.error("Checking the dependencies of %s timed out", plugin_id)
+            checked.append(
+                PluginDependency(
+                    message=_("Checking the dependencies timed out"),
+                    retryable=True,
+                )
+            )
+        else:
+            checked.append(results[index])
+            if cache is not None and not isinstance(results[index], BaseException):
+                cache.set_dependencies(
+                    checks[index][3], checks[index][2], results[index]
+                )
+
+    return checked
+
+
 def load_plugins_config(safeeyes_config):
-    """Load all the plugins from the given directory."""
+    """Load the configurations of the plugins in the Safe Eyes config."""
+    from safeeyes.plugin_cache import PluginCache
+
+    registry = safeeyes_config.plugin_registry
+    cache = PluginCache()
     configs = []
+    checks = []
     for plugin in safeeyes_config.get("plugins"):
-        plugin_path = os.path.join(SYSTEM_PLUGINS_DIR, plugin["id"])
-        if not os.path.isdir(plugin_path):
-            # User plugin
-            plugin_path = os.path.join(USER_PLUGINS_DIR, plugin["id"])
-        plugin_config_path = os.path.join(plugin_path, "config.json")
-        plugin_icon_path = os.path.join(plugin_path, "icon.png")
-        plugin_module_path = os.path.join(plugin_path, "plugin.py")
-        if not os.path.isfile(plugin_module_path):
-            return
-        icon = None
-        if os.path.isfile(plugin_icon_path):
-            icon = plugin_icon_path
-        else:
-            icon = get_resource_path("ic_plugin.png")
-        config = load_json(plugin_config_path)
-        if config is None:
+        plugin_info = registry.get(plugin["id"])
+        if plugin_info is None:
             continue
-        dependency_description = check_plugin_dependencies(
-            plugin["id"], config, plugin.get("settings", {}), plugin_path
+        config = plugin_info.copy_config()
+        config["id"] = plugin["id"]
+        config["icon"] = plugin_info.icon or get_resource_path("ic_plugin.png")
+        config["enabled"] = plugin["enabled"]
+        config["active_plugin_config"] = plugin.get("settings")
+
+        configs.append(config)
+        checks.append(
+            (plugin["id"], config, plugin.get("settings", {}), plugin_info.path)
         )
+
+    results = check_plugins_dependencies(checks, cache=cache)
+    cache.save()
+    for config, dependency_description in zip(configs, results):
+        if isinstance(dependency_description, BaseException):
+            logging.error(
+                "Error in checking the dependencies of %s: %s",
+                config["id"],
+                dependency_description,
+            )
+            dependency_description = str(dependency_description)
+
         if dependency_description:
             config["error"] = True
             config["meta"]["dependency_description"] = dependency_description
-            icon = get_resource_path("ic_warning.png")
+            config["icon"] = get_resource_path("ic_warning.png")
         else:
             config["error"] = False
-        config["id"] = plugin["id"]
-        config["icon"] = icon
-        config["enabled"] = plugin["enabled"]
-        config["active_plugin_config"] = plugin.get("settings")
 
-        configs.append(config)
     return configs
 
 
 def desktop_environment():
-    """Detect the desktop environment."""
-    global DESKTOP_ENVIRONMENT
-    desktop_session = os.environ.get("DESKTOP_SESSION")
-    current_desktop = os.environ.get("XDG_CURRENT_DESKTOP")
-    env = "unknown"
-    if desktop_session is not None:
-        desktop_session = desktop_session.lower()
-        if desktop_session in [
-            "gnome",
-            "unity",
-            "budgie-desktop",
-            "cinnamon",
-            "mate",
-            "xfce4",
-            "lxde",
-            "pantheon",
-            "fluxbox",
-            "blackbox",
-            "openbox",
-            "icewm",
-            "jwm",
-            "afterstep",
-            "trinity",
-            "kde",
-            "hyprland",
-        ]:
-            env = desktop_session
-        elif desktop_session.startswith("xubuntu") or (
-            current_desktop is not None and "xfce" in current_desktop
-        ):
-            env = "xfce"
-        elif desktop_session.startswith("lubuntu"):
-            env = "lxde"
-        elif (
-            "plasma" in desktop_session
-            or desktop_session.startswith("kubuntu")
-            or os.environ.get("KDE_FULL_SESSION") == "true"
-        ):
-            env = "kde"
-        elif os.environ.get("GNOME_DESKTOP_SESSION_ID") or desktop_session.startswith(
-            "gnome"
-        ):
-            env = "gnome"
-        elif desktop_session.startswith("ubuntu"):
-            env = "unity"
-    elif current_desktop is not None:
-        if current_desktop.startswith("sway"):
-            env = "sway"
-    DESKTOP_ENVIRONMENT = env
-    return env
-
+    """Detect the desktop environment, see safeeyes.platform_probe."""
+    from safeeyes import platform_probe
 
-def is_wayland():
-    """Determine if Wayland is running.
+    return platform_probe.get().desktop
 
-    https://unix.stackexchange.com/a/325972/222290
-    """
-    global IS_WAYLAND
 
-    # Easy method. Does not depend on loginctl
-    # https://stackoverflow.com/questions/45536141/how-i-can-find-out-if-a-linux-system-uses-wayland-or-x11/45537237#45537237
-    if "WAYLAND_DISPLAY" in os.environ:
-        IS_WAYLAND = True
-        return IS_WAYLAND
+def is_wayland():
+    """Determine if Wayland is running, see safeeyes.platform_probe."""
+    from safeeyes import platform_probe
 
-    try:
-        session_id = subprocess.check_output(["loginctl"]).split(b"\n")[1].split()[0]
-        output = subprocess.check_output(
-            ["loginctl", "show-session", session_id, "-p", "Type"]
-        )
-    except BaseException:
-        logging.warning("Unable to determine if wayland is running. Assuming no.")
-        IS_WAYLAND = False
-    else:
-        IS_WAYLAND = bool(re.search(b"wayland", output, re.IGNORECASE))
-    return IS_WAYLAND
+    return platform_probe.get().is_wayland
 
 
 def execute_command(command, args=[]):
@@ -365,15 +387,23 @@ def execute_command(command, args=[]):
             command_to_execute.extend(command)
         if args:
             command_to_execute.extend(args)
+        # skip the PATH search of Popen
+        executable = command_cache.which(command_to_execute[0])
         try:
-            subprocess.Popen(command_to_execute)
+            subprocess.Popen(command_to_execute, executable=executable)
         except BaseException:
             logging.error("Error in executing the command " + str(command))
+            if executable is not None:
+                # the cached path may be stale
+                command_cache.clear()
 
 
 def command_exist(command):
-    """Check whether the given command exist in the system or not."""
-    if shutil.which(command):
+    """Check whether the given command exist in the system or not.
+
+    The result is cached until PATH or one of its directories changes.
+    """
+    if command_cache.which(command):
         return True
     return False
 
@@ -520,15 +550,56 @@ def initialize_platform():
                 logging.error("Failed to create icon link at %s" % local_icon)
 
 
-def initialize_logging(debug):
+LOG_QUEUE_SIZE = 10000
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format every record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(
+            {
+                "time": self.formatTime(record),
+                "level": record.levelname,
+                "thread": record.threadName,
+                "logger": record.name,
+                "message": record.getMessage(),
+            }
+        )
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue the records for the listener thread, without ever blocking.
+
+    When the queue is full, the record is dropped and counted instead.
+    """
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            metrics.inc("safeeyes_log_records_dropped_total")
+
+
+def initialize_logging(debug, json_format=False):
     """Initialize the logging framework using the Safe Eyes specific
     configurations.
+
+    The handlers writing to the console and the log file run on a separate
+    thread, so that slow disks do not block the thread which logs.
     """
     # Configure logging.
     root_logger = logging.getLogger()
-    log_formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s]:[%(threadName)s] %(message)s"
-    )
+    log_formatter: logging.Formatter
+    if json_format:
+        log_formatter = JsonLogFormatter()
+    else:
+        log_formatter = logging.Formatter(
+            "%(asctime)s [%(levelname)s]:[%(threadName)s] %(message)s"
+        )
 
     # Append the logs and overwrite once reached 1MB
     if debug:
@@ -541,53 +612,43 @@ def initialize_logging(debug):
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(log_formatter)
 
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(LOG_QUEUE_SIZE)
+        listener = QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        # Write the remaining records before exiting
+        atexit.register(listener.stop)
+
         root_logger.setLevel(logging.DEBUG)
-        root_logger.addHandler(console_handler)
-        root_logger.addHandler(file_handler)
+        root_logger.addHandler(DroppingQueueHandler(log_queue))
     else:
         root_logger.propagate = False
 
 
-def __open_plugin_config(plugins_dir, plugin_id):
-    """Open the given plugin's configuration."""
-    plugin_config_path = os.path.join(plugins_dir, plugin_id, "config.json")
-    plugin_module_path = os.path.join(plugins_dir, plugin_id, "plugin.py")
-    if not os.path.isfile(plugin_config_path) or not os.path.isfile(plugin_module_path):
-        # Either the config.json or plugin.py is not available
-        return None
-    return load_json(plugin_config_path)
-
-
-def __update_plugin_config(plugin, plugin_config, config):
+def __update_plugin_config(plugin, plugin_config):
     """Update the plugin configuration."""
-    if plugin_config is None:
-        config["plugins"].remove(plugin)
-    else:
-        if parse(plugin.get("version", "0.0.0")) != parse(
-            plugin_config["meta"]["version"]
-        ):
-            # Update the configuration
-            plugin["version"] = plugin_config["meta"]["version"]
-            setting_ids = []
-            # Add the new settings
-            for setting in plugin_config["settings"]:
-                setting_ids.append(setting["id"])
-                if "settings" not in plugin:
-                    plugin["settings"] = {}
-                if plugin["settings"].get(setting["id"], None) is None:
-                    plugin["settings"][setting["id"]] = setting["default"]
-            # Remove the removed ids
-            keys_to_remove = []
-            for key in plugin.get("settings", []):
-                if key not in setting_ids:
-                    keys_to_remove.append(key)
-            for key in keys_to_remove:
-                del plugin["settings"][key]
-
-
-def __add_plugin_config(plugin_id, plugin_config, safe_eyes_config):
-    if plugin_config is None:
-        return
+    if parse(plugin.get("version", "0.0.0")) != parse(plugin_config["meta"]["version"]):
+        # Update the configuration
+        plugin["version"] = plugin_config["meta"]["version"]
+        setting_ids = set()
+        # Add the new settings
+        for setting in plugin_config["settings"]:
+            setting_ids.add(setting["id"])
+            if "settings" not in plugin:
+                plugin["settings"] = {}
+            if plugin["settings"].get(setting["id"], None) is None:
+                plugin["settings"][setting["id"]] = setting["default"]
+        # Remove the removed ids
+        keys_to_remove = []
+        for key in plugin.get("settings", []):
+            if key not in setting_ids:
+                keys_to_remove.append(key)
+        for key in keys_to_remove:
+            del plugin["settings"][key]
+
+
+def __new_plugin_config(plugin_id, plugin_config):
     config = {}
     config["id"] = plugin_id
     config["enabled"] = False  # By default plugins are disabled
@@ -596,49 +657,33 @@ def __add_plugin_config(plugin_id, plugin_config, safe_eyes_config):
         config["settings"] = {}
         for setting in plugin_config["settings"]:
             config["settings"][setting["id"]] = setting["default"]
-    safe_eyes_config["plugins"].append(config)
-
+    return config
 
-def merge_plugins(config):
-    """Merge plugin configurations with Safe Eyes configuration."""
-    system_plugins = None
-    user_plugins = None
 
-    # Load system plugins id
-    if os.path.isdir(SYSTEM_PLUGINS_DIR):
-        system_plugins = os.listdir(SYSTEM_PLUGINS_DIR)
-    else:
-        system_plugins = []
+def merge_plugins(config, registry):
+    """Merge plugin configurations with Safe Eyes configuration.
 
-    # Load user plugins id
-    if os.path.isdir(USER_PLUGINS_DIR):
-        user_plugins = os.listdir(USER_PLUGINS_DIR)
-    else:
-        user_plugins = []
+    The plugins which are not installed anymore are removed, and the newly
+    installed plugins of the PluginRegistry are added, disabled.
+    """
+    plugins = []
+    merged_ids = set()
 
-    # Create a list of existing plugins
+    # Keep the existing plugins in their order
     for plugin in config["plugins"]:
-        plugin_id = plugin["id"]
-        if plugin_id in system_plugins:
-            plugin_config = __open_plugin_config(SYSTEM_PLUGINS_DIR, plugin_id)
-            __update_plugin_config(plugin, plugin_config, config)
-            system_plugins.remove(plugin_id)
-        elif plugin_id in user_plugins:
-            plugin_config = __open_plugin_config(USER_PLUGINS_DIR, plugin_id)
-            __update_plugin_config(plugin, plugin_config, config)
-            user_plugins.remove(plugin_id)
-        else:
-            config["plugins"].remove(plugin)
+        plugin_info = registry.get(plugin["id"])
+        if plugin_info is None or plugin["id"] in merged_ids:
+            continue
+        __update_plugin_config(plugin, plugin_info.config)
+        plugins.append(plugin)
+        merged_ids.add(plugin["id"])
 
-    # Add all system plugins
-    for plugin_id in system_plugins:
-        plugin_config = __open_plugin_config(SYSTEM_PLUGINS_DIR, plugin_id)
-        __add_plugin_config(plugin_id, plugin_config, config)
+    # Add the new plugins
+    for plugin_info in registry:
+        if plugin_info.id not in merged_ids:
+            plugins.append(__new_plugin_config(plugin_info.id, plugin_info.config))
 
-    # Add all user plugins
-    for plugin_id in user_plugins:
-        plugin_config = __open_plugin_config(USER_PLUGINS_DIR, plugin_id)
-        __add_plugin_config(plugin_id, plugin_config, config)
+    config["plugins"] = plugins
 
 
 def open_session():
@@ -0,0 +1,113 @@
+# Safe Eyes is a utility to remind you to take break frequently
+# to protect your eyes from eye strain.
+
+# Copyright (C) 2026  Gobinath
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Detect and report stalls of the GLib main loop.
+
+Everything in Safe Eyes runs on the main loop, so a blocking call anywhere
+delays the breaks. The watchdog lets the main loop update a heartbeat from a
+timeout, and checks it from a separate thread. If the heartbeat is older than
+the threshold, the stack of the main thread is logged, showing where it is
+blocked.
+"""
+
+import logging
+import sys
+import threading
+import time
+import traceback
+import typing
+
+from gi.repository import GLib
+
+from safeeyes import metrics
+
+
+class StallWatchdog:
+    """Watch the main loop, and log the main thread's stack when it stalls
+    for at least threshold seconds.
+    """
+
+    stalls: int = 0
+    last_stack: typing.Optional[str] = None
+
+    _beat_id: typing.Optional[int] = None
+    _thread: typing.Optional[threading.Thread] = None
+
+    def __init__(self, threshold: float) -> None:
+        self.threshold = threshold
+        # Check often enough to notice a stall shortly after the threshold
+        self.interval = min(threshold / 4, 0.5)
+        self._last_beat = time.monotonic()
+        self._main_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start watching the main loop, must be called from the main thread."""
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+
+        self._beat_id = GLib.timeout_add(int(self.interval * 1000), self.__beat)
+        self._thread = threading.Thread(
+            target=self.__watch, name="StallWatchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._beat_id is not None:
+            GLib.source_remove(self._beat_id)
+            self._beat_id = None
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __beat(self) -> bool:
+        now = time.monotonic()
+        stalled_for = now - self._last_beat
+        self._last_beat = now
+
+        if stalled_for >= self.threshold:
+            logging.warning("Main loop was stalled for %.1f seconds", stalled_for)
+
+        return GLib.SOURCE_CONTINUE
+
+    def __watch(self) -> None:
+        reported_beat = None
+
+        while not self._stopped.wait(self.interval):
+            last_beat = self._last_beat
+            stalled_for = time.monotonic() - last_beat
+            if stalled_for < self.threshold or last_beat == reported_beat:
+                continue
+
+            # Report every stall once
+            reported_beat = last_beat
+            self.stalls += 1
+            metrics.inc("safeeyes_main_loop_stalls_total")
+
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+
+            self.last_stack = "".join(traceback.format_stack(frame))
+            logging.warning(
+                "Main loop is stalled for %.1f seconds, main thread stack:\n%s",
+                stalled_for,
+                self.last_stack,
+            )